@@ -12,6 +12,7 @@ datas = [
     (str(project_root / "assets" / "potrol-logo.svg"), "assets"),
     (str(project_root / "assets" / "potrol-icon.svg"), "assets"),
     (str(project_root / "assets" / "potrol-icon.ico"), "assets"),
+    (str(project_root / "assets" / "potrol_theme.css"), "assets"),
 ]
 datas += copy_metadata("streamlit")
 datas += collect_data_files("streamlit")
@@ -19,7 +20,7 @@ binaries = []
 hiddenimports = []
 hiddenimports += collect_submodules("streamlit.runtime.scriptrunner")
 hiddenimports += collect_submodules("streamlit.runtime.scriptrunner_utils")
-hiddenimports += ["numpy._core._exceptions", "tkinter", "tkinter.filedialog", "_tkinter"]
+hiddenimports += ["numpy._core._exceptions", "tkinter", "tkinter.filedialog", "_tkinter", "orjson"]
 
 a = Analysis(
     ["potrol_launcher.py"],
@@ -1,24 +1,34 @@
 from __future__ import annotations
 
+import atexit
 import base64
+from collections import OrderedDict, deque
 from contextlib import contextmanager
 from copy import copy
 from datetime import date, datetime
+from functools import lru_cache
 import hashlib
+import heapq
 import json
+import mmap
 import os
 from pathlib import Path
 import re
+import secrets
 import socket
 import shutil
 import sys
 import tempfile
+import threading
 import time
 import traceback
-from typing import Any
-from urllib.error import URLError
-from urllib.request import urlopen
+import zipfile
+from types import MappingProxyType
+from typing import Any, Callable, Iterator
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
 from uuid import uuid4
+from xml.etree import ElementTree
 
 import pandas as pd
 import streamlit as st
@@ -26,11 +36,41 @@ from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Border, Side
 from openpyxl.utils.exceptions import InvalidFileException
 
+try:
+    import lxml  # noqa: F401
+except ImportError:
+    LXML_AVAILABLE = False
+else:
+    LXML_AVAILABLE = True
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if os.name == "nt":
+    try:
+        import ctypes
+
+        _KERNEL32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        _KERNEL32.GetDriveTypeW.argtypes = [ctypes.c_wchar_p]
+        _KERNEL32.GetDriveTypeW.restype = ctypes.c_uint
+    except Exception:
+        _KERNEL32 = None
+else:
+    _KERNEL32 = None
+
+# shutil.copyfile already uses sendfile on Linux and fcopyfile on macOS; the
+# buffered fallback defaults to 1 MiB chunks on Windows and 64 KiB elsewhere.
+# This patches shutil for the whole process, not just POtrol's own copies.
+shutil.COPY_BUFSIZE = max(getattr(shutil, "COPY_BUFSIZE", 0), 4 * 1024 * 1024)
+
 
 DEFAULT_WORKBOOK_PATH = Path.home() / "Downloads" / "IT POs.xlsx"
 ASSETS_DIR = Path(__file__).resolve().parent / "assets"
 APP_ICON_PATH = ASSETS_DIR / "potrol-icon.svg"
 APP_LOGO_PATH = ASSETS_DIR / "potrol-logo.svg"
+APP_THEME_CSS_PATH = ASSETS_DIR / "potrol_theme.css"
 DEFAULT_HEADERS = [
     "PO Number",
     "Date",
@@ -45,11 +85,12 @@ DEFAULT_HEADERS = [
     "Sales Tax",
     "Grand Total",
 ]
-SUPPORTED_WORKBOOK_EXTENSIONS = {".xlsx", ".xlsm", ".xltx", ".xltm"}
+SUPPORTED_WORKBOOK_EXTENSIONS = frozenset({".xlsx", ".xlsm", ".xltx", ".xltm"})
+WORKBOOK_VALIDATION_TTL_SECONDS = 2
 REQUIRED_HEADERS: list[str] = []
 DEFAULT_SHEET_NAME = "PO Log"
-DEFAULT_LOCATION_OPTIONS = ["GLN", "MID", "AUR", "SNT", "CRN", "PHX", "LEB", "CAN"]
-LOCATION_ALIAS_MAP: dict[str, str] = {
+DEFAULT_LOCATION_OPTIONS = ("GLN", "MID", "AUR", "SNT", "CRN", "PHX", "LEB", "CAN")
+LOCATION_ALIAS_MAP: MappingProxyType[str, str] = MappingProxyType({
     "CNR": "CRN",
     "GLENPOOL": "GLN",
     "MIDDLEBURY": "MID",
@@ -63,7 +104,7 @@ LOCATION_ALIAS_MAP: dict[str, str] = {
     "IN": "IN",
     "COON": "CRN",
     "RAPIDS": "CRN",
-}
+})
 DEFAULT_DEPARTMENT_OPTIONS = sorted(
     [
         "IT",
@@ -83,29 +124,39 @@ LOCATION_CONFIG_PATH = Path.home() / ".potrol_locations.json"
 APP_SETTINGS_PATH = Path.home() / ".potrol_settings.json"
 APP_DRAFTS_PATH = Path.home() / ".potrol_drafts.json"
 APP_RUNTIME_LOG_PATH = Path.home() / ".potrol_runtime.log"
+APP_PO_SEQUENCE_CACHE_PATH = Path.home() / ".potrol_po_seq_cache.json"
 PO_PREFIX = "IT"
 PO_START_NUMBER = 579
 PURCHASE_REASON_COLUMN_INDEX = 10
 LIVE_PO_REFRESH_INTERVAL_SECONDS = 5
 WORKBOOK_LOCK_TIMEOUT_SECONDS = 12.0
 WORKBOOK_LOCK_STALE_SECONDS = 120.0
+WORKBOOK_LOCK_POLL_MIN_SECONDS = 0.01
+WORKBOOK_LOCK_POLL_MAX_SECONDS = 0.2
 WORKBOOK_SYNC_INTERVAL_SECONDS = 5
 PO_RESERVATION_STALE_SECONDS = 900.0
+PO_RESERVATION_REFRESH_SECONDS = 30.0
 DRAFT_AUTOSAVE_MIN_SECONDS = 1.0
+DRAFT_FLUSH_DELAY_SECONDS = 0.8
 APP_VERSION = "2026.02.19.1"
 WORKBOOK_OPEN_RETRY_COUNT = 3
 WORKBOOK_OPEN_RETRY_DELAY_SECONDS = 0.35
 PO_SEQUENCE_CACHE_MAX_KEYS = 32
+JSON_DICT_CACHE_MAX_KEYS = 32
+JSON_HOT_BACKUP_EVERY = 20
+JSON_BACKUP_MAX_AGE_SECONDS = 300.0
 PO_SCAN_EMPTY_STREAK_BREAK = 12000
 PO_SCAN_HARD_ROW_LIMIT = 350000
+WRITE_ROW_SCAN_BLOCK = 256
 DEFAULT_BACKUP_KEEP_LATEST = 1
 MIN_BACKUP_KEEP_LATEST = 1
 MAX_BACKUP_KEEP_LATEST = 25
 MAX_RUNTIME_LOG_LINES = 1200
+RUNTIME_LOG_ROTATE_EVERY = 128
 DEFAULT_EDITOR_PAGE_SIZE = 100
 DEFAULT_EDITOR_SEARCH_SCAN_LIMIT = 10000
 DEFAULT_THEME_NAME = "Sky"
-THEME_PRESETS: dict[str, dict[str, str]] = {
+THEME_PRESETS: MappingProxyType[str, dict[str, str]] = MappingProxyType({
     "Sky": {
         "bg_start": "#f3f6ff",
         "bg_end": "#f7f9ff",
@@ -541,11 +592,17 @@ THEME_PRESETS: dict[str, dict[str, str]] = {
         "placeholder": "#9eb2b6",
         "disabled_text": "#a7b9bd",
     },
-}
-THEME_NAME_ALIASES: dict[str, str] = {
+})
+THEME_NAME_ALIASES: MappingProxyType[str, str] = MappingProxyType({
     "Obsidian Ember": "Ubuntu",
     "Obsidion Ember": "Ubuntu",
+})
+# Case-insensitive lookups for canonical_theme_name; reversed so the first
+# spelling wins, matching the old linear scans.
+_THEME_ALIAS_LOWER: dict[str, str] = {
+    alias.casefold(): mapped for alias, mapped in reversed(list(THEME_NAME_ALIASES.items()))
 }
+_THEME_LOWER_MAP: dict[str, str] = {name.casefold(): name for name in reversed(list(THEME_PRESETS))}
 WORKBOOK_PATH_STATE_KEY = "state::workbook_path"
 BACKUP_DIR_STATE_KEY = "state::backup_dir"
 BACKUP_KEEP_LATEST_STATE_KEY = "state::backup_keep_latest"
@@ -554,10 +611,25 @@ SHEET_SELECT_WORKBOOK_STATE_KEY = "state::selected_sheet_name_workbook"
 SETTINGS_TAB_STATE_KEY = "state::settings_tab_selector"
 SETTINGS_TAB_PENDING_STATE_KEY = "state::settings_tab_selector_pending"
 THEME_STATE_KEY = "state::theme_name"
+_SETTINGS_TAB_ITEMS: tuple[tuple[str, str], ...] = (
+    ("workbook", ":material/folder_open: Workbook"),
+    ("locations", ":material/location_on: Locations"),
+    ("theme", ":material/palette: Theme"),
+    ("diagnostics", ":material/health_and_safety: Diagnostics"),
+    ("about", ":material/info: About"),
+)
+_SETTINGS_TAB_KEYS: tuple[str, ...] = tuple(key for key, _ in _SETTINGS_TAB_ITEMS)
+_SETTINGS_TAB_LABELS: dict[str, str] = dict(_SETTINGS_TAB_ITEMS)
 ENTRY_FORM_RESET_KEY_PREFIX = "state::entry_form_reset"
 UPDATE_MANIFEST_URL_STATE_KEY = "state::update_manifest_url"
 OPEN_SETTINGS_ONCE_STATE_KEY = "state::open_settings_once"
+LAST_SAVED_SETTINGS_STATE_KEY = "state::last_saved_settings"
+LOADED_WORKBOOK_STATE_KEY = "state::loaded_workbook_path"
 DEFAULT_UPDATE_MANIFEST_URL = ""
+UPDATE_CHECK_TIMEOUT_SECONDS = 3
+# Only absorbs double-clicks on "Check for Updates"; freshness comes from the
+# conditional GET in fetch_update_manifest.
+UPDATE_MANIFEST_CACHE_TTL_SECONDS = 5
 DESKTOP_MODE_ENV_VAR = "POTROL_DESKTOP_MODE"
 BROWSER_MODE_OVERRIDE_ENV_VAR = "POTROL_ALLOW_BROWSER_MODE"
 
@@ -567,7 +639,43 @@ SESSION_OWNER = (
     f"{os.environ.get('USERNAME', 'user')}@"
     f"{os.environ.get('COMPUTERNAME', socket.gethostname())}"
 )
-_PO_SEQUENCE_CACHE: dict[tuple[str, str, str, str], set[int]] = {}
+_PO_SEQUENCE_CACHE: OrderedDict[tuple[str, str, str, str], frozenset[int]] = OrderedDict()
+_LOG_WRITES_SINCE_ROTATE = 0
+_JSON_DICT_CACHE: dict[str, tuple[tuple[int, int, int], dict[str, Any]]] = {}
+_BACKUP_TICK: dict[str, int] = {}
+_DRAFT_STR_FIELDS = (("vendor", ""), ("department", "IT"), ("location", ""), ("purchase_reason", ""))
+_MANIFEST_CACHE: dict[str, tuple[str, str, dict[str, str]]] = {}
+_LAST_SCAN_SIGNATURE: dict[tuple[str, str, str], tuple[str, frozenset[int]]] = {}
+_ID_MAX_CACHE: dict[tuple[str, str, int], tuple[str, int | None]] = {}
+_DRAFT_DIRTY: dict[str, dict[str, Any]] = {}
+_DRAFT_FLUSH_LOCK = threading.Lock()
+_DRAFT_FLUSH_TIMER: threading.Timer | None = None
+_WORKBOOK_LOCK_RELEASED = threading.Condition()
+_WORKBOOK_LOCK_GENERATION = 0
+_SHEET_DATA_GENERATION = 0
+_LOC_SPLIT_RE = re.compile(r"[^A-Za-z0-9]+")
+_LOC_NORM_RE = re.compile(r"[^A-Z0-9_-]")
+_FIELD_KEY_RE = re.compile(r"[^a-zA-Z0-9]+")
+_HEADER_NORM_RE = re.compile(r"[^a-z0-9]+")
+_LOGO_COLOR_RE = re.compile(
+    "|".join(
+        re.escape(color)
+        for color in ("#0b67c2", "#14b8a6", "#0f172a", "#476581", "#8ba4bf", "#d9e4f2", "#f8fafc")
+    ),
+    re.IGNORECASE,
+)
+_ID_HEADER_RE = re.compile(r" id|id |po number|po ?#|record number")
+_ID_HEADER_EXACT = frozenset({"id", "po"})
+_TIMESTAMP_HEADER_RE = re.compile(r"created|timestamp|entered|entry")
+# Currency symbol, thousands separators and the non-breaking spaces some exports use as separators.
+_MONEY_STRIP = str.maketrans("", "", "$,\u00a0")
+_CSS_STRING_RE = re.compile(r"(\"[^\"]*\"|'[^']*')")
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE_RE = re.compile(r"\s+")
+_CSS_PUNCT_SPACE_RE = re.compile(r" ?([{};,>]) ?")
+_THIN_SIDE = Side(border_style="thin", color="000000")
+_NO_SIDE = Side(border_style=None, color=None)
+_DEFAULT_BOX_BORDER = Border(left=_THIN_SIDE, right=_THIN_SIDE, top=_THIN_SIDE, bottom=_THIN_SIDE)
 
 
 def get_session_id() -> str:
@@ -586,7 +694,10 @@ def sanitize_headers(raw_headers: list[Any]) -> list[str]:
     headers: list[str] = []
     seen: set[str] = set()
     for index, value in enumerate(raw_headers, start=1):
-        header = str(value).strip() if value is not None else ""
+        if isinstance(value, str):
+            header = value.strip()
+        else:
+            header = str(value).strip() if value is not None else ""
         if not header:
             header = f"Column {index}"
 
@@ -601,19 +712,33 @@ def sanitize_headers(raw_headers: list[Any]) -> list[str]:
     return headers
 
 
+_NORMALIZERS: dict[type, Any] = {
+    datetime: lambda value: value.strftime("%Y-%m-%d %H:%M"),
+    date: lambda value: value.strftime("%Y-%m-%d"),
+    type(None): lambda value: "",
+    str: lambda value: value,
+    int: lambda value: value,
+    float: lambda value: value,
+}
+
+
 def normalize_cell_value(value: Any) -> Any:
+    normalizer = _NORMALIZERS.get(type(value))
+    if normalizer is not None:
+        return normalizer(value)
+    # Subclasses such as pd.Timestamp miss the exact-type lookup.
     if isinstance(value, datetime):
-        return value.strftime("%Y-%m-%d %H:%M")
+        return _NORMALIZERS[datetime](value)
     if isinstance(value, date):
-        return value.strftime("%Y-%m-%d")
-    if value is None:
-        return ""
+        return _NORMALIZERS[date](value)
     return value
 
 
 def normalize_editor_cell_value(value: Any) -> Any:
     if value is None:
         return ""
+    if isinstance(value, str):
+        return value.strip()
     try:
         if pd.isna(value):
             return ""
@@ -626,42 +751,69 @@ def normalize_editor_cell_value(value: Any) -> Any:
         return value.strftime("%Y-%m-%d %H:%M")
     if isinstance(value, date):
         return value.strftime("%Y-%m-%d")
-    if isinstance(value, str):
-        return value.strip()
     if isinstance(value, float) and value.is_integer():
         return int(value)
     return value
 
 
+def normalize_editor_frame(frame: pd.DataFrame, headers: list[str]) -> pd.DataFrame:
+    normalized_columns: dict[str, pd.Series] = {}
+    for header in headers:
+        if header not in frame.columns:
+            normalized_columns[header] = pd.Series([""] * len(frame), index=frame.index, dtype=object)
+            continue
+        series = frame[header]
+        missing_mask = series.isna()
+        if pd.api.types.is_datetime64_any_dtype(series):
+            normalized = series.dt.strftime("%Y-%m-%d %H:%M").astype(object)
+        elif pd.api.types.is_float_dtype(series):
+            normalized = series.astype(object)
+            integral_mask = ~missing_mask & series.mod(1).eq(0)
+            exact_mask = integral_mask & series.abs().lt(2**53)
+            if exact_mask.any():
+                normalized[exact_mask] = series[exact_mask].astype("int64").astype(object)
+            if (integral_mask & ~exact_mask).any():
+                normalized[integral_mask & ~exact_mask] = series[integral_mask & ~exact_mask].map(int)
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            normalized = series.map(normalize_editor_cell_value).astype(object)
+        else:
+            normalized = series.astype(object)
+        if missing_mask.any():
+            normalized[missing_mask] = ""
+        normalized_columns[header] = normalized
+    return pd.DataFrame(normalized_columns, index=frame.index, columns=headers, dtype=object)
+
+
 def has_non_empty_editor_value(value: Any) -> bool:
     normalized = normalize_editor_cell_value(value)
     if normalized is None:
         return False
     if isinstance(normalized, str):
-        return bool(normalized.strip())
+        # Strings come back from normalize_editor_cell_value already stripped.
+        return bool(normalized)
     return True
 
 
+@lru_cache(maxsize=256)
 def header_is_id(header: str) -> bool:
     lowered = header.lower()
-    return any(
-        token in lowered
-        for token in (" id", "id ", "po number", "po #", "po#", "record number")
-    ) or lowered in {"id", "po"}
+    return lowered in _ID_HEADER_EXACT or _ID_HEADER_RE.search(lowered) is not None
 
 
+@lru_cache(maxsize=256)
 def header_is_timestamp(header: str) -> bool:
     lowered = header.lower()
-    return any(token in lowered for token in ("created", "timestamp", "entered", "entry"))
+    return _TIMESTAMP_HEADER_RE.search(lowered) is not None
 
 
+@lru_cache(maxsize=256)
 def header_is_date_like(header: str) -> bool:
     lowered = header.lower()
     return "date" in lowered or header_is_timestamp(header)
 
 
 def field_key(sheet_name: str, header: str, scope: str = "") -> str:
-    slug = re.sub(r"[^a-zA-Z0-9]+", "_", header).strip("_").lower()
+    slug = _FIELD_KEY_RE.sub("_", header).strip("_").lower()
     scope_token = str(scope).strip()
     if scope_token:
         return f"field::{scope_token}::{sheet_name}::{slug}"
@@ -678,10 +830,11 @@ def ensure_required_headers(headers: list[str]) -> list[str]:
 
 
 def normalize_location_code(value: str) -> str:
-    return re.sub(r"[^A-Z0-9_-]", "", value.strip().upper())
+    return _LOC_NORM_RE.sub("", value.strip().upper())
 
 
-def build_location_alias_lookup(location_options: list[str] | None = None) -> dict[str, str]:
+@lru_cache(maxsize=32)
+def build_location_alias_lookup(location_options: tuple[str, ...] | None = None) -> dict[str, str]:
     alias_lookup: dict[str, str] = {}
     for raw_code in (location_options or []):
         normalized_code = normalize_location_code(str(raw_code))
@@ -706,7 +859,7 @@ def extract_location_code(
     raw_department_loc_value: Any,
     location_options: list[str] | None = None,
 ) -> str:
-    alias_lookup = build_location_alias_lookup(location_options)
+    alias_lookup = build_location_alias_lookup(tuple(location_options) if location_options else None)
 
     def parse_location_text(raw_value: Any) -> str:
         text = str(raw_value).strip()
@@ -718,7 +871,7 @@ def extract_location_code(
 
         tokens = [
             normalize_location_code(token)
-            for token in re.split(r"[^A-Za-z0-9]+", text.upper())
+            for token in _LOC_SPLIT_RE.split(text.upper())
             if str(token).strip()
         ]
         for token in tokens:
@@ -733,12 +886,22 @@ def extract_location_code(
 
 
 def validate_workbook_input(raw_value: str, resolved_path: Path) -> str | None:
-    workbook_text = str(raw_value).strip()
+    # main() validates on every rerun; the time bucket bounds how long a cached
+    # folder check on a (possibly slow) network path can go stale.
+    return _validate_workbook_input_cached(
+        str(raw_value).strip(),
+        resolved_path,
+        int(time.monotonic() // WORKBOOK_VALIDATION_TTL_SECONDS),
+    )
+
+
+@lru_cache(maxsize=128)
+def _validate_workbook_input_cached(workbook_text: str, resolved_path: Path, time_bucket: int) -> str | None:
     if not workbook_text:
         return "Workbook path cannot be blank."
 
     lowered_text = workbook_text.lower()
-    if lowered_text.startswith("http://") or lowered_text.startswith("https://"):
+    if lowered_text.startswith(("http://", "https://")):
         return (
             "Web links are not supported as workbook paths. "
             "Use a local or network Excel file path instead."
@@ -762,12 +925,23 @@ def validate_workbook_input(raw_value: str, resolved_path: Path) -> str | None:
             "(.xlsx/.xlsm/.xltx/.xltm)."
         )
 
-    if resolved_path.exists() and resolved_path.is_dir():
+    # is_dir() is False for missing paths, so one stat covers both checks.
+    if resolved_path.is_dir():
         return "Workbook path points to a folder. Select an Excel workbook file instead."
 
     return None
 
 
+@lru_cache(maxsize=256)
+def _expand_path(path_text: str) -> Path:
+    # Path is immutable, so reruns can share one expanded instance per string.
+    return Path(path_text).expanduser()
+
+
+def _default_backup_dir(workbook_text: str) -> str:
+    return str(_expand_path(workbook_text).parent / "PO_Backups")
+
+
 def path_key(path: Path) -> str:
     try:
         return str(path.expanduser().resolve()).casefold()
@@ -775,6 +949,12 @@ def path_key(path: Path) -> str:
         return str(path).casefold()
 
 
+@lru_cache(maxsize=512)
+def _text_path_key(path_text: str) -> str:
+    # For settings-dialog comparisons of typed paths, which repeat across reruns.
+    return path_key(_expand_path(path_text))
+
+
 def is_network_path(path: Path) -> bool:
     text = str(path).strip()
     if text.startswith("\\\\") or text.startswith("//"):
@@ -788,28 +968,39 @@ def is_network_path(path: Path) -> bool:
         return False
 
     try:
-        import ctypes
-
-        drive_root = f"{drive}\\"
-        drive_type = ctypes.windll.kernel32.GetDriveTypeW(drive_root)
         # DRIVE_REMOTE == 4
-        return int(drive_type) == 4
+        return get_drive_type(f"{drive.upper()}\\") == 4
     except Exception:
         return False
 
 
+@lru_cache(maxsize=32)
+def get_drive_type(drive_root: str) -> int:
+    if _KERNEL32 is None:
+        return 0
+    return int(_KERNEL32.GetDriveTypeW(drive_root))
+
+
 def copy_file_with_retry(
     source: Path,
     destination: Path,
     retries: int = 3,
     delay_seconds: float = 0.2,
 ) -> None:
+    try:
+        # Path equality is case-insensitive on Windows and exact elsewhere,
+        # unlike path_key which always casefolds.
+        if source.expanduser().resolve() == destination.expanduser().resolve():
+            return
+    except Exception:
+        pass
+
     attempts = max(1, int(retries))
     last_error: Exception | None = None
     for attempt in range(attempts):
         try:
             destination.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(source, destination)
+            _copy_file_fast(source, destination)
             return
         except Exception as exc:
             last_error = exc
@@ -819,6 +1010,31 @@ def copy_file_with_retry(
         raise last_error
 
 
+def _copy_file_fast(source: Path, destination: Path) -> None:
+    # copy_file_range stays in the kernel and can reflink on btrfs/XFS; any
+    # failure (old kernel, cross-device, unsupported fs) falls back to copy2.
+    # Some filesystems return 0 before EOF, so a short copy also falls back
+    # rather than leaving a truncated workbook or backup behind.
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(source, "rb") as source_file, open(destination, "wb") as destination_file:
+                expected_size = os.fstat(source_file.fileno()).st_size
+                copied_size = 0
+                while copied_size < expected_size:
+                    copied = os.copy_file_range(
+                        source_file.fileno(), destination_file.fileno(), expected_size - copied_size
+                    )
+                    if copied <= 0:
+                        break
+                    copied_size += copied
+            if copied_size == expected_size:
+                shutil.copystat(source, destination)
+                return
+        except OSError:
+            pass
+    shutil.copy2(source, destination)
+
+
 def open_workbook_with_retry(
     path: Path | str,
     *,
@@ -848,41 +1064,43 @@ def open_workbook_with_retry(
     raise FileNotFoundError(f"Could not open workbook: {workbook_path}")
 
 
-def hex_to_rgb_triplet(value: str, fallback: str = "11, 87, 208") -> str:
+@lru_cache(maxsize=256)
+def _parse_hex(value: str) -> tuple[int, int, int] | None:
     text = str(value).strip().lstrip("#")
     if len(text) == 3:
         text = "".join(char * 2 for char in text)
-    if len(text) != 6 or any(char not in "0123456789abcdefABCDEF" for char in text):
-        return fallback
+    if len(text) != 6:
+        return None
+    try:
+        red, green, blue = bytes.fromhex(text)
+    except ValueError:
+        return None
+    return red, green, blue
+
 
-    red = int(text[0:2], 16)
-    green = int(text[2:4], 16)
-    blue = int(text[4:6], 16)
+@lru_cache(maxsize=256)
+def hex_to_rgb_triplet(value: str, fallback: str = "11, 87, 208") -> str:
+    rgb = _parse_hex(value)
+    if rgb is None:
+        return fallback
+    red, green, blue = rgb
     return f"{red}, {green}, {blue}"
 
 
+@lru_cache(maxsize=256)
 def contrast_text_color(background_hex: str, light: str = "#ffffff", dark: str = "#111111") -> str:
-    text = str(background_hex).strip().lstrip("#")
-    if len(text) == 3:
-        text = "".join(char * 2 for char in text)
-    if len(text) != 6 or any(char not in "0123456789abcdefABCDEF" for char in text):
+    luminance = hex_luminance(background_hex, -1.0)
+    if luminance < 0:
         return light
-    red = int(text[0:2], 16)
-    green = int(text[2:4], 16)
-    blue = int(text[4:6], 16)
-    luminance = (0.2126 * red + 0.7152 * green + 0.0722 * blue) / 255.0
     return dark if luminance >= 0.62 else light
 
 
+@lru_cache(maxsize=256)
 def hex_luminance(value: str, fallback: float = 0.5) -> float:
-    text = str(value).strip().lstrip("#")
-    if len(text) == 3:
-        text = "".join(char * 2 for char in text)
-    if len(text) != 6 or any(char not in "0123456789abcdefABCDEF" for char in text):
+    rgb = _parse_hex(value)
+    if rgb is None:
         return fallback
-    red = int(text[0:2], 16)
-    green = int(text[2:4], 16)
-    blue = int(text[4:6], 16)
+    red, green, blue = rgb
     return (0.2126 * red + 0.7152 * green + 0.0722 * blue) / 255.0
 
 
@@ -893,6 +1111,7 @@ def theme_preview_text_color(theme_palette: dict[str, str]) -> str:
     return "#111827" if average_luminance >= 0.62 else "#f8fbff"
 
 
+@st.cache_data(show_spinner=False, max_entries=64)
 def resolve_theme_palette(theme_name: str) -> dict[str, str]:
     fallback_light = dict(THEME_PRESETS.get("Sky", {}))
     fallback_dark = dict(THEME_PRESETS.get("Midnight Aurora", {}))
@@ -932,15 +1151,212 @@ def resolve_theme_palette(theme_name: str) -> dict[str, str]:
             resolved["muted"] = fallback_dark.get("muted", "#afbadb")
 
     resolved["outline"] = str(resolved.get("outline", resolved.get("border", "#d2d9e8")))
-    if not str(resolved.get("placeholder", "")).strip():
-        resolved["placeholder"] = str(resolved.get("muted", "#6e7280"))
-    if not str(resolved.get("disabled_text", "")).strip():
-        resolved["disabled_text"] = str(resolved.get("muted", "#6e7280"))
+    for token_name in ("placeholder", "disabled_text"):
+        token_value = str(resolved.get(token_name, "")).strip()
+        resolved[token_name] = token_value or str(resolved.get("muted", "#6e7280")).strip()
     return {key: str(value) for key, value in resolved.items()}
 
 
+def _minify_css(css_text: str) -> str:
+    # Drops comments and layout whitespace outside quoted strings. The space
+    # before ":" is kept because "a :hover" and "a:hover" select different elements.
+    parts = _CSS_STRING_RE.split(_CSS_COMMENT_RE.sub("", css_text))
+    for index in range(0, len(parts), 2):
+        collapsed = _CSS_SPACE_RE.sub(" ", parts[index]).replace(": ", ":")
+        parts[index] = _CSS_PUNCT_SPACE_RE.sub(r"\1", collapsed)
+    return "".join(parts).strip().replace(";}", "}")
+
+
+@lru_cache(maxsize=1)
+def load_static_css_block() -> str:
+    # Palette-independent rules live in assets/potrol_theme.css; read once per process.
+    try:
+        css_text = APP_THEME_CSS_PATH.read_text(encoding="utf-8")
+    except Exception:
+        return ""
+    return f"<style>{_minify_css(css_text)}</style>"
+
+
+_THEME_TOKENS_CSS = """<style>
+:root,
+html,
+body,
+.stApp,
+[data-testid="stApp"],
+[data-testid="stAppViewContainer"],
+[data-testid="stDialog"] [role="dialog"] {{
+    color-scheme: {color_scheme};
+    --potrol-bg-start: {bg_start};
+    --potrol-bg-end: {bg_end};
+    --potrol-surface: {surface};
+    --potrol-surface-soft: {surface_soft};
+    --potrol-border: {border};
+    --potrol-outline: {outline};
+    --potrol-text: {text};
+    --potrol-muted: {muted};
+    --potrol-accent: {accent};
+    --potrol-accent-strong: {accent_strong};
+    --potrol-accent-rgb: {accent_rgb};
+    --potrol-accent-strong-rgb: {accent_strong_rgb};
+    --potrol-disabled-bg: {surface_soft};
+    --potrol-placeholder: {placeholder};
+    --potrol-disabled-text: {disabled_text};
+    --primary-color: {accent};
+    --secondary-background-color: {surface_soft};
+    --background-color: {bg_end};
+    --text-color: {text};
+}}
+</style>
+"""
+
+# Menu button glyphs stay white against E-Ink's near-black accent.
+_E_INK_OVERRIDE_CSS = """<style>
+[data-testid="stPopover"] > div > button,
+[data-testid="stPopover"] > div > button *,
+[data-testid="stPopoverButton"] > button,
+[data-testid="stPopoverButton"] > button *,
+[class*="st-key-open_settings_menu_button"] button,
+[class*="st-key-open_settings_menu_button"] button *,
+[class*="st-key-open_about_menu_button"] button,
+[class*="st-key-open_about_menu_button"] button * {
+    color: #ffffff !important;
+    fill: #ffffff !important;
+    -webkit-text-fill-color: #ffffff !important;
+}
+</style>
+"""
+
+
+# lru_cache rather than st.cache_data: presets are fixed at import, and a plain
+# dict hit avoids hashing the argument and unpickling the string on every rerun.
+@lru_cache(maxsize=64)
+def build_theme_css(theme_name: str) -> str:
+    # Only the palette tokens vary per theme; every rule reading them is in the
+    # static stylesheet, so a theme switch re-sends this :root block alone.
+    # resolve_theme_palette already settles color_scheme, outline, placeholder and
+    # disabled_text, so the palette feeds the template as-is.
+    theme_palette = resolve_theme_palette(theme_name)
+    tokens = {
+        **theme_palette,
+        "accent_rgb": hex_to_rgb_triplet(theme_palette["accent"], "11, 87, 208"),
+        "accent_strong_rgb": hex_to_rgb_triplet(theme_palette["accent_strong"], "8, 66, 160"),
+    }
+    theme_css = _THEME_TOKENS_CSS.format_map(tokens)
+    if theme_name == "E-Ink":
+        theme_css += _E_INK_OVERRIDE_CSS
+    return _minify_css(theme_css)
+
+
+_THEME_CARD_CSS = """<style>
+[class*='st-key-{button_key}'] button {{
+    min-height: 8.2rem !important;
+    border-radius: 16px !important;
+    border: 1px solid {border} !important;
+    color: {text_color} !important;
+    background-color: {bg_end} !important;
+    background-image:
+        linear-gradient(120deg, {accent} 0%, {accent_strong} 100%),
+        linear-gradient(180deg, {surface_soft} 0%, {surface_soft} 100%),
+        linear-gradient(180deg, {surface} 0%, {surface} 100%),
+        linear-gradient(180deg, {surface} 0%, {surface} 100%),
+        linear-gradient(180deg, rgba({accent_rgb}, 0.44) 0%, rgba({accent_rgb}, 0.44) 100%),
+        linear-gradient(180deg, rgba({accent_rgb}, 0.28) 0%, rgba({accent_rgb}, 0.28) 100%),
+        linear-gradient(135deg, {bg_start} 0%, {bg_end} 100%) !important;
+    background-repeat: no-repeat !important;
+    background-size:
+        100% 22%,
+        23% 66%,
+        62% 15%,
+        62% 15%,
+        34% 7%,
+        23% 7%,
+        100% 100% !important;
+    background-position:
+        0 0,
+        6% 27%,
+        32% 30%,
+        32% 50%,
+        32% 71%,
+        32% 82%,
+        0 0 !important;
+    padding: 5.05rem 0.62rem 0.62rem 0.62rem !important;
+    text-align: left !important;
+    white-space: pre-wrap !important;
+    line-height: 1.2 !important;
+    font-weight: 700 !important;
+    box-shadow: 0 1px 2px rgba(17, 24, 39, 0.14) !important;
+    transition: transform 140ms ease, box-shadow 160ms ease, border-color 160ms ease !important;
+}}
+[class*='st-key-{button_key}'] button p {{
+    color: {text_color} !important;
+    font-size: 0.74rem !important;
+    line-height: 1.22 !important;
+    letter-spacing: 0.01em !important;
+    margin: 0 !important;
+    display: inline-block !important;
+    background: {label_background} !important;
+    border: 1px solid {label_border} !important;
+    border-radius: 10px !important;
+    padding: 0.23rem 0.42rem !important;
+    backdrop-filter: blur(1px) !important;
+}}
+[class*='st-key-{button_key}'] button:hover {{
+    border-color: {accent} !important;
+    box-shadow: 0 10px 24px rgba({accent_rgb}, 0.30), 0 0 0 1px rgba({accent_rgb}, 0.20) !important;
+    transform: translateY(-2px) !important;
+}}
+[class*='st-key-{button_key}'] button:focus-visible {{
+    box-shadow: 0 0 0 3px rgba({accent_rgb}, 0.30), 0 10px 24px rgba({accent_rgb}, 0.28) !important;
+}}
+[class*='st-key-{button_key}'] button:disabled {{
+    opacity: 1 !important;
+    cursor: default !important;
+    transform: none !important;
+    border-color: {accent} !important;
+    box-shadow: 0 0 0 2px rgba({accent_rgb}, 0.36), 0 9px 22px rgba({accent_rgb}, 0.22) !important;
+}}
+[class*='st-key-{button_key}'] button:disabled p {{
+    color: {text_color} !important;
+}}
+</style>
+"""
+
+
+# Each card's rules depend only on its theme and button key, so the formatted and
+# minified block is built once per process rather than once per dialog render.
+@lru_cache(maxsize=256)
+def build_theme_card_css(theme_name: str, button_key: str) -> str:
+    preview_theme = resolve_theme_palette(theme_name)
+    text_color = theme_preview_text_color(preview_theme)
+    text_is_light = text_color.casefold() in {"#f8fbff", "#ffffff", "white"}
+    tokens = {
+        **preview_theme,
+        "button_key": button_key,
+        "text_color": text_color,
+        "accent_rgb": hex_to_rgb_triplet(preview_theme.get("accent", "#0b57d0"), "11, 87, 208"),
+        "label_background": "rgba(10, 14, 22, 0.46)" if text_is_light else "rgba(255, 255, 255, 0.76)",
+        "label_border": "rgba(255, 255, 255, 0.34)" if text_is_light else "rgba(17, 24, 39, 0.24)",
+    }
+    return _minify_css(_THEME_CARD_CSS.format_map(tokens))
+
+
+@lru_cache(maxsize=1)
+def _build_theme_catalog() -> MappingProxyType[str, tuple[str, str]]:
+    # Theme name -> (casefolded name, "light"/"dark"), in casefold order. Presets
+    # are fixed at import, so the picker resolves every palette once per process.
+    catalog: dict[str, tuple[str, str]] = {}
+    for theme_name in sorted(THEME_PRESETS, key=lambda value: value.casefold()):
+        raw_scheme = str(resolve_theme_palette(theme_name).get("color_scheme", "light")).strip().lower()
+        catalog[theme_name] = (theme_name.casefold(), "dark" if raw_scheme == "dark" else "light")
+    return MappingProxyType(catalog)
+
+
 def canonical_theme_name(theme_name: str) -> str:
-    raw_theme_name = str(theme_name).strip()
+    return _canonical_theme_name_cached(str(theme_name).strip())
+
+
+@lru_cache(maxsize=64)
+def _canonical_theme_name_cached(raw_theme_name: str) -> str:
     if not raw_theme_name:
         return ""
 
@@ -950,18 +1366,13 @@ def canonical_theme_name(theme_name: str) -> str:
         return raw_theme_name
 
     normalized_name = raw_theme_name.casefold()
-    for old_name, mapped_name in THEME_NAME_ALIASES.items():
-        if old_name.casefold() == normalized_name:
-            return mapped_name
-
-    for preset_name in THEME_PRESETS:
-        if preset_name.casefold() == normalized_name:
-            return preset_name
-
-    return raw_theme_name
+    return _THEME_ALIAS_LOWER.get(normalized_name) or _THEME_LOWER_MAP.get(normalized_name, raw_theme_name)
 
 
 def normalize_backup_keep_latest(value: Any, default: int = DEFAULT_BACKUP_KEEP_LATEST) -> int:
+    # Session state and number_input already hold ints; only clamp those.
+    if type(value) is int:
+        return min(MAX_BACKUP_KEEP_LATEST, max(MIN_BACKUP_KEEP_LATEST, value))
     try:
         parsed = int(str(value).strip())
     except Exception:
@@ -980,18 +1391,30 @@ def append_runtime_log(level: str, context: str, message: str) -> None:
 
     line = f"{datetime.now().isoformat(timespec='seconds')} [{level_text}] {context_text} :: {message_text}\n"
 
+    global _LOG_WRITES_SINCE_ROTATE
     try:
         APP_RUNTIME_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with APP_RUNTIME_LOG_PATH.open("a", encoding="utf-8") as handle:
-            handle.write(line)
+        with APP_RUNTIME_LOG_PATH.open("ab", buffering=65536) as handle:
+            handle.write(line.encode("utf-8"))
     except Exception:
         return
 
+    # Trimming reads the whole log back, so only do it every
+    # RUNTIME_LOG_ROTATE_EVERY writes (and on the first write of the process).
+    rotate_due = _LOG_WRITES_SINCE_ROTATE % RUNTIME_LOG_ROTATE_EVERY == 0
+    _LOG_WRITES_SINCE_ROTATE += 1
+    if not rotate_due:
+        return
+
     try:
-        lines = APP_RUNTIME_LOG_PATH.read_text(encoding="utf-8", errors="replace").splitlines()
-        if len(lines) > MAX_RUNTIME_LOG_LINES:
-            trimmed_lines = lines[-MAX_RUNTIME_LOG_LINES:]
-            APP_RUNTIME_LOG_PATH.write_text("\n".join(trimmed_lines) + "\n", encoding="utf-8")
+        line_count = 0
+        tail_lines: deque[bytes] = deque(maxlen=MAX_RUNTIME_LOG_LINES)
+        with APP_RUNTIME_LOG_PATH.open("rb") as handle:
+            for raw_line in handle:
+                line_count += 1
+                tail_lines.append(raw_line)
+        if line_count > MAX_RUNTIME_LOG_LINES:
+            APP_RUNTIME_LOG_PATH.write_bytes(b"".join(tail_lines))
     except Exception:
         pass
 
@@ -1009,8 +1432,24 @@ def read_runtime_log_tail(max_lines: int = 120) -> list[str]:
     try:
         if not APP_RUNTIME_LOG_PATH.exists():
             return []
-        log_lines = APP_RUNTIME_LOG_PATH.read_text(encoding="utf-8", errors="replace").splitlines()
-        return log_lines[-bounded_lines:]
+        with APP_RUNTIME_LOG_PATH.open("rb") as handle:
+            if os.fstat(handle.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                end = len(mapped)
+                if mapped[end - 1 : end] == b"\n":
+                    end -= 1
+                start = end
+                for _ in range(bounded_lines):
+                    newline_index = mapped.rfind(b"\n", 0, start)
+                    if newline_index < 0:
+                        start = 0
+                        break
+                    start = newline_index
+                else:
+                    start += 1
+                tail_bytes = mapped[start:end]
+        return tail_bytes.decode("utf-8", errors="replace").splitlines()
     except Exception:
         return []
 
@@ -1019,7 +1458,18 @@ def get_runtime_log_line_count() -> int:
     try:
         if not APP_RUNTIME_LOG_PATH.exists():
             return 0
-        return len(APP_RUNTIME_LOG_PATH.read_text(encoding="utf-8", errors="replace").splitlines())
+        with APP_RUNTIME_LOG_PATH.open("rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if size == 0:
+                return 0
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                # mmap has no count(); scan it in slices to keep copies bounded.
+                line_count = sum(
+                    mapped[offset : offset + 1048576].count(b"\n") for offset in range(0, size, 1048576)
+                )
+                if mapped[size - 1 : size] != b"\n":
+                    line_count += 1
+                return line_count
     except Exception:
         return 0
 
@@ -1031,10 +1481,14 @@ def clear_runtime_log() -> None:
         pass
 
 
-def render_logo_image(path: Path, width: int = 360, palette: dict[str, str] | None = None) -> None:
-    if not path.exists():
-        return
-
+@lru_cache(maxsize=16)
+def _logo_data_uri(
+    path_str: str,
+    mtime_ns: int,
+    palette_key: tuple[tuple[str, str], ...] | None,
+) -> str:
+    # mtime_ns only keys the cache so an edited logo file is re-read.
+    path = Path(path_str)
     suffix = path.suffix.lower()
     if suffix == ".svg":
         mime_type = "image/svg+xml"
@@ -1043,33 +1497,40 @@ def render_logo_image(path: Path, width: int = 360, palette: dict[str, str] | No
     else:
         mime_type = "image/png"
 
-    try:
-        raw_bytes = path.read_bytes()
-        if suffix == ".svg" and palette is not None:
-            svg_text = raw_bytes.decode("utf-8")
-            replacement_map = {
-                "#0b67c2": palette.get("accent", "#0b67c2"),
-                "#14b8a6": palette.get("accent_strong", "#14b8a6"),
-                "#0f172a": palette.get("text", "#0f172a"),
-                "#476581": palette.get("muted", "#476581"),
-                "#8ba4bf": palette.get("border", "#8ba4bf"),
-                "#d9e4f2": palette.get("surface_soft", "#d9e4f2"),
-                "#f8fafc": palette.get("surface", "#f8fafc"),
-            }
-            for source_color, target_color in replacement_map.items():
-                svg_text = re.sub(
-                    re.escape(source_color),
-                    target_color,
-                    svg_text,
-                    flags=re.IGNORECASE,
-                )
-            raw_bytes = svg_text.encode("utf-8")
+    raw_bytes = path.read_bytes()
+    if suffix == ".svg" and palette_key is not None:
+        palette = dict(palette_key)
+        svg_text = raw_bytes.decode("utf-8")
+        replacement_map = {
+            "#0b67c2": palette.get("accent", "#0b67c2"),
+            "#14b8a6": palette.get("accent_strong", "#14b8a6"),
+            "#0f172a": palette.get("text", "#0f172a"),
+            "#476581": palette.get("muted", "#476581"),
+            "#8ba4bf": palette.get("border", "#8ba4bf"),
+            "#d9e4f2": palette.get("surface_soft", "#d9e4f2"),
+            "#f8fafc": palette.get("surface", "#f8fafc"),
+        }
+        svg_text = _LOGO_COLOR_RE.sub(
+            lambda match: replacement_map[match.group(0).lower()],
+            svg_text,
+        )
+        raw_bytes = svg_text.encode("utf-8")
+
+    encoded = base64.b64encode(raw_bytes).decode("ascii")
+    return f"data:{mime_type};base64,{encoded}"
+
 
-        encoded = base64.b64encode(raw_bytes).decode("ascii")
+def render_logo_image(path: Path, width: int = 360, palette: dict[str, str] | None = None) -> None:
+    if not path.exists():
+        return
+
+    try:
+        palette_key = tuple(sorted((str(key), str(value)) for key, value in palette.items())) if palette else None
+        data_uri = _logo_data_uri(str(path), path.stat().st_mtime_ns, palette_key)
         st.markdown(
             f"""
             <div class="potrol-logo-wrap">
-                <img src="data:{mime_type};base64,{encoded}" alt="POtrol" style="width:{int(width)}px; max-width:100%; height:auto; display:block;" />
+                <img src="{data_uri}" alt="POtrol" style="width:{int(width)}px; max-width:100%; height:auto; display:block;" />
             </div>
             """,
             unsafe_allow_html=True,
@@ -1078,10 +1539,27 @@ def render_logo_image(path: Path, width: int = 360, palette: dict[str, str] | No
         st.image(str(path), use_container_width=False, width=width)
 
 
+def dump_json_bytes(payload: Any, compact: bool = False) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload) if compact else orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass
+    if compact:
+        return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return json.dumps(payload, indent=2).encode("utf-8")
+
+
+def load_json_bytes(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
+
+
 def load_location_options() -> list[str]:
     if LOCATION_CONFIG_PATH.exists():
         try:
-            saved = json.loads(LOCATION_CONFIG_PATH.read_text(encoding="utf-8"))
+            saved = load_json_bytes(LOCATION_CONFIG_PATH.read_bytes())
             if isinstance(saved, list):
                 cleaned = [normalize_location_code(str(item)) for item in saved]
                 options = [code for code in cleaned if code]
@@ -1089,19 +1567,18 @@ def load_location_options() -> list[str]:
                     return sorted(set(options))
         except Exception:
             pass
-    return DEFAULT_LOCATION_OPTIONS.copy()
+    return list(DEFAULT_LOCATION_OPTIONS)
 
 
 def save_location_options(options: list[str]) -> None:
     cleaned = sorted(set(normalize_location_code(option) for option in options if option))
-    LOCATION_CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    LOCATION_CONFIG_PATH.write_text(json.dumps(cleaned, indent=2), encoding="utf-8")
+    write_json_dict_atomic(LOCATION_CONFIG_PATH, cleaned, keep_backup=False)
 
 
 def load_app_settings() -> dict[str, Any]:
     if APP_SETTINGS_PATH.exists():
         try:
-            saved = json.loads(APP_SETTINGS_PATH.read_text(encoding="utf-8"))
+            saved = load_json_bytes(APP_SETTINGS_PATH.read_bytes())
             if isinstance(saved, dict):
                 workbook_path = str(saved.get("workbook_path", "")).strip()
                 backup_dir = str(saved.get("backup_dir", "")).strip()
@@ -1160,19 +1637,37 @@ def save_app_settings(
         "update_manifest_url": manifest_value,
         "backup_keep_latest": keep_latest_value,
     }
-    APP_SETTINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
-    APP_SETTINGS_PATH.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    write_json_dict_atomic(APP_SETTINGS_PATH, payload, keep_backup=False)
+
+
+def _json_stat_key(path: Path) -> tuple[int, int, int] | None:
+    try:
+        stat_result = path.stat()
+    except OSError:
+        return None
+    # st_ino changes on every os.replace, so atomic rewrites always miss.
+    return (stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino)
 
 
 def load_json_dict(path: Path) -> dict[str, Any]:
+    cache_key = str(path)
+    stat_key = _json_stat_key(path)
+    if stat_key is not None:
+        cached_entry = _JSON_DICT_CACHE.get(cache_key)
+        if cached_entry is not None and cached_entry[0] == stat_key:
+            # Callers only add or drop top-level keys, so a shallow copy is enough.
+            return dict(cached_entry[1])
+
     backup_path = path.with_suffix(f"{path.suffix}.bak")
     candidate_paths = [path, backup_path]
 
     for index, candidate in enumerate(candidate_paths):
-        if not candidate.exists():
+        try:
+            data = candidate.read_bytes()
+        except OSError:
             continue
         try:
-            loaded = json.loads(candidate.read_text(encoding="utf-8"))
+            loaded = load_json_bytes(data)
             if isinstance(loaded, dict):
                 # Self-heal from backup if the primary file is corrupt.
                 if index == 1 and candidate != path:
@@ -1180,6 +1675,11 @@ def load_json_dict(path: Path) -> dict[str, Any]:
                         write_json_dict_atomic(path, loaded, keep_backup=False)
                     except Exception:
                         pass
+                elif stat_key is not None:
+                    _JSON_DICT_CACHE.pop(cache_key, None)
+                    if len(_JSON_DICT_CACHE) >= JSON_DICT_CACHE_MAX_KEYS:
+                        _JSON_DICT_CACHE.pop(next(iter(_JSON_DICT_CACHE)), None)
+                    _JSON_DICT_CACHE[cache_key] = (stat_key, dict(loaded))
                 return loaded
         except Exception:
             continue
@@ -1188,10 +1688,14 @@ def load_json_dict(path: Path) -> dict[str, Any]:
 
 def write_json_dict_atomic(
     path: Path,
-    payload: dict[str, Any],
+    payload: dict[str, Any] | list[Any],
     *,
     keep_backup: bool = True,
+    durable: bool = True,
+    backup_every_n: int = 1,
+    compact: bool = False,
 ) -> None:
+    _JSON_DICT_CACHE.pop(str(path), None)
     path.parent.mkdir(parents=True, exist_ok=True)
     temp_fd, temp_name = tempfile.mkstemp(
         prefix=f"{path.name}.",
@@ -1199,16 +1703,27 @@ def write_json_dict_atomic(
         dir=str(path.parent),
     )
     try:
-        with os.fdopen(temp_fd, "w", encoding="utf-8") as temp_file:
-            json.dump(payload, temp_file, indent=2)
-            temp_file.flush()
-            os.fsync(temp_file.fileno())
+        with os.fdopen(temp_fd, "wb") as temp_file:
+            temp_file.write(dump_json_bytes(payload, compact=compact))
+            if durable:
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
         if keep_backup and path.exists():
             backup_path = path.with_suffix(f"{path.suffix}.bak")
-            try:
-                copy_file_with_retry(path, backup_path, retries=2, delay_seconds=0.08)
-            except Exception:
-                pass
+            backup_tick = _BACKUP_TICK.get(str(path), 0)
+            _BACKUP_TICK[str(path)] = backup_tick + 1
+            # Hot files only refresh the .bak every N writes, or when it has gone stale.
+            backup_due = backup_every_n <= 1 or backup_tick % backup_every_n == 0
+            if not backup_due:
+                try:
+                    backup_due = time.time() - backup_path.stat().st_mtime >= JSON_BACKUP_MAX_AGE_SECONDS
+                except OSError:
+                    backup_due = True
+            if backup_due:
+                try:
+                    copy_file_with_retry(path, backup_path, retries=2, delay_seconds=0.08)
+                except Exception:
+                    pass
         os.replace(temp_name, path)
     finally:
         try:
@@ -1224,24 +1739,23 @@ def build_draft_key(workbook_path: Path, sheet_name: str) -> str:
 
 
 def sanitize_draft_payload(payload: dict[str, Any]) -> dict[str, Any]:
-    line_items_raw = payload.get("line_items", [])
-    line_items = ensure_line_item_rows(line_items_raw)
-    return {
-        "vendor": str(payload.get("vendor", "")).strip(),
-        "department": str(payload.get("department", "IT")).strip(),
-        "location": str(payload.get("location", "")).strip(),
-        "line_items": line_items,
-        "shipping_cost": round(parse_float(payload.get("shipping_cost", 0.0), 0.0), 2),
-        "sales_tax": round(parse_float(payload.get("sales_tax", 0.0), 0.0), 2),
-        "purchase_reason": str(payload.get("purchase_reason", "")).strip(),
-        "saved_at_ts": float(payload.get("saved_at_ts", time.time()) or time.time()),
-    }
+    sanitized: dict[str, Any] = {}
+    for field_name, default in _DRAFT_STR_FIELDS:
+        value = payload.get(field_name, default)
+        sanitized[field_name] = value.strip() if isinstance(value, str) else str(value).strip()
+    sanitized["line_items"] = ensure_line_item_rows(payload.get("line_items", []))
+    sanitized["shipping_cost"] = round(parse_float(payload.get("shipping_cost", 0.0), 0.0), 2)
+    sanitized["sales_tax"] = round(parse_float(payload.get("sales_tax", 0.0), 0.0), 2)
+    sanitized["saved_at_ts"] = float(payload.get("saved_at_ts") or time.time())
+    return sanitized
 
 
 def load_entry_draft(workbook_path: Path, sheet_name: str) -> dict[str, Any] | None:
-    draft_store = load_json_dict(APP_DRAFTS_PATH)
     draft_key = build_draft_key(workbook_path, sheet_name)
-    draft_value = draft_store.get(draft_key)
+    with _DRAFT_FLUSH_LOCK:
+        draft_value = _DRAFT_DIRTY.get(draft_key)
+        if draft_value is None:
+            draft_value = load_json_dict(APP_DRAFTS_PATH).get(draft_key)
     if isinstance(draft_value, dict):
         try:
             return sanitize_draft_payload(draft_value)
@@ -1251,26 +1765,87 @@ def load_entry_draft(workbook_path: Path, sheet_name: str) -> dict[str, Any] | N
 
 
 def save_entry_draft(workbook_path: Path, sheet_name: str, payload: dict[str, Any]) -> None:
-    draft_store = load_json_dict(APP_DRAFTS_PATH)
+    global _DRAFT_FLUSH_TIMER
     draft_key = build_draft_key(workbook_path, sheet_name)
-    draft_store[draft_key] = sanitize_draft_payload(payload)
-    write_json_dict_atomic(APP_DRAFTS_PATH, draft_store)
+    sanitized_payload = sanitize_draft_payload(payload)
+    with _DRAFT_FLUSH_LOCK:
+        _DRAFT_DIRTY[draft_key] = sanitized_payload
+        if _DRAFT_FLUSH_TIMER is None:
+            # Coalesce rapid autosaves from every session into one rewrite.
+            _DRAFT_FLUSH_TIMER = threading.Timer(DRAFT_FLUSH_DELAY_SECONDS, flush_drafts)
+            _DRAFT_FLUSH_TIMER.daemon = True
+            _DRAFT_FLUSH_TIMER.start()
+
+
+def flush_drafts() -> None:
+    global _DRAFT_FLUSH_TIMER
+    with _DRAFT_FLUSH_LOCK:
+        if _DRAFT_FLUSH_TIMER is not None:
+            _DRAFT_FLUSH_TIMER.cancel()
+            _DRAFT_FLUSH_TIMER = None
+        if not _DRAFT_DIRTY:
+            return
+        pending_drafts = dict(_DRAFT_DIRTY)
+        _DRAFT_DIRTY.clear()
+        try:
+            draft_store = load_json_dict(APP_DRAFTS_PATH)
+            draft_store.update(pending_drafts)
+            write_json_dict_atomic(
+                APP_DRAFTS_PATH,
+                draft_store,
+                durable=False,
+                backup_every_n=JSON_HOT_BACKUP_EVERY,
+                compact=True,
+            )
+        except Exception as exc:
+            for draft_key, draft_value in pending_drafts.items():
+                _DRAFT_DIRTY.setdefault(draft_key, draft_value)
+            log_runtime_error("drafts.flush", exc)
 
 
 def clear_entry_draft(workbook_path: Path, sheet_name: str) -> None:
-    if not APP_DRAFTS_PATH.exists():
-        return
-    draft_store = load_json_dict(APP_DRAFTS_PATH)
     draft_key = build_draft_key(workbook_path, sheet_name)
-    if draft_key not in draft_store:
-        return
-    draft_store.pop(draft_key, None)
-    write_json_dict_atomic(APP_DRAFTS_PATH, draft_store)
+    with _DRAFT_FLUSH_LOCK:
+        _DRAFT_DIRTY.pop(draft_key, None)
+        stat_key = _json_stat_key(APP_DRAFTS_PATH)
+        if stat_key is None:
+            return
+        # Check the cached store in place so sheets without a draft skip the copy.
+        cached_entry = _JSON_DICT_CACHE.get(str(APP_DRAFTS_PATH))
+        if cached_entry is not None and cached_entry[0] == stat_key and draft_key not in cached_entry[1]:
+            return
+        draft_store = load_json_dict(APP_DRAFTS_PATH)
+        if draft_key not in draft_store:
+            return
+        draft_store.pop(draft_key, None)
+        if draft_store:
+            write_json_dict_atomic(
+                APP_DRAFTS_PATH,
+                draft_store,
+                durable=False,
+                backup_every_n=JSON_HOT_BACKUP_EVERY,
+                compact=True,
+            )
+            return
+        # Nothing left: drop the file (and its backup, so it cannot be restored) instead of writing {}.
+        _JSON_DICT_CACHE.pop(str(APP_DRAFTS_PATH), None)
+        for stale_path in (APP_DRAFTS_PATH, APP_DRAFTS_PATH.with_suffix(f"{APP_DRAFTS_PATH.suffix}.bak")):
+            try:
+                stale_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+
+atexit.register(flush_drafts)
+
+
+def _fingerprint(data: bytes, digest_size: int = 16) -> str:
+    return hashlib.blake2b(data, digest_size=digest_size).hexdigest()
 
 
 def draft_payload_hash(payload: dict[str, Any]) -> str:
     encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
-    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+    return _fingerprint(encoded.encode("utf-8"))
 
 
 def parse_version_key(value: str) -> tuple[int, ...]:
@@ -1284,14 +1859,31 @@ def is_version_newer(candidate: str, current: str) -> bool:
     return parse_version_key(candidate) > parse_version_key(current)
 
 
+@st.cache_data(show_spinner=False, ttl=UPDATE_MANIFEST_CACHE_TTL_SECONDS)
 def fetch_update_manifest(url: str) -> dict[str, str]:
     target_url = str(url).strip()
     if not target_url:
         raise ValueError("Update manifest URL is blank.")
 
-    with urlopen(target_url, timeout=8) as response:
-        charset = response.headers.get_content_charset() or "utf-8"
-        body_text = response.read().decode(charset, errors="replace")
+    # Every check past the short cache_data TTL revalidates with the last
+    # ETag/Last-Modified, so an unchanged manifest comes back as a bodiless 304.
+    cached_manifest = _MANIFEST_CACHE.get(target_url)
+    request_headers: dict[str, str] = {}
+    if cached_manifest is not None:
+        if cached_manifest[0]:
+            request_headers["If-None-Match"] = cached_manifest[0]
+        if cached_manifest[1]:
+            request_headers["If-Modified-Since"] = cached_manifest[1]
+    try:
+        with urlopen(Request(target_url, headers=request_headers), timeout=UPDATE_CHECK_TIMEOUT_SECONDS) as response:
+            charset = response.headers.get_content_charset() or "utf-8"
+            body_text = response.read().decode(charset, errors="replace")
+            etag = str(response.headers.get("ETag", "") or "")
+            last_modified = str(response.headers.get("Last-Modified", "") or "")
+    except HTTPError as exc:
+        if exc.code == 304 and cached_manifest is not None:
+            return dict(cached_manifest[2])
+        raise
 
     parsed = json.loads(body_text)
     if not isinstance(parsed, dict):
@@ -1303,31 +1895,50 @@ def fetch_update_manifest(url: str) -> dict[str, str]:
 
     download_url = str(parsed.get("download_url", "")).strip()
     notes = str(parsed.get("notes", "")).strip()
-    return {
+    manifest = {
         "version": version_value,
         "download_url": download_url,
         "notes": notes,
     }
+    if etag or last_modified:
+        _MANIFEST_CACHE[target_url] = (etag, last_modified, dict(manifest))
+    return manifest
 
 
 def get_workbook_signature(path: Path) -> str:
-    if not path.exists():
-        return ""
     try:
         stat_result = path.stat()
-        return f"{stat_result.st_mtime_ns}:{stat_result.st_size}"
     except Exception:
         return ""
+    return f"{stat_result.st_mtime_ns}:{stat_result.st_size}"
+
 
+@lru_cache(maxsize=64)
+def _workbook_signature_cached(path_str: str, tick: int) -> str:
+    return get_workbook_signature(Path(path_str))
 
+
+def get_workbook_signature_cached(path: Path) -> str:
+    # Shares one stat per path across a render pass; the tick rolls over every 500 ms.
+    # Conflict checks and PO reservation keep using the uncached get_workbook_signature.
+    return _workbook_signature_cached(str(path), int(time.monotonic() * 2))
+
+
+@lru_cache(maxsize=4096)
 def normalize_header_token(value: str) -> str:
-    return re.sub(r"[^a-z0-9]+", "", value.casefold())
+    return _HEADER_NORM_RE.sub("", value.casefold())
 
 
-def find_first_header(headers: list[str], aliases: list[str]) -> str | None:
+def find_first_header(
+    headers: list[str] | tuple[str, ...],
+    aliases: list[str],
+    header_tokens: list[str] | None = None,
+) -> str | None:
     alias_tokens = {normalize_header_token(alias) for alias in aliases}
-    for header in headers:
-        if normalize_header_token(str(header)) in alias_tokens:
+    if header_tokens is None:
+        header_tokens = [normalize_header_token(str(header)) for header in headers]
+    for header, token in zip(headers, header_tokens):
+        if token in alias_tokens:
             return header
     return None
 
@@ -1370,6 +1981,18 @@ def worksheet_effective_max_row(worksheet: Any) -> int:
     fallback = max(1, int(worksheet.max_row or 1))
     try:
         dimension_text = str(worksheet.calculate_dimension())
+    except ValueError:
+        dimension_text = ""
+    except Exception:
+        return fallback
+
+    if dimension_text in {"", "A1:A1"} and hasattr(worksheet, "reset_dimensions"):
+        # Some exporters write an unsized or A1:A1 dimension tag. Drop it so the
+        # read-only stream runs to the real end of the sheet data.
+        worksheet.reset_dimensions()
+        return PO_SCAN_HARD_ROW_LIMIT
+
+    try:
         match = re.search(r":[$A-Z]+(\d+)$", dimension_text)
         if not match:
             return fallback
@@ -1382,11 +2005,18 @@ def worksheet_effective_max_row(worksheet: Any) -> int:
 
 
 def build_entry_schema(headers: list[str]) -> tuple[str, dict[str, str], list[str]]:
-    po_header = find_first_header(headers, ["PO#", "PO #", "PO Number", "PO"])
-    date_header = find_first_header(headers, ["Date"])
-    vendor_header = find_first_header(headers, ["Vendor", "Vendor/Store"])
-    department_header = find_first_header(headers, ["Department", "Deparment"])
-    location_header = find_first_header(headers, ["Location", "Loc"])
+    entry_mode, mapping, ordered_headers = _build_entry_schema_cached(tuple(headers))
+    return entry_mode, dict(mapping), list(ordered_headers)
+
+
+@lru_cache(maxsize=64)
+def _build_entry_schema_cached(headers: tuple[str, ...]) -> tuple[str, dict[str, str], list[str]]:
+    header_tokens = [normalize_header_token(str(header)) for header in headers]
+    po_header = find_first_header(headers, ["PO#", "PO #", "PO Number", "PO"], header_tokens)
+    date_header = find_first_header(headers, ["Date"], header_tokens)
+    vendor_header = find_first_header(headers, ["Vendor", "Vendor/Store"], header_tokens)
+    department_header = find_first_header(headers, ["Department", "Deparment"], header_tokens)
+    location_header = find_first_header(headers, ["Location", "Loc"], header_tokens)
     dept_or_loc_header = find_first_header(
         headers,
         [
@@ -1397,12 +2027,13 @@ def build_entry_schema(headers: list[str]) -> tuple[str, dict[str, str], list[st
             "Location",
             "Loc",
         ],
+        header_tokens,
     )
-    item_header = find_first_header(headers, ["Item", "Items Being Purchased", "Items"])
-    price_header = find_first_header(headers, ["Price", "Price Per Item"])
-    qty_header = find_first_header(headers, ["QTY", "Quantity"])
-    sub_total_header = find_first_header(headers, ["Sub Total", "Subtotal"])
-    grand_total_header = find_first_header(headers, ["Grand Total", "GrandTotal"])
+    item_header = find_first_header(headers, ["Item", "Items Being Purchased", "Items"], header_tokens)
+    price_header = find_first_header(headers, ["Price", "Price Per Item"], header_tokens)
+    qty_header = find_first_header(headers, ["QTY", "Quantity"], header_tokens)
+    sub_total_header = find_first_header(headers, ["Sub Total", "Subtotal"], header_tokens)
+    grand_total_header = find_first_header(headers, ["Grand Total", "GrandTotal"], header_tokens)
 
     if all([po_header, item_header, price_header, qty_header, sub_total_header, grand_total_header]):
         if dept_or_loc_header:
@@ -1450,21 +2081,267 @@ def build_entry_schema(headers: list[str]) -> tuple[str, dict[str, str], list[st
     return "default", {}, DEFAULT_HEADERS.copy()
 
 
-def parse_po_number(value: Any, prefix: str) -> int | None:
+@lru_cache(maxsize=16)
+def _po_pattern(prefix: str) -> re.Pattern[str]:
+    return re.compile(rf"^\s*'?{re.escape(prefix.upper())}\s*[-_/]?\s*0*(\d+)\s*$")
+
+
+def parse_po_number(value: Any, prefix: str, pattern: re.Pattern[str] | None = None) -> int | None:
     if value is None:
         return None
 
     normalized = str(value).strip().upper()
-    pattern = rf"^\s*'?{re.escape(prefix.upper())}\s*[-_/]?\s*0*(\d+)\s*$"
-    match = re.match(pattern, normalized)
+    # Fast path for the common "PREFIX123" form; separators and quotes fall through to the regex.
+    prefix_upper = prefix.upper()
+    if normalized.startswith(prefix_upper):
+        digits = normalized[len(prefix_upper):]
+        if digits.isdecimal():
+            return int(digits)
+    match = (pattern or _po_pattern(prefix)).match(normalized)
     if not match:
         return None
     return int(match.group(1))
 
 
-def collect_po_sequences(path: Path, prefix: str = PO_PREFIX, sheet_name: str | None = None) -> set[int]:
+def _xlsx_local_name(tag: str) -> str:
+    return tag.rpartition("}")[2]
+
+
+def _xlsx_column_index(cell_ref: str) -> int:
+    column_number = 0
+    for char in cell_ref:
+        if "A" <= char <= "Z":
+            column_number = column_number * 26 + (ord(char) - 64)
+        elif "a" <= char <= "z":
+            column_number = column_number * 26 + (ord(char) - 96)
+        else:
+            break
+    return column_number - 1
+
+
+def _xlsx_sheet_parts(archive: zipfile.ZipFile) -> list[tuple[str, str]]:
+    relationship_targets: dict[str, str] = {}
+    with archive.open("xl/_rels/workbook.xml.rels") as rels_stream:
+        for element in ElementTree.parse(rels_stream).getroot():
+            if _xlsx_local_name(element.tag) != "Relationship":
+                continue
+            if not str(element.get("Type", "")).endswith("/worksheet"):
+                continue
+            target = str(element.get("Target", "")).replace("\\", "/")
+            part_name = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+            relationship_targets[str(element.get("Id", ""))] = part_name
+
+    sheet_parts: list[tuple[str, str]] = []
+    with archive.open("xl/workbook.xml") as workbook_stream:
+        for element in ElementTree.parse(workbook_stream).getroot().iter():
+            if _xlsx_local_name(element.tag) != "sheet":
+                continue
+            relationship_id = next(
+                (value for key, value in element.attrib.items() if _xlsx_local_name(key) == "id"),
+                "",
+            )
+            part_name = relationship_targets.get(relationship_id)
+            if part_name:
+                sheet_parts.append((str(element.get("name", "")), part_name))
+    return sheet_parts
+
+
+def _read_xlsx_shared_strings(archive: zipfile.ZipFile) -> list[str]:
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+    shared_strings: list[str] = []
+    with archive.open("xl/sharedStrings.xml") as strings_stream:
+        for _, element in ElementTree.iterparse(strings_stream, events=("end",)):
+            if _xlsx_local_name(element.tag) != "si":
+                continue
+            # Rich text keeps its runs under <r>; phonetic <rPh> hints are skipped.
+            text_parts: list[str] = []
+            for child in element:
+                child_name = _xlsx_local_name(child.tag)
+                if child_name == "t":
+                    text_parts.append(child.text or "")
+                elif child_name == "r":
+                    text_parts.extend(
+                        run_child.text or ""
+                        for run_child in child
+                        if _xlsx_local_name(run_child.tag) == "t"
+                    )
+            shared_strings.append("".join(text_parts))
+            element.clear()
+    return shared_strings
+
+
+def _iter_xlsx_sheet_rows(
+    stream: Any,
+    shared_strings: list[str],
+    column_filter: dict[int, Any] | set[int] | None = None,
+) -> Any:
+    # column_filter is read live, so callers can narrow it while iterating;
+    # an empty filter yields every cell.
+    sheet_data = None
+    next_row_number = 1
+    for event, element in ElementTree.iterparse(stream, events=("start", "end")):
+        local_name = _xlsx_local_name(element.tag)
+        if event == "start":
+            if local_name == "sheetData":
+                sheet_data = element
+            continue
+        if local_name != "row":
+            continue
+
+        row_number = int(element.get("r") or next_row_number)
+        next_row_number = row_number + 1
+        cells: dict[int, Any] = {}
+        next_column_index = 0
+        for cell in element:
+            if _xlsx_local_name(cell.tag) != "c":
+                continue
+            cell_ref = cell.get("r")
+            column_index = _xlsx_column_index(cell_ref) if cell_ref else next_column_index
+            next_column_index = column_index + 1
+            if column_filter and column_index not in column_filter:
+                continue
+            cell_type = cell.get("t", "n")
+            raw_text = None
+            for cell_child in cell:
+                child_name = _xlsx_local_name(cell_child.tag)
+                if child_name == "v":
+                    raw_text = cell_child.text
+                elif child_name == "is":
+                    raw_text = "".join(
+                        node.text or "" for node in cell_child.iter() if _xlsx_local_name(node.tag) == "t"
+                    )
+            if raw_text is None:
+                continue
+            if cell_type == "s":
+                cells[column_index] = shared_strings[int(raw_text)]
+            elif cell_type == "n":
+                try:
+                    cells[column_index] = int(raw_text)
+                except ValueError:
+                    cells[column_index] = float(raw_text)
+            else:
+                cells[column_index] = raw_text
+        yield row_number, cells
+        element.clear()
+        if sheet_data is not None:
+            sheet_data.clear()
+
+
+def _feed_po_scan_row(
+    column_state: dict[int, list[Any]],
+    skipped_rows: int,
+    cells: dict[int, Any],
+    sequences: set[int],
+    prefix: str,
+    po_pattern: re.Pattern[str],
+) -> bool:
+    # column_state maps column index -> [empty_streak, sequence_found].
+    for column_index in list(column_state):
+        state = column_state[column_index]
+        state[0] += skipped_rows
+        if state[1] and state[0] >= PO_SCAN_EMPTY_STREAK_BREAK:
+            del column_state[column_index]
+            continue
+        cell_value = cells.get(column_index)
+        if cell_value is None:
+            state[0] += 1
+        else:
+            sequence = parse_po_number(cell_value, prefix=prefix, pattern=po_pattern)
+            if sequence is not None:
+                sequences.add(sequence)
+                state[1] = True
+                state[0] = 0
+            elif str(cell_value).strip():
+                state[0] = 0
+            else:
+                state[0] += 1
+        if state[1] and state[0] >= PO_SCAN_EMPTY_STREAK_BREAK:
+            del column_state[column_index]
+    return not column_state
+
+
+def _scan_po_sequences_fast(path: Path, prefix: str, sheet_name: str | None = None) -> set[int] | None:
+    # Reads PO numbers straight from the sheet XML; None means fall back to openpyxl.
+    if path.suffix.lower() not in SUPPORTED_WORKBOOK_EXTENSIONS:
+        return None
+    aliases = {"ponumber", "po", "po#"}
+    header_rows_to_scan = 25
+    po_pattern = _po_pattern(prefix)
+    sequences: set[int] = set()
+    try:
+        with zipfile.ZipFile(path) as archive:
+            sheet_parts = _xlsx_sheet_parts(archive)
+            if not sheet_parts:
+                return None
+            if sheet_name and any(name == sheet_name for name, _ in sheet_parts):
+                sheet_parts = [(name, part) for name, part in sheet_parts if name == sheet_name]
+            shared_strings = _read_xlsx_shared_strings(archive)
+
+            for _, part_name in sheet_parts:
+                # Mirror find_po_column_indexes: buffer the header rows to pick
+                # the alias columns (plus column A), then replay and stream.
+                column_state: dict[int, list[Any]] = {}
+                with archive.open(part_name) as sheet_stream:
+                    row_stream = _iter_xlsx_sheet_rows(sheet_stream, shared_strings, column_filter=column_state)
+                    header_rows: list[tuple[int, dict[int, Any]]] = []
+                    pending_row: tuple[int, dict[int, Any]] | None = None
+                    for row_number, cells in row_stream:
+                        if row_number > header_rows_to_scan:
+                            pending_row = (row_number, cells)
+                            break
+                        header_rows.append((row_number, cells))
+
+                    column_state[0] = [0, False]
+                    for _, cells in header_rows:
+                        for column_index, value in cells.items():
+                            if normalize_header_token(str(value)) in aliases:
+                                column_state[column_index] = [0, False]
+
+                    last_row_number = 0
+                    scan_rows = header_rows + ([pending_row] if pending_row is not None else [])
+                    finished = False
+                    for row_number, cells in scan_rows:
+                        if row_number > PO_SCAN_HARD_ROW_LIMIT or _feed_po_scan_row(
+                            column_state, row_number - last_row_number - 1, cells, sequences, prefix, po_pattern
+                        ):
+                            finished = True
+                            break
+                        last_row_number = row_number
+                    if finished or pending_row is None:
+                        continue
+                    for row_number, cells in row_stream:
+                        if row_number > PO_SCAN_HARD_ROW_LIMIT or _feed_po_scan_row(
+                            column_state, row_number - last_row_number - 1, cells, sequences, prefix, po_pattern
+                        ):
+                            break
+                        last_row_number = row_number
+    except Exception:
+        return None
+    return sequences
+
+
+@lru_cache(maxsize=PO_SEQUENCE_CACHE_MAX_KEYS)
+def _max_po_sequence(sequences: frozenset[int]) -> int | None:
+    return max(sequences) if sequences else None
+
+
+def collect_po_sequences(
+    path: Path, prefix: str = PO_PREFIX, sheet_name: str | None = None, mode: str = "all"
+) -> frozenset[int]:
+    sequences = _collect_all_po_sequences(path, prefix=prefix, sheet_name=sheet_name)
+    if mode == "max":
+        # The cached scan set is reused, so its max is only computed once per workbook signature.
+        max_sequence = _max_po_sequence(sequences)
+        return frozenset() if max_sequence is None else frozenset((max_sequence,))
+    return sequences
+
+
+def _collect_all_po_sequences(
+    path: Path, prefix: str = PO_PREFIX, sheet_name: str | None = None
+) -> frozenset[int]:
     if not path.exists():
-        return set()
+        return frozenset()
 
     workbook_signature = get_workbook_signature(path)
     cache_key = (
@@ -1475,13 +2352,25 @@ def collect_po_sequences(path: Path, prefix: str = PO_PREFIX, sheet_name: str |
     )
     cached_sequences = _PO_SEQUENCE_CACHE.get(cache_key)
     if cached_sequences is not None:
-        return set(cached_sequences)
+        _PO_SEQUENCE_CACHE.move_to_end(cache_key)
+        return cached_sequences
+
+    disk_cache_key = "::".join((cache_key[0], cache_key[2], cache_key[3]))
+    disk_sequences = read_po_sequence_disk_cache(disk_cache_key, workbook_signature)
+    if disk_sequences is not None:
+        return remember_po_sequences(cache_key, disk_sequences)
+
+    fast_sequences = _scan_po_sequences_fast(path, prefix, sheet_name=sheet_name)
+    if fast_sequences is not None:
+        write_po_sequence_disk_cache(disk_cache_key, workbook_signature, fast_sequences)
+        return remember_po_sequences(cache_key, fast_sequences)
 
     try:
         workbook = open_workbook_with_retry(path, read_only=True, data_only=True)
     except Exception:
-        return set()
+        return frozenset()
 
+    po_pattern = _po_pattern(prefix)
     sequences: set[int] = set()
     try:
         if sheet_name and sheet_name in workbook.sheetnames:
@@ -1493,45 +2382,99 @@ def collect_po_sequences(path: Path, prefix: str = PO_PREFIX, sheet_name: str |
             worksheet = workbook[current_sheet_name]
             po_column_indexes = find_po_column_indexes(worksheet)
             effective_max_row = worksheet_effective_max_row(worksheet)
-            for column_index in po_column_indexes:
-                excel_col = int(column_index) + 1
-                empty_streak = 0
-                sequence_found_in_column = False
-                rows_scanned = 0
-                for row in worksheet.iter_rows(
+            if not po_column_indexes:
+                continue
+            # Read-only sheets have no iter_cols, so walk the span of PO
+            # columns once and track each column's empty streak side by side.
+            first_col = min(po_column_indexes)
+            column_offsets = [int(column_index) - first_col for column_index in po_column_indexes]
+            empty_streaks = [0] * len(column_offsets)
+            sequence_found = [False] * len(column_offsets)
+            active_slots = list(range(len(column_offsets)))
+            for rows_scanned, row in enumerate(
+                worksheet.iter_rows(
                     min_row=1,
                     max_row=effective_max_row,
-                    min_col=excel_col,
-                    max_col=excel_col,
+                    min_col=first_col + 1,
+                    max_col=max(po_column_indexes) + 1,
                     values_only=True,
-                ):
-                    rows_scanned += 1
-                    cell_value = row[0] if row else None
-                    sequence = parse_po_number(cell_value, prefix=prefix)
-                    if sequence is not None:
-                        sequences.add(sequence)
-                        sequence_found_in_column = True
-                        empty_streak = 0
+                ),
+                start=1,
+            ):
+                finished_slots: list[int] = []
+                for slot in active_slots:
+                    offset = column_offsets[slot]
+                    cell_value = row[offset] if offset < len(row) else None
+                    if cell_value is None:
+                        empty_streaks[slot] += 1
                     else:
-                        text_value = str(cell_value).strip() if cell_value is not None else ""
-                        if text_value:
-                            empty_streak = 0
+                        sequence = parse_po_number(cell_value, prefix=prefix, pattern=po_pattern)
+                        if sequence is not None:
+                            sequences.add(sequence)
+                            sequence_found[slot] = True
+                            empty_streaks[slot] = 0
+                        elif str(cell_value).strip():
+                            empty_streaks[slot] = 0
                         else:
-                            empty_streak += 1
-                    if sequence_found_in_column and empty_streak >= PO_SCAN_EMPTY_STREAK_BREAK:
-                        break
-                    if rows_scanned >= PO_SCAN_HARD_ROW_LIMIT and empty_streak >= PO_SCAN_EMPTY_STREAK_BREAK:
+                            empty_streaks[slot] += 1
+                    if empty_streaks[slot] >= PO_SCAN_EMPTY_STREAK_BREAK and (
+                        sequence_found[slot] or rows_scanned >= PO_SCAN_HARD_ROW_LIMIT
+                    ):
+                        finished_slots.append(slot)
+                if finished_slots:
+                    active_slots = [slot for slot in active_slots if slot not in finished_slots]
+                    if not active_slots:
                         break
     finally:
         workbook.close()
 
-    if len(_PO_SEQUENCE_CACHE) >= PO_SEQUENCE_CACHE_MAX_KEYS:
-        try:
-            _PO_SEQUENCE_CACHE.pop(next(iter(_PO_SEQUENCE_CACHE)))
-        except Exception:
-            _PO_SEQUENCE_CACHE.clear()
-    _PO_SEQUENCE_CACHE[cache_key] = set(sequences)
-    return sequences
+    write_po_sequence_disk_cache(disk_cache_key, workbook_signature, sequences)
+    return remember_po_sequences(cache_key, sequences)
+
+
+def remember_po_sequences(
+    cache_key: tuple[str, str, str, str], sequences: set[int] | frozenset[int]
+) -> frozenset[int]:
+    frozen_sequences = frozenset(sequences)
+    _PO_SEQUENCE_CACHE[cache_key] = frozen_sequences
+    _PO_SEQUENCE_CACHE.move_to_end(cache_key)
+    while len(_PO_SEQUENCE_CACHE) > PO_SEQUENCE_CACHE_MAX_KEYS:
+        _PO_SEQUENCE_CACHE.popitem(last=False)
+    return frozen_sequences
+
+
+def read_po_sequence_disk_cache(disk_cache_key: str, workbook_signature: str) -> set[int] | None:
+    if not workbook_signature:
+        return None
+    entry = load_json_dict(APP_PO_SEQUENCE_CACHE_PATH).get(disk_cache_key)
+    if not isinstance(entry, dict) or entry.get("signature") != workbook_signature:
+        return None
+    try:
+        return {int(value) for value in entry.get("nums", [])}
+    except Exception:
+        return None
+
+
+def write_po_sequence_disk_cache(disk_cache_key: str, workbook_signature: str, sequences: set[int]) -> None:
+    # Keyed per workbook/prefix/sheet so a changed signature replaces the
+    # stale entry instead of piling up next to it.
+    if not workbook_signature:
+        return
+    try:
+        disk_cache = load_json_dict(APP_PO_SEQUENCE_CACHE_PATH)
+        disk_cache.pop(disk_cache_key, None)
+        disk_cache[disk_cache_key] = {"signature": workbook_signature, "nums": sorted(sequences)}
+        while len(disk_cache) > PO_SEQUENCE_CACHE_MAX_KEYS:
+            disk_cache.pop(next(iter(disk_cache)))
+        write_json_dict_atomic(
+            APP_PO_SEQUENCE_CACHE_PATH,
+            disk_cache,
+            keep_backup=False,
+            durable=False,
+            compact=True,
+        )
+    except Exception:
+        pass
 
 
 def po_number_exists(
@@ -1555,7 +2498,7 @@ def get_next_po_number(
     if not path.exists():
         return f"{prefix}{starting_number}"
 
-    sequences = collect_po_sequences(path, prefix=prefix, sheet_name=sheet_name)
+    sequences = collect_po_sequences(path, prefix=prefix, sheet_name=sheet_name, mode="max")
     max_sequence = max(sequences) if sequences else None
     next_sequence = starting_number if max_sequence is None else max(max_sequence + 1, starting_number)
     return f"{prefix}{next_sequence}"
@@ -1578,12 +2521,18 @@ def read_po_reservations(path: Path) -> dict[str, dict[str, Any]]:
 
 def write_po_reservations(path: Path, reservations: dict[str, dict[str, Any]]) -> None:
     reservation_path = get_po_reservation_path(path)
-    write_json_dict_atomic(reservation_path, reservations)
+    write_json_dict_atomic(
+        reservation_path,
+        reservations,
+        durable=False,
+        backup_every_n=JSON_HOT_BACKUP_EVERY,
+        compact=True,
+    )
 
 
 def cleanup_po_reservations(
     reservations: dict[str, dict[str, Any]],
-    existing_sequences: set[int],
+    existing_sequences: set[int] | frozenset[int],
     prefix: str,
     now_ts: float,
     stale_seconds: float,
@@ -1615,6 +2564,50 @@ def cleanup_po_reservations(
     return cleaned, max_reserved_sequence
 
 
+def forget_po_scan_signature(path: Path) -> None:
+    normalized_path = path_key(path)
+    for scan_key in [key for key in _LAST_SCAN_SIGNATURE if key[0] == normalized_path]:
+        _LAST_SCAN_SIGNATURE.pop(scan_key, None)
+
+
+def mark_workbook_saved(path: Path) -> None:
+    forget_po_scan_signature(path)
+    normalized_path = path_key(path)
+    for id_key in [key for key in _ID_MAX_CACHE if key[0] == normalized_path]:
+        _ID_MAX_CACHE.pop(id_key, None)
+    _workbook_signature_cached.cache_clear()
+
+
+def remember_id_maxima(path: Path, sheet_name: str, id_maxima: dict[int, int | None]) -> None:
+    # Called after mark_workbook_saved; the entries hold only while the file
+    # still has the signature this save produced.
+    if not id_maxima:
+        return
+    signature = get_workbook_signature(path)
+    if not signature:
+        return
+    normalized_path = path_key(path)
+    for column_index, max_value in id_maxima.items():
+        _ID_MAX_CACHE[(normalized_path, sheet_name, column_index)] = (signature, max_value)
+
+
+def recall_id_maxima(
+    path: Path,
+    sheet_name: str,
+    id_columns: list[int],
+    signature: str,
+) -> dict[int, int | None]:
+    if not signature:
+        return {}
+    normalized_path = path_key(path)
+    known: dict[int, int | None] = {}
+    for column_index in id_columns:
+        cached = _ID_MAX_CACHE.get((normalized_path, sheet_name, column_index))
+        if cached is not None and cached[0] == signature:
+            known[column_index] = cached[1]
+    return known
+
+
 def reserve_session_po_number(
     path: Path,
     session_id: str,
@@ -1630,7 +2623,15 @@ def reserve_session_po_number(
 
     with workbook_write_lock(path, timeout_seconds=lock_timeout_seconds):
         now_ts = time.time()
-        existing_sequences = collect_po_sequences(path, prefix=prefix, sheet_name=sheet_name)
+        # Back-to-back reservations on an unchanged workbook reuse the last scan.
+        workbook_signature = get_workbook_signature(path)
+        scan_key = (path_key(path), str(prefix).strip().upper(), str(sheet_name or "__all__").strip().casefold())
+        last_scan = _LAST_SCAN_SIGNATURE.get(scan_key)
+        if last_scan is not None and workbook_signature and last_scan[0] == workbook_signature:
+            existing_sequences = last_scan[1]
+        else:
+            existing_sequences = collect_po_sequences(path, prefix=prefix, sheet_name=sheet_name)
+            _LAST_SCAN_SIGNATURE[scan_key] = (workbook_signature, existing_sequences)
         raw_reservations = read_po_reservations(path)
         active_reservations, max_reserved_sequence = cleanup_po_reservations(
             reservations=raw_reservations,
@@ -1642,7 +2643,9 @@ def reserve_session_po_number(
 
         session_entry = active_reservations.get(session_id, {})
         session_sequence = parse_po_number(session_entry.get("po_number"), prefix=prefix)
-        max_existing = max(existing_sequences) if existing_sequences else starting_number - 1
+        max_existing = _max_po_sequence(existing_sequences)
+        if max_existing is None:
+            max_existing = starting_number - 1
         next_sequence = max(max_existing + 1, starting_number)
         if max_reserved_sequence is not None:
             next_sequence = max(next_sequence, max_reserved_sequence + 1)
@@ -1652,13 +2655,24 @@ def reserve_session_po_number(
         else:
             assigned_sequence = session_sequence
 
+        assigned_po_number = f"{prefix}{assigned_sequence}"
+        owner_text = str(owner_label).strip()
+        # Skip the rewrite when cleanup dropped nothing and this session's entry was refreshed recently.
+        if (
+            active_reservations.keys() == raw_reservations.keys()
+            and session_entry.get("po_number") == assigned_po_number
+            and session_entry.get("owner") == owner_text
+            and now_ts - float(session_entry.get("updated_ts", 0.0)) < PO_RESERVATION_REFRESH_SECONDS
+        ):
+            return assigned_po_number
+
         active_reservations[session_id] = {
-            "po_number": f"{prefix}{assigned_sequence}",
-            "owner": str(owner_label).strip(),
+            "po_number": assigned_po_number,
+            "owner": owner_text,
             "updated_ts": now_ts,
         }
         write_po_reservations(path, active_reservations)
-        return f"{prefix}{assigned_sequence}"
+        return assigned_po_number
 
 
 def release_session_po_reservation(path: Path, session_id: str) -> None:
@@ -1690,15 +2704,28 @@ def get_active_po_reservation_count(path: Path, sheet_name: str | None = None) -
 
 def create_workbook(path: Path, sheet_name: str, headers: list[str]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    workbook = Workbook()
-    worksheet = workbook.active
-    worksheet.title = sheet_name
+    if LXML_AVAILABLE:
+        # Write-only mode streams rows straight to disk through lxml.
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(title=sheet_name)
+    else:
+        workbook = Workbook()
+        worksheet = workbook.active
+        worksheet.title = sheet_name
     worksheet.append(headers)
     workbook.save(path)
+    mark_workbook_saved(path)
 
 
 def get_sheet_names(path: Path) -> list[str]:
-    workbook = open_workbook_with_retry(path, read_only=True, data_only=True)
+    return _get_sheet_names_cached(str(path), get_workbook_signature_cached(path))
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _get_sheet_names_cached(path_str: str, workbook_signature: str) -> list[str]:
+    # workbook_signature is only part of the cache key, so a rewritten
+    # workbook (new mtime/size) is reopened.
+    workbook = open_workbook_with_retry(Path(path_str), read_only=True, data_only=True)
     names = workbook.sheetnames
     workbook.close()
     return names
@@ -1810,14 +2837,20 @@ def browse_folder(current_path: Path) -> Path | None:
 
 
 @st.cache_data(show_spinner=False)
-def load_sheet_data(path_str: str, sheet_name: str) -> tuple[list[str], list[dict[str, Any]], list[int]]:
+def load_sheet_data(path_str: str, sheet_name: str) -> tuple[list[str], dict[str, list[Any]], list[int]]:
     workbook = open_workbook_with_retry(Path(path_str), read_only=True, data_only=True)
     if sheet_name not in workbook.sheetnames:
         workbook.close()
-        return ensure_required_headers(DEFAULT_HEADERS.copy()), [], []
+        headers = ensure_required_headers(DEFAULT_HEADERS.copy())
+        return headers, {header: [] for header in headers}, []
 
     worksheet = workbook[sheet_name]
-    raw_headers = [worksheet.cell(row=1, column=column).value for column in range(1, worksheet.max_column + 1)]
+    raw_headers = list(
+        next(
+            worksheet.iter_rows(min_row=1, max_row=1, max_col=worksheet.max_column, values_only=True),
+            (),
+        )
+    )
 
     if not raw_headers or all(value is None or str(value).strip() == "" for value in raw_headers):
         headers = DEFAULT_HEADERS.copy()
@@ -1825,8 +2858,11 @@ def load_sheet_data(path_str: str, sheet_name: str) -> tuple[list[str], list[dic
         headers = sanitize_headers(raw_headers)
     headers = ensure_required_headers(headers)
 
-    rows: list[dict[str, Any]] = []
+    # Columnar storage: one list per header, so DataFrames are built without per-row dicts.
+    columns: dict[str, list[Any]] = {header: [] for header in headers}
+    column_lists = list(columns.values())
     row_numbers: list[int] = []
+    header_count = len(headers)
     for row_index, row in enumerate(
         worksheet.iter_rows(min_row=2, max_row=worksheet.max_row, values_only=True),
         start=2,
@@ -1836,15 +2872,34 @@ def load_sheet_data(path_str: str, sheet_name: str) -> tuple[list[str], list[dic
         if all(value is None or str(value).strip() == "" for value in row):
             continue
 
-        record: dict[str, Any] = {}
-        for index, header in enumerate(headers):
-            value = row[index] if index < len(row) else None
-            record[header] = normalize_cell_value(value)
-        rows.append(record)
+        if len(row) < header_count:
+            row = row + (None,) * (header_count - len(row))
+        # zip stops at the header count, dropping values past the last header.
+        for target, value in zip(column_lists, row):
+            target.append(normalize_cell_value(value))
         row_numbers.append(row_index)
 
     workbook.close()
-    return headers, rows, row_numbers
+    return headers, columns, row_numbers
+
+
+def clear_sheet_data_cache() -> None:
+    # The search blob is derived from load_sheet_data, so both are dropped
+    # together and the generation bump keeps a blob from outliving its frame.
+    global _SHEET_DATA_GENERATION
+    _SHEET_DATA_GENERATION += 1
+    load_sheet_data.clear()
+    get_sheet_search_blob.clear()
+
+
+def _maybe_invalidate_sheets(new_path_text: str) -> None:
+    # Only drop cached sheets when settings point at a different workbook than
+    # the one main() last loaded; re-saving the same path keeps the cache warm.
+    loaded_path_text = str(st.session_state.get(LOADED_WORKBOOK_STATE_KEY, "")).strip()
+    if loaded_path_text and _text_path_key(new_path_text) == _text_path_key(loaded_path_text):
+        return
+    clear_sheet_data_cache()
+    st.session_state[LOADED_WORKBOOK_STATE_KEY] = new_path_text
 
 
 def build_reporting_frame_for_sheets(
@@ -1852,6 +2907,22 @@ def build_reporting_frame_for_sheets(
     target_sheet_names: list[str] | tuple[str, ...],
     location_options: list[str] | None = None,
 ) -> pd.DataFrame:
+    return _build_reporting_frame_cached(
+        path_str,
+        get_workbook_signature_cached(Path(path_str)),
+        tuple(str(name) for name in target_sheet_names),
+        tuple(location_options) if location_options is not None else None,
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _build_reporting_frame_cached(
+    path_str: str,
+    workbook_signature: str,
+    target_sheet_names: tuple[str, ...],
+    location_options: tuple[str, ...] | None,
+) -> pd.DataFrame:
+    # workbook_signature only keys the cache so edits to the workbook rebuild the report.
     report_columns = [
         "PO Number",
         "Date",
@@ -1869,14 +2940,14 @@ def build_reporting_frame_for_sheets(
 
     report_frames: list[pd.DataFrame] = []
     for source_sheet_name in normalized_sheet_names:
-        source_headers, source_rows, _ = load_sheet_data(path_str, source_sheet_name)
-        if not source_rows:
+        source_headers, source_columns, source_row_numbers = load_sheet_data(path_str, source_sheet_name)
+        if not source_row_numbers:
             continue
-        source_frame = pd.DataFrame(source_rows, columns=source_headers)
+        source_frame = pd.DataFrame(source_columns, columns=source_headers)
         sheet_report_frame = build_po_reporting_frame(
             source_frame,
             source_headers,
-            location_options=location_options,
+            location_options=list(location_options) if location_options is not None else None,
         )
         if sheet_report_frame.empty:
             continue
@@ -1908,33 +2979,70 @@ def create_backup(path: Path, backup_dir: Path, keep_latest: int) -> Path | None
     except Exception:
         return None
 
-    backups = sorted(
-        backup_dir.glob(f"{path.stem}-*{path.suffix}"),
-        key=lambda item: item.stat().st_mtime,
-        reverse=True,
-    )
-    for old_backup in backups[keep_latest:]:
+    # Same mtime order as list_backups/get_latest_backup, so "latest" and
+    # "pruned" always agree; name stamps are local time and repeat across DST.
+    backups = sorted(_scan_backup_entries(path, backup_dir), key=lambda item: item[0], reverse=True)
+    for _, old_backup in backups[keep_latest:]:
         try:
-            old_backup.unlink()
+            os.unlink(old_backup)
         except Exception:
             continue
 
     return backup_path
 
 
-def list_backups(path: Path, backup_dir: Path) -> list[Path]:
-    if not backup_dir.exists():
+def _iter_backup_dir_entries(path: Path, backup_dir: Path) -> Iterator[os.DirEntry]:
+    # Equivalent to glob(f"{stem}-*{suffix}").
+    prefix = f"{path.stem}-"
+    suffix = path.suffix
+    if os.name == "nt":
+        prefix, suffix = prefix.casefold(), suffix.casefold()
+    min_length = len(prefix) + len(suffix)
+    with os.scandir(backup_dir) as iterator:
+        for entry in iterator:
+            name = entry.name.casefold() if os.name == "nt" else entry.name
+            if len(name) < min_length or not name.startswith(prefix) or not name.endswith(suffix):
+                continue
+            yield entry
+
+
+def _scan_backup_entries(path: Path, backup_dir: Path) -> list[tuple[float, str]]:
+    # DirEntry.stat() reuses the directory listing instead of a separate stat per match.
+    entries: list[tuple[float, str]] = []
+    try:
+        for entry in _iter_backup_dir_entries(path, backup_dir):
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                continue
+    except OSError:
         return []
-    return sorted(
-        backup_dir.glob(f"{path.stem}-*{path.suffix}"),
-        key=lambda item: item.stat().st_mtime,
-        reverse=True,
-    )
+    return entries
+
+
+def list_backups(path: Path, backup_dir: Path) -> list[Path]:
+    entries = sorted(_scan_backup_entries(path, backup_dir), key=lambda item: item[0], reverse=True)
+    return [Path(entry_path) for _, entry_path in entries]
+
+
+def list_backups_cached(path: Path, backup_dir: Path) -> list[Path]:
+    try:
+        dir_mtime_ns = backup_dir.stat().st_mtime_ns
+    except OSError:
+        dir_mtime_ns = None
+    return _list_backups_cached(str(path), str(backup_dir), dir_mtime_ns)
+
+
+@st.cache_data(show_spinner=False, max_entries=8, ttl=5)
+def _list_backups_cached(path_str: str, backup_dir_str: str, dir_mtime_ns: int | None) -> list[Path]:
+    # Adding or removing a backup bumps the folder mtime, so the key changes on
+    # every create/prune; the short ttl covers shares that report mtimes lazily.
+    return list_backups(Path(path_str), Path(backup_dir_str))
 
 
 def get_latest_backup(path: Path, backup_dir: Path) -> Path | None:
-    backups = list_backups(path, backup_dir)
-    return backups[0] if backups else None
+    latest = heapq.nlargest(1, _scan_backup_entries(path, backup_dir), key=lambda item: item[0])
+    return Path(latest[0][1]) if latest else None
 
 
 def restore_backup(path: Path, backup_dir: Path, backup_file: Path) -> Path | None:
@@ -1968,6 +3076,7 @@ def restore_backup(path: Path, backup_dir: Path, backup_file: Path) -> Path | No
     try:
         copy_file_with_retry(backup_file, temp_path, retries=3, delay_seconds=0.2)
         os.replace(temp_path, path)
+        mark_workbook_saved(path)
     finally:
         try:
             temp_path.unlink(missing_ok=True)
@@ -1983,32 +3092,47 @@ def restore_latest_backup(path: Path, backup_dir: Path) -> Path | None:
     return restore_backup(path, backup_dir, latest_backup)
 
 
-def copy_previous_row_style(
+def previous_row_styles(
     worksheet: Any,
     target_row: int,
     start_col: int,
     end_col: int,
-) -> bool:
+) -> dict[int, Any]:
     source_row = target_row - 1
     if source_row < 2:
-        return False
+        return {}
 
-    copied_any = False
+    # Reads the cell map directly so blank source cells are not materialized;
+    # a row with no styled cells yields {} and the caller skips the copy.
+    existing_cells = worksheet._cells
+    source_styles: dict[int, Any] = {}
     for column in range(start_col, end_col + 1):
-        source_cell = worksheet.cell(row=source_row, column=column)
-        target_cell = worksheet.cell(row=target_row, column=column)
-        if source_cell.has_style:
-            target_cell._style = copy(source_cell._style)
-            copied_any = True
-    return copied_any
+        source_cell = existing_cells.get((source_row, column))
+        if source_cell is not None and source_cell.has_style:
+            source_styles[column] = source_cell._style
+    return source_styles
 
 
-def apply_default_box_border(worksheet: Any, row_index: int, start_col: int, end_col: int) -> None:
-    side = Side(border_style="thin", color="000000")
-    boxed_border = Border(left=side, right=side, top=side, bottom=side)
+def apply_row_styles(worksheet: Any, row_index: int, source_styles: dict[int, Any]) -> bool:
+    # Each cell needs its own StyleArray: later border assignments mutate it in place.
+    for column, style in source_styles.items():
+        worksheet._get_cell(row_index, column)._style = copy(style)
+    return bool(source_styles)
+
 
+def apply_default_box_border(worksheet: Any, row_index: int, start_col: int, end_col: int) -> None:
     for column in range(start_col, end_col + 1):
-        worksheet.cell(row=row_index, column=column).border = boxed_border
+        worksheet.cell(row=row_index, column=column).border = _DEFAULT_BOX_BORDER
+
+
+def write_row_values(worksheet: Any, row_index: int, values_by_column: dict[int, Any]) -> None:
+    # Mirrors worksheet.cell(value=...): blank strings become None, and None
+    # leaves the existing cell untouched.
+    for column_index, value in values_by_column.items():
+        if isinstance(value, str) and not value:
+            value = None
+        if value is not None:
+            worksheet._get_cell(row_index, column_index).value = value
 
 
 def apply_group_outline_border(
@@ -2018,23 +3142,29 @@ def apply_group_outline_border(
     start_col: int,
     end_col: int,
 ) -> None:
-    thin = Side(border_style="thin", color="000000")
-    none = Side(border_style=None, color=None)
-
     for row_index in range(start_row, end_row + 1):
+        is_top = row_index == start_row
+        is_bottom = row_index == end_row
         for column_index in range(start_col, end_col + 1):
-            left = thin if column_index == start_col else none
-            right = thin if column_index == end_col else none
-            top = thin if row_index == start_row else none
-            bottom = thin if row_index == end_row else none
-            worksheet.cell(row=row_index, column=column_index).border = Border(
-                left=left,
-                right=right,
-                top=top,
-                bottom=bottom,
+            worksheet.cell(row=row_index, column=column_index).border = _outline_border(
+                column_index == start_col,
+                column_index == end_col,
+                is_top,
+                is_bottom,
             )
 
 
+@lru_cache(maxsize=16)
+def _outline_border(left: bool, right: bool, top: bool, bottom: bool) -> Border:
+    # A rectangle only needs the interior, edge and corner variants, so they are shared.
+    return Border(
+        left=_THIN_SIDE if left else _NO_SIDE,
+        right=_THIN_SIDE if right else _NO_SIDE,
+        top=_THIN_SIDE if top else _NO_SIDE,
+        bottom=_THIN_SIDE if bottom else _NO_SIDE,
+    )
+
+
 def create_line_item_row(
     item: str = "",
     unit_price: float = 0.0,
@@ -2057,10 +3187,17 @@ def ensure_line_item_rows(raw_items: Any) -> list[dict[str, Any]]:
         return default_line_items()
 
     normalized_rows: list[dict[str, Any]] = []
-    for raw_item in raw_items:
+    # Missing IDs share one random prefix per call plus the row position,
+    # instead of one uuid4() (and urandom read) per row.
+    id_prefix = ""
+    for index, raw_item in enumerate(raw_items):
         if not isinstance(raw_item, dict):
             continue
-        row_id = str(raw_item.get("Row ID", "")).strip() or uuid4().hex
+        row_id = str(raw_item.get("Row ID", "")).strip()
+        if not row_id:
+            if not id_prefix:
+                id_prefix = secrets.token_hex(12)
+            row_id = f"{id_prefix}{index:08x}"
         normalized_rows.append(
             {
                 "Row ID": row_id,
@@ -2078,7 +3215,7 @@ def parse_float(value: Any, default: float = 0.0) -> float:
         return default
 
     if isinstance(value, str):
-        cleaned = value.strip().replace("$", "").replace(",", "")
+        cleaned = value.translate(_MONEY_STRIP).strip()
         if not cleaned:
             return default
         try:
@@ -2098,6 +3235,18 @@ def parse_float(value: Any, default: float = 0.0) -> float:
         return default
 
 
+def coerce_money_series(series: pd.Series, default: float = 0.0) -> pd.Series:
+    # Vectorised parse_float: plain numbers convert in one pass, and only the
+    # leftovers get the _MONEY_STRIP characters removed before a second to_numeric.
+    numeric = pd.to_numeric(series, errors="coerce")
+    unresolved = numeric.isna() & series.notna()
+    if unresolved.any():
+        cleaned = series[unresolved].astype(str).str.translate(_MONEY_STRIP).str.strip()
+        numeric = numeric.astype(float)
+        numeric.loc[unresolved] = pd.to_numeric(cleaned, errors="coerce")
+    return numeric.fillna(default).astype(float)
+
+
 def parse_int(value: Any, default: int = 1) -> int:
     try:
         parsed = int(round(parse_float(value, default=float(default))))
@@ -2137,32 +3286,66 @@ def normalize_line_items(
     return normalized, errors
 
 
-def get_next_id_value(worksheet: Any, column_index: int) -> str:
-    numeric_values: list[int] = []
-    for row_index in range(2, worksheet.max_row + 1):
-        value = worksheet.cell(row=row_index, column=column_index).value
-        if isinstance(value, bool):
-            continue
-        if isinstance(value, (int, float)):
-            numeric_values.append(int(value))
-            continue
-        if isinstance(value, str) and value.strip().isdigit():
-            numeric_values.append(int(value.strip()))
+def _numeric_id(value: Any) -> int | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value.strip())
+    return None
 
-    if not numeric_values:
-        return "1"
-    return str(max(numeric_values) + 1)
 
+def _max_id(current: int | None, value: Any) -> int | None:
+    numeric_value = _numeric_id(value)
+    if numeric_value is None or (current is not None and current >= numeric_value):
+        return current
+    return numeric_value
 
-def row_has_values(worksheet: Any, row_index: int, column_indexes: list[int]) -> bool:
-    for column_index in column_indexes:
-        value = worksheet.cell(row=row_index, column=column_index).value
-        if value is None:
-            continue
-        if isinstance(value, str) and not value.strip():
-            continue
-        return True
-    return False
+
+def _cell_has_content(value: Any) -> bool:
+    return value is not None and not (isinstance(value, str) and not value.strip())
+
+
+def _prepare_append_context(
+    worksheet: Any,
+    column_indexes: list[int],
+    id_columns: list[int],
+    start_col: int,
+    end_col: int,
+    known_id_maxima: dict[int, int | None] | None = None,
+) -> tuple[int, dict[int, Any], dict[int, int | None]]:
+    # Returns (next write row, styles of the row above it, current max ID per
+    # ID column). When IDs are needed, one forward sweep finds both the last
+    # filled row and the ID maxima; otherwise the cheaper backward scan runs.
+    id_maxima: dict[int, int | None] = dict(known_id_maxima or {})
+    id_columns = [column_index for column_index in id_columns if column_index not in id_maxima]
+    id_maxima.update({column_index: None for column_index in id_columns})
+    if id_columns:
+        min_col = min(column_indexes + id_columns)
+        max_col = max(column_indexes + id_columns)
+        offsets = [column_index - min_col for column_index in column_indexes]
+        id_offsets = [(column_index, column_index - min_col) for column_index in id_columns]
+        last_filled_row = 1
+        for row_index, row_values in enumerate(
+            worksheet.iter_rows(
+                min_row=2,
+                max_row=worksheet.max_row,
+                min_col=min_col,
+                max_col=max_col,
+                values_only=True,
+            ),
+            start=2,
+        ):
+            if any(_cell_has_content(row_values[offset]) for offset in offsets):
+                last_filled_row = row_index
+            for column_index, offset in id_offsets:
+                id_maxima[column_index] = _max_id(id_maxima[column_index], row_values[offset])
+        next_row = last_filled_row + 1
+    else:
+        next_row = find_next_write_row(worksheet, column_indexes=column_indexes, header_row=1)
+
+    return next_row, previous_row_styles(worksheet, next_row, start_col, end_col), id_maxima
 
 
 def find_next_write_row(
@@ -2171,15 +3354,56 @@ def find_next_write_row(
     header_row: int = 1,
 ) -> int:
     last_candidate_row = max(int(worksheet.max_row or header_row), header_row)
-    while last_candidate_row > header_row and not row_has_values(
-        worksheet,
-        row_index=last_candidate_row,
-        column_indexes=column_indexes,
-    ):
-        last_candidate_row -= 1
+    min_col = min(column_indexes)
+    offsets = [column_index - min_col for column_index in column_indexes]
+    # Walk up from max_row in blocks so styled-but-empty trailing rows are read
+    # with one iter_rows call per block instead of a cell() call per column.
+    while last_candidate_row > header_row:
+        block_start = max(header_row + 1, last_candidate_row - WRITE_ROW_SCAN_BLOCK + 1)
+        block_rows = list(
+            worksheet.iter_rows(
+                min_row=block_start,
+                max_row=last_candidate_row,
+                min_col=min_col,
+                max_col=max(column_indexes),
+                values_only=True,
+            )
+        )
+        for row_values in reversed(block_rows):
+            if any(_cell_has_content(row_values[offset]) for offset in offsets):
+                return last_candidate_row + 1
+            last_candidate_row -= 1
     return last_candidate_row + 1
 
 
+def save_workbook_atomic(workbook: Any, path: Path) -> None:
+    # Save beside the target, fsync, then rename over it so a crash mid-save
+    # never leaves a truncated workbook behind.
+    part_path = path.with_name(f"{path.name}.part")
+    try:
+        workbook.save(part_path)
+        part_fd = os.open(str(part_path), os.O_RDWR | getattr(os, "O_BINARY", 0))
+        try:
+            os.fsync(part_fd)
+        finally:
+            os.close(part_fd)
+        os.replace(part_path, path)
+    finally:
+        try:
+            part_path.unlink(missing_ok=True)
+        except Exception:
+            pass
+    if os.name != "nt":
+        try:
+            dir_fd = os.open(str(path.parent), os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+
+
 def get_workbook_lock_path(path: Path) -> Path:
     return path.with_name(f"{path.name}.lock")
 
@@ -2195,8 +3419,11 @@ def workbook_write_lock(
     stale_after = max(float(stale_seconds), 1.0)
     deadline = time.monotonic() + timeout
     lock_fd: int | None = None
+    poll_delay = WORKBOOK_LOCK_POLL_MIN_SECONDS
 
     while lock_fd is None:
+        with _WORKBOOK_LOCK_RELEASED:
+            seen_generation = _WORKBOOK_LOCK_GENERATION
         try:
             lock_fd = os.open(str(lock_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
             lock_note = f"pid={os.getpid()} at {datetime.now().isoformat(timespec='seconds')}\n"
@@ -2216,12 +3443,20 @@ def workbook_write_lock(
                 except Exception:
                     pass
 
-            if time.monotonic() >= deadline:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
                 raise TimeoutError(
                     "Workbook is busy because another save is in progress. "
                     "Please wait a moment and try Save PO again."
                 )
-            time.sleep(0.2)
+            # Saves from this process wake waiters as soon as they release; a
+            # holder in another process is still picked up by the backoff poll.
+            with _WORKBOOK_LOCK_RELEASED:
+                _WORKBOOK_LOCK_RELEASED.wait_for(
+                    lambda: _WORKBOOK_LOCK_GENERATION != seen_generation,
+                    timeout=min(poll_delay, remaining),
+                )
+            poll_delay = min(poll_delay * 2, WORKBOOK_LOCK_POLL_MAX_SECONDS)
 
     try:
         yield
@@ -2235,6 +3470,14 @@ def workbook_write_lock(
             lock_path.unlink(missing_ok=True)
         except Exception:
             pass
+        _notify_workbook_lock_released()
+
+
+def _notify_workbook_lock_released() -> None:
+    global _WORKBOOK_LOCK_GENERATION
+    with _WORKBOOK_LOCK_RELEASED:
+        _WORKBOOK_LOCK_GENERATION += 1
+        _WORKBOOK_LOCK_RELEASED.notify_all()
 
 
 def append_record(
@@ -2249,6 +3492,7 @@ def append_record(
 ) -> Path | None:
     backup_path = create_backup(path, backup_dir, keep_backups)
 
+    loaded_signature = get_workbook_signature(path)
     workbook = open_workbook_with_retry(path, read_only=False, data_only=False)
     if sheet_name not in workbook.sheetnames:
         worksheet = workbook.create_sheet(title=sheet_name)
@@ -2280,36 +3524,44 @@ def append_record(
     row_columns = [header_to_column[header] for header in headers if header in header_to_column]
     start_col = min(row_columns) if row_columns else 1
     end_col = max(row_columns) if row_columns else worksheet.max_column
-    first_written_row = find_next_write_row(
+    # Only a single-row save fills blank ID cells, so only then is the ID column scanned.
+    id_columns: list[int] = []
+    if len(values_to_write) == 1:
+        for header in headers:
+            raw_value = values_to_write[0].get(header, "")
+            if header_is_id(header) and (raw_value is None or (isinstance(raw_value, str) and not raw_value.strip())):
+                id_columns.append(header_to_column[header])
+    first_written_row, source_styles, id_maxima = _prepare_append_context(
         worksheet,
         column_indexes=row_columns if row_columns else [1],
-        header_row=1,
+        id_columns=id_columns,
+        start_col=start_col,
+        end_col=end_col,
+        known_id_maxima=recall_id_maxima(path, sheet_name, id_columns, loaded_signature),
     )
     last_written_row = first_written_row - 1
+    timestamp_text = datetime.now().strftime("%Y-%m-%d %H:%M")
 
     for offset, row_values in enumerate(values_to_write):
         row_index = first_written_row + offset
         last_written_row = row_index
-        style_copied = copy_previous_row_style(worksheet, row_index, start_col, end_col)
+        style_copied = apply_row_styles(worksheet, row_index, source_styles)
+        values_by_column: dict[int, Any] = {}
         for header in headers:
             raw_value = row_values.get(header, "")
             user_value = raw_value.strip() if isinstance(raw_value, str) else raw_value
 
             if (user_value is None or user_value == "") and header_is_timestamp(header):
-                user_value = datetime.now().strftime("%Y-%m-%d %H:%M")
+                user_value = timestamp_text
 
             column_index = header_to_column[header]
-            if (
-                len(values_to_write) == 1
-                and (user_value is None or user_value == "")
-                and header_is_id(header)
-            ):
-                user_value = get_next_id_value(worksheet, column_index)
+            if (user_value is None or user_value == "") and column_index in id_maxima:
+                current_max = id_maxima[column_index]
+                user_value = "1" if current_max is None else str(current_max + 1)
+                id_maxima[column_index] = _max_id(current_max, user_value)
 
-            if isinstance(user_value, str):
-                worksheet.cell(row=row_index, column=column_index, value=user_value or None)
-            else:
-                worksheet.cell(row=row_index, column=column_index, value=user_value)
+            values_by_column[column_index] = user_value
+        write_row_values(worksheet, row_index, values_by_column)
 
         if len(values_to_write) == 1 and not style_copied:
             apply_default_box_border(worksheet, row_index, start_col, end_col)
@@ -2337,8 +3589,10 @@ def append_record(
                 reason_cell._style = copy(source_cell._style)
         reason_cell.value = reason_text
 
-    workbook.save(path)
+    save_workbook_atomic(workbook, path)
     workbook.close()
+    mark_workbook_saved(path)
+    remember_id_maxima(path, sheet_name, id_maxima)
     return backup_path
 
 
@@ -2387,6 +3641,7 @@ def update_sheet_rows(
 
     backup_path = create_backup(path, backup_dir, keep_backups)
     workbook = open_workbook_with_retry(path, read_only=False, data_only=False)
+    id_maxima: dict[int, int | None] = {}
     try:
         if sheet_name not in workbook.sheetnames:
             raise ValueError(f"Worksheet `{sheet_name}` was not found in `{path}`.")
@@ -2415,64 +3670,113 @@ def update_sheet_rows(
         for row_number, row_values in normalized_updates:
             if row_number in rows_deleted:
                 continue
-            for header in headers:
-                if header not in header_to_column:
-                    continue
-                column_index = header_to_column[header]
-                normalized_value = normalize_editor_cell_value(row_values.get(header, ""))
-                if isinstance(normalized_value, str):
-                    worksheet.cell(row=row_number, column=column_index, value=normalized_value or None)
-                else:
-                    worksheet.cell(row=row_number, column=column_index, value=normalized_value)
+            write_row_values(
+                worksheet,
+                row_number,
+                {
+                    header_to_column[header]: normalize_editor_cell_value(row_values.get(header, ""))
+                    for header in headers
+                    if header in header_to_column
+                },
+            )
 
-        for row_number in normalized_deletes:
-            if row_number <= worksheet.max_row:
-                worksheet.delete_rows(row_number, 1)
+        # Contiguous deletes collapse into one delete_rows call per run, bottom run first,
+        # so each run shifts the rows below it once.
+        max_row = worksheet.max_row
+        for run_start, run_length in descending_row_runs(
+            [row_number for row_number in normalized_deletes if row_number <= max_row]
+        ):
+            worksheet.delete_rows(run_start, run_length)
 
         if normalized_new_rows:
             row_columns = [header_to_column[header] for header in headers if header in header_to_column]
             start_col = min(row_columns) if row_columns else 1
             end_col = max(row_columns) if row_columns else worksheet.max_column
-            first_insert_row = find_next_write_row(
+            id_columns = [
+                header_to_column[header]
+                for header in headers
+                if header in header_to_column
+                and header_is_id(header)
+                and any(row_values.get(header, "") in (None, "") for row_values in normalized_new_rows)
+            ]
+            first_insert_row, source_styles, id_maxima = _prepare_append_context(
                 worksheet,
                 column_indexes=row_columns if row_columns else [1],
-                header_row=1,
+                id_columns=id_columns,
+                start_col=start_col,
+                end_col=end_col,
             )
+            timestamp_text = datetime.now().strftime("%Y-%m-%d %H:%M")
             for offset, row_values in enumerate(normalized_new_rows):
                 row_index = first_insert_row + offset
-                style_copied = copy_previous_row_style(worksheet, row_index, start_col, end_col)
+                style_copied = apply_row_styles(worksheet, row_index, source_styles)
+                values_by_column: dict[int, Any] = {}
                 for header in headers:
                     if header not in header_to_column:
                         continue
                     column_index = header_to_column[header]
                     cell_value = row_values.get(header, "")
                     if (cell_value is None or cell_value == "") and header_is_timestamp(header):
-                        cell_value = datetime.now().strftime("%Y-%m-%d %H:%M")
-                    if (cell_value is None or cell_value == "") and header_is_id(header):
-                        cell_value = get_next_id_value(worksheet, column_index)
-                    if isinstance(cell_value, str):
-                        worksheet.cell(row=row_index, column=column_index, value=cell_value or None)
-                    else:
-                        worksheet.cell(row=row_index, column=column_index, value=cell_value)
+                        cell_value = timestamp_text
+                    if (cell_value is None or cell_value == "") and column_index in id_maxima:
+                        current_max = id_maxima[column_index]
+                        cell_value = "1" if current_max is None else str(current_max + 1)
+                    values_by_column[column_index] = cell_value
+                    if column_index in id_maxima:
+                        # Later new rows must see this row's ID, as a rescan would.
+                        id_maxima[column_index] = _max_id(id_maxima[column_index], cell_value)
+                write_row_values(worksheet, row_index, values_by_column)
                 if not style_copied:
                     apply_default_box_border(worksheet, row_index, start_col, end_col)
 
-        workbook.save(path)
+        save_workbook_atomic(workbook, path)
     finally:
         workbook.close()
+        mark_workbook_saved(path)
 
+    # Row edits and deletes can lower an ID maximum, so this path always
+    # rescans and only records what it found for the next append.
+    remember_id_maxima(path, sheet_name, id_maxima)
     return backup_path
 
 
+def descending_row_runs(row_numbers: list[int]) -> list[tuple[int, int]]:
+    runs: list[tuple[int, int]] = []
+    for row_number in sorted(set(row_numbers), reverse=True):
+        if runs and runs[-1][0] == row_number + 1:
+            runs[-1] = (row_number, runs[-1][1] + 1)
+        else:
+            runs.append((row_number, 1))
+    return runs
+
+
 def filter_records(frame: pd.DataFrame, query: str) -> pd.DataFrame:
     filtered, _, _ = filter_records_lazy(frame, query, max_scan_rows=len(frame))
     return filtered
 
 
+def build_search_blob(frame: pd.DataFrame) -> pd.Series:
+    # One lowercased string per row, columns joined by a unit separator, so a
+    # search is a single str.contains instead of one per column.
+    if not len(frame.columns):
+        return pd.Series("", index=frame.index, dtype=object)
+    text_columns = [frame[column_name].astype(str) for column_name in frame.columns]
+    return text_columns[0].str.cat(text_columns[1:], sep="\x1f").str.lower()
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def get_sheet_search_blob(path_str: str, sheet_name: str, data_generation: int) -> pd.Series:
+    # Keyed on the sheet-data generation rather than the file signature: the blob
+    # must match the cached frame, which only changes when clear_sheet_data_cache runs.
+    headers, sheet_columns, _ = load_sheet_data(path_str, sheet_name)
+    return build_search_blob(pd.DataFrame(sheet_columns, columns=headers))
+
+
 def filter_records_lazy(
     frame: pd.DataFrame,
     query: str,
     max_scan_rows: int = DEFAULT_EDITOR_SEARCH_SCAN_LIMIT,
+    search_blob: pd.Series | None = None,
 ) -> tuple[pd.DataFrame, bool, int]:
     if not query.strip():
         return frame, False, len(frame)
@@ -2482,20 +3786,20 @@ def filter_records_lazy(
     truncated = len(frame) > bounded_scan_rows
     candidate_frame = frame.tail(bounded_scan_rows) if truncated else frame
 
-    mask = pd.Series(False, index=candidate_frame.index)
-    for column_name in candidate_frame.columns:
-        column_values = candidate_frame[column_name].astype(str)
-        mask = mask | column_values.str.lower().str.contains(lowered, na=False)
+    if search_blob is not None and len(search_blob) == len(frame):
+        candidate_blob = search_blob.iloc[-bounded_scan_rows:] if truncated else search_blob
+    else:
+        candidate_blob = build_search_blob(candidate_frame)
+    mask = candidate_blob.str.contains(lowered, regex=False, na=False).to_numpy(dtype=bool)
 
     return candidate_frame[mask], truncated, len(candidate_frame)
 
 
-def first_non_empty(series: pd.Series) -> str:
-    for value in series:
-        text = str(value).strip()
-        if text:
-            return text
-    return ""
+@lru_cache(maxsize=8)
+def _parse_report_dates(date_texts: tuple[str, ...]) -> pd.DatetimeIndex:
+    # Parsed as one batch so pandas infers a single format exactly as it would
+    # for the full column; callers pass the distinct values in first-seen order.
+    return pd.DatetimeIndex(pd.to_datetime(pd.Series(date_texts, dtype=object), errors="coerce"))
 
 
 def build_po_reporting_frame(
@@ -2534,71 +3838,87 @@ def build_po_reporting_frame(
         )
 
     if grand_total_header and grand_total_header in working.columns:
-        working["__grand_total"] = working[grand_total_header].apply(lambda value: parse_float(value, 0.0))
+        working["__grand_total"] = coerce_money_series(working[grand_total_header], 0.0)
     else:
         working["__grand_total"] = 0.0
     if sub_total_header and sub_total_header in working.columns:
-        working["__sub_total"] = working[sub_total_header].apply(lambda value: parse_float(value, 0.0))
+        working["__sub_total"] = coerce_money_series(working[sub_total_header], 0.0)
     else:
         working["__sub_total"] = 0.0
     if price_header and price_header in working.columns:
-        working["__fallback_price"] = working[price_header].apply(lambda value: parse_float(value, 0.0))
+        working["__fallback_price"] = coerce_money_series(working[price_header], 0.0)
     else:
         working["__fallback_price"] = 0.0
     if quantity_header and quantity_header in working.columns:
-        working["__fallback_qty"] = working[quantity_header].apply(lambda value: parse_float(value, 1.0))
+        fallback_qty = coerce_money_series(working[quantity_header], 1.0)
+        working["__fallback_qty"] = fallback_qty.where(fallback_qty > 0, 1.0)
     else:
         working["__fallback_qty"] = 1.0
-    working["__fallback_qty"] = working["__fallback_qty"].apply(lambda value: value if value > 0 else 1.0)
     working["__fallback_line_total"] = (working["__fallback_price"] * working["__fallback_qty"]).round(2)
 
-    grouped_rows: list[dict[str, Any]] = []
-    for po_number, group in working.groupby("__po", dropna=True):
-        max_grand = float(group["__grand_total"].max())
-        sum_sub_total = float(group["__sub_total"].sum())
-        fallback_group_total = float(group["__fallback_line_total"].sum())
-        if max_grand > 0:
-            total_value = round(max_grand, 2)
-        elif sum_sub_total > 0:
-            total_value = round(sum_sub_total, 2)
-        elif fallback_group_total > 0:
-            total_value = round(fallback_group_total, 2)
-        else:
-            total_value = 0.0
-
-        department_loc_text = ""
-        if dept_loc_header and dept_loc_header in group.columns:
-            department_loc_text = first_non_empty(group[dept_loc_header])
-        if not department_loc_text:
-            department_value = first_non_empty(group[department_header]) if department_header in group.columns else ""
-            location_value = first_non_empty(group[location_header]) if location_header in group.columns else ""
-            if location_value and department_value:
-                department_loc_text = f"{location_value}/{department_value}"
-            else:
-                department_loc_text = location_value or department_value
+    money_totals = working.groupby("__po", dropna=True).agg(
+        max_grand=("__grand_total", "max"),
+        sum_sub_total=("__sub_total", "sum"),
+        fallback_group_total=("__fallback_line_total", "sum"),
+    )
 
-        location_value = extract_location_code(
-            raw_location_value=(first_non_empty(group[location_header]) if location_header in group.columns else ""),
-            raw_department_loc_value=department_loc_text,
-            location_options=location_options,
-        )
+    # Blank cells become NaN so groupby-first returns each PO's first non-empty text.
+    text_headers = {
+        "dept_loc": dept_loc_header,
+        "department": department_header,
+        "location": location_header,
+        "date": date_header,
+        "vendor": vendor_header,
+    }
+    masked_text = pd.DataFrame({"__po": working["__po"]})
+    for role, header in text_headers.items():
+        if header and header in working.columns:
+            stripped = working[header].astype(str).str.strip()
+            masked_text[role] = stripped.where(stripped != "")
+    first_texts = (
+        masked_text.groupby("__po", dropna=True).first().reindex(columns=list(text_headers)).fillna("")
+    )
+    po_summary = money_totals.join(first_texts)
+    if po_summary.empty:
+        return pd.DataFrame()
+
+    # Grand Total wins, then Sub Total, then price x quantity; Python round keeps
+    # the exact rounding the per-PO loop used.
+    fallback_total = po_summary["fallback_group_total"].where(po_summary["fallback_group_total"] > 0, 0.0)
+    sub_or_fallback = po_summary["sum_sub_total"].where(po_summary["sum_sub_total"] > 0, fallback_total)
+    chosen_total = po_summary["max_grand"].where(po_summary["max_grand"] > 0, sub_or_fallback)
+    totals = [round(float(value), 2) for value in chosen_total]
+
+    location_text = po_summary["location"]
+    department_text = po_summary["department"]
+    combined_text = (location_text + "/" + department_text).where(
+        (location_text != "") & (department_text != ""),
+        location_text.where(location_text != "", department_text),
+    )
+    department_loc_text = po_summary["dept_loc"].where(po_summary["dept_loc"] != "", combined_text)
 
-        grouped_rows.append(
-            {
-                "PO Number": str(po_number).strip(),
-                "Date": first_non_empty(group[date_header]) if date_header in group.columns else "",
-                "Vendor/Store": first_non_empty(group[vendor_header]) if vendor_header in group.columns else "",
-                "Department/Loc": department_loc_text,
-                "Location": location_value,
-                "Total": total_value,
-            }
+    location_values = [
+        extract_location_code(
+            raw_location_value=raw_location,
+            raw_department_loc_value=raw_department_loc,
+            location_options=location_options,
         )
+        for raw_location, raw_department_loc in zip(location_text, department_loc_text)
+    ]
 
-    reporting_frame = pd.DataFrame(grouped_rows)
-    if reporting_frame.empty:
-        return reporting_frame
+    reporting_frame = pd.DataFrame(
+        {
+            "PO Number": po_summary.index.astype(str).str.strip(),
+            "Date": po_summary["date"].to_numpy(),
+            "Vendor/Store": po_summary["vendor"].to_numpy(),
+            "Department/Loc": department_loc_text.to_numpy(),
+            "Location": location_values,
+            "Total": totals,
+        }
+    )
 
-    reporting_frame["Date Parsed"] = pd.to_datetime(reporting_frame["Date"], errors="coerce")
+    date_codes, date_texts = pd.factorize(reporting_frame["Date"])
+    reporting_frame["Date Parsed"] = _parse_report_dates(tuple(date_texts)).take(date_codes)
     reporting_frame["Month"] = reporting_frame["Date Parsed"].dt.to_period("M").astype(str)
     reporting_frame.loc[reporting_frame["Month"] == "NaT", "Month"] = "Unknown"
     return reporting_frame.sort_values(by=["Date Parsed", "PO Number"], ascending=[False, False]).reset_index(
@@ -2685,898 +4005,10 @@ def main() -> None:
     if st.session_state[THEME_STATE_KEY] not in THEME_PRESETS:
         st.session_state[THEME_STATE_KEY] = DEFAULT_THEME_NAME
     theme_palette = resolve_theme_palette(st.session_state[THEME_STATE_KEY])
-    theme_outline = theme_palette.get("outline", theme_palette["border"])
-    accent_rgb = hex_to_rgb_triplet(theme_palette["accent"], "11, 87, 208")
-    accent_strong_rgb = hex_to_rgb_triplet(theme_palette["accent_strong"], "8, 66, 160")
-    theme_color_scheme = str(theme_palette.get("color_scheme", "light")).strip().lower()
-    if theme_color_scheme not in {"light", "dark"}:
-        theme_color_scheme = "light"
-    theme_placeholder = str(theme_palette.get("placeholder", theme_palette["muted"])).strip()
-    theme_disabled_text = str(theme_palette.get("disabled_text", theme_palette["muted"])).strip()
-
-    st.markdown(
-        """
-        <style>
-            :root {
-                color-scheme: light;
-                --potrol-bg-start: #f3f6ff;
-                --potrol-bg-end: #f7f9ff;
-                --potrol-surface: #ffffff;
-                --potrol-surface-soft: #eef2ff;
-                --potrol-border: #d2d9e8;
-                --potrol-outline: #c5ccda;
-                --potrol-text: #1b1b1f;
-                --potrol-muted: #47464f;
-                --potrol-accent: #0b57d0;
-                --potrol-accent-strong: #0842a0;
-                --potrol-accent-rgb: 11, 87, 208;
-                --potrol-accent-strong-rgb: 8, 66, 160;
-                --potrol-disabled-bg: #f3f5f8;
-                --potrol-placeholder: #6e7280;
-                --potrol-disabled-text: #394150;
-                --potrol-radius: 16px;
-                --potrol-radius-lg: 24px;
-                --potrol-field-height: 2.9rem;
-                --potrol-field-border-width: 1px;
-                --potrol-control-radius: var(--potrol-radius);
-                --potrol-control-border-width: var(--potrol-field-border-width);
-                --potrol-control-border-color: var(--potrol-outline);
-                --primary-color: var(--potrol-accent);
-                --secondary-background-color: var(--potrol-surface-soft);
-                --background-color: var(--potrol-bg-end);
-                --text-color: var(--potrol-text);
-            }
-
-            html, body, [class*="st-"], [data-testid="stAppViewContainer"] {
-                color: var(--potrol-text);
-                font-family: "Google Sans Text", "Google Sans", "Roboto Flex", "Noto Sans", "Segoe UI", sans-serif;
-                letter-spacing: 0.005em;
-            }
-
-            html, body, [data-testid="stAppViewContainer"] {
-                background-color: var(--potrol-bg-end) !important;
-            }
-            .stApp,
-            [data-testid="stAppViewContainer"] {
-                background: linear-gradient(180deg, var(--potrol-bg-start) 0%, var(--potrol-bg-end) 100%);
-            }
-            [data-testid="stDecoration"],
-            [data-testid="stToolbar"],
-            [data-testid="stHeader"],
-            [data-testid="stStatusWidget"],
-            [data-testid="stSidebar"],
-            [data-testid="stSidebarCollapsedControl"],
-            [data-testid="collapsedControl"] {
-                display: none !important;
-                visibility: hidden !important;
-            }
-            [data-testid="stAppViewContainer"] > .main {
-                padding-top: 0 !important;
-            }
-            [data-testid="stAppViewContainer"] > .main .block-container,
-            [data-testid="stMainBlockContainer"] {
-                padding-top: 0.6rem !important;
-                padding-bottom: 1.1rem !important;
-                padding-left: 0.9rem !important;
-                padding-right: 0.9rem !important;
-                max-width: 1240px;
-                box-sizing: border-box;
-            }
-            [data-testid="column"] {
-                min-width: 0 !important;
-            }
-            [data-testid="column"] > div {
-                min-width: 0 !important;
-            }
-            .stApp h1,
-            .stApp h2,
-            .stApp h3 {
-                color: var(--potrol-text);
-                font-weight: 600;
-                letter-spacing: -0.01em;
-            }
-            [data-testid="stHeaderActionElements"],
-            h1 a,
-            h2 a,
-            h3 a,
-            h4 a,
-            h5 a,
-            h6 a {
-                display: none !important;
-                visibility: hidden !important;
-            }
-            .stApp p, .stApp label, .stApp [data-testid="stCaptionContainer"] {
-                color: var(--potrol-muted);
-            }
-            [data-testid="stTabs"] {
-                margin-top: 0.15rem;
-            }
-            [data-testid="stTabs"] [data-baseweb="tab-list"] {
-                background: var(--potrol-surface-soft);
-                border: 1px solid var(--potrol-border);
-                border-radius: 999px;
-                padding: 4px;
-                gap: 0.3rem;
-            }
-            [data-testid="stTabs"] [data-baseweb="tab-border"] {
-                display: none !important;
-            }
-            [data-testid="stTabs"] [data-baseweb="tab-highlight"] {
-                display: none !important;
-            }
-            [data-testid="stTabs"] [data-baseweb="tab"] {
-                border-radius: 999px;
-                height: 2.35rem;
-                padding: 0 0.95rem;
-                color: var(--potrol-muted);
-                font-weight: 600;
-                transition: background-color 140ms ease, color 140ms ease;
-            }
-            [data-testid="stTabs"] [data-baseweb="tab"][aria-selected="true"] {
-                background: var(--potrol-surface);
-                color: var(--potrol-text) !important;
-                box-shadow: 0 1px 2px rgba(17, 24, 39, 0.16);
-            }
-            [data-testid="stForm"],
-            [data-testid="stDataFrame"],
-            [data-testid="stAlert"],
-            [data-testid="stExpander"] > details {
-                background: var(--potrol-surface);
-                border: 1px solid var(--potrol-border);
-                border-radius: var(--potrol-radius-lg);
-                box-shadow: 0 1px 2px rgba(17, 24, 39, 0.09), 0 8px 24px rgba(17, 24, 39, 0.06);
-            }
-            [data-testid="stForm"] {
-                padding: 1rem 1rem 0.45rem 1rem;
-            }
-            [data-testid="stDataFrame"] {
-                overflow: hidden;
-            }
-            [data-testid="stMetric"] {
-                border: 1px solid var(--potrol-outline);
-                border-radius: var(--potrol-radius);
-                padding: 0.55rem;
-                background: var(--potrol-surface-soft);
-                box-shadow: 0 1px 2px rgba(17, 24, 39, 0.08);
-            }
-            [data-testid="stMetricLabel"],
-            [data-testid="stMetricValue"],
-            [data-testid="stMetricDelta"] {
-                color: var(--potrol-text) !important;
-            }
-            [data-baseweb="input"],
-            [data-baseweb="base-input"],
-            [data-baseweb="select"],
-            [data-baseweb="textarea"] {
-                border-radius: var(--potrol-control-radius) !important;
-            }
-            [data-testid="stTextInput"] [data-baseweb="input"],
-            [data-testid="stNumberInput"] [data-baseweb="input"],
-            [data-testid="stDateInput"] [data-baseweb="input"],
-            [data-testid="stSelectbox"] [data-baseweb="select"],
-            [data-testid="stTextArea"] [data-baseweb="textarea"],
-            [data-testid="stDialog"] [data-baseweb="input"],
-            [data-testid="stDialog"] [data-baseweb="base-input"],
-            [data-testid="stDialog"] [data-baseweb="select"],
-            [data-testid="stDialog"] [data-baseweb="textarea"] {
-                border: 0 !important;
-                box-shadow: none !important;
-                background: transparent !important;
-                border-radius: var(--potrol-control-radius) !important;
-            }
-            [data-baseweb="input"] > div,
-            [data-baseweb="base-input"] > div,
-            [data-baseweb="select"] > div,
-            [data-baseweb="textarea"] > div {
-                background: var(--potrol-surface) !important;
-                border: var(--potrol-control-border-width) solid var(--potrol-control-border-color) !important;
-                border-radius: var(--potrol-control-radius) !important;
-                min-height: var(--potrol-field-height);
-                overflow: hidden !important;
-                box-sizing: border-box !important;
-                background-clip: padding-box !important;
-                box-shadow: none !important;
-                display: flex !important;
-                align-items: center !important;
-                transition: border-color 120ms ease, box-shadow 120ms ease, background-color 120ms ease;
-            }
-            [data-baseweb="input"] > div > div,
-            [data-baseweb="base-input"] > div > div {
-                border-radius: inherit !important;
-                width: 100% !important;
-                min-width: 0 !important;
-            }
-            [data-baseweb="textarea"] > div > div {
-                border-radius: inherit !important;
-                width: 100% !important;
-                min-width: 0 !important;
-            }
-            [data-baseweb="select"] > div > div:first-child {
-                border-radius: inherit !important;
-                min-width: 0 !important;
-                flex: 1 1 auto !important;
-            }
-            [data-baseweb="select"] > div > div:last-child {
-                width: auto !important;
-                min-width: 0 !important;
-                flex: 0 0 auto !important;
-                border-radius: inherit !important;
-            }
-            [data-testid="stNumberInput"] [data-baseweb="input"] {
-                width: 100% !important;
-                min-width: 0 !important;
-            }
-            [data-testid="stNumberInput"] [data-baseweb="input"] > div {
-                width: 100% !important;
-                max-width: 100% !important;
-                min-width: 0 !important;
-                background: var(--potrol-surface) !important;
-                border: var(--potrol-control-border-width) solid var(--potrol-control-border-color) !important;
-                box-shadow: none !important;
-            }
-            [data-testid="stNumberInput"] [data-baseweb="input"] > div > div:first-child {
-                min-width: 0 !important;
-                flex: 1 1 auto !important;
-            }
-            [data-testid="stNumberInput"] [data-baseweb="input"] > div > div,
-            [data-testid="stNumberInput"] [data-baseweb="input"] > div > div > div,
-            [data-testid="stNumberInput"] [data-baseweb="input"] > div > div::before,
-            [data-testid="stNumberInput"] [data-baseweb="input"] > div > div::after,
-            [data-testid="stNumberInput"] [data-baseweb="input"] > div > div > div::before,
-            [data-testid="stNumberInput"] [data-baseweb="input"] > div > div > div::after {
-                border: 0 !important;
-                outline: 0 !important;
-                box-shadow: none !important;
-                background: transparent !important;
-            }
-            [data-testid="stNumberInput"] [data-baseweb="input"] > div > div:first-child,
-            [data-testid="stNumberInput"] [data-baseweb="input"] > div > div:first-child * {
-                border: 0 !important;
-                box-shadow: none !important;
-                background: transparent !important;
-            }
-            [data-testid="stNumberInput"] input[type="number"] {
-                border: 0 !important;
-                outline: none !important;
-                box-shadow: none !important;
-                background: transparent !important;
-                -moz-appearance: textfield !important;
-                -webkit-appearance: none !important;
-                -webkit-appearance: textfield !important;
-                appearance: textfield !important;
-            }
-            [data-testid="stNumberInput"] input[type="number"]::-webkit-outer-spin-button,
-            [data-testid="stNumberInput"] input[type="number"]::-webkit-inner-spin-button {
-                -webkit-appearance: none !important;
-                margin: 0 !important;
-            }
-            [data-testid="stNumberInput"] [data-baseweb="input"] input {
-                width: 100% !important;
-                min-width: 0 !important;
-            }
-            [data-testid="stNumberInput"] [data-baseweb="input"] + div,
-            [data-testid="stNumberInput"] [data-baseweb="input"] > div > div:last-child,
-            [data-testid="stNumberInput"] button[data-testid="stNumberInputStepUp"],
-            [data-testid="stNumberInput"] button[data-testid="stNumberInputStepDown"],
-            [data-testid="stNumberInput"] [data-baseweb="input"] [role="button"],
-            [data-testid="stNumberInput"] [data-baseweb="input"] [data-testid*="Step"],
-            [data-testid="stNumberInput"] [data-baseweb="input"] [aria-label*="Increase"],
-            [data-testid="stNumberInput"] [data-baseweb="input"] [aria-label*="Decrease"] {
-                display: none !important;
-            }
-            [data-testid="stNumberInput"] > div,
-            [data-testid="stNumberInput"] [data-baseweb="input"],
-            [data-testid="stNumberInput"] [data-baseweb="input"] > div,
-            [data-testid="stNumberInput"] [data-baseweb="input"] > div:hover,
-            [data-testid="stNumberInput"] [data-baseweb="input"] > div:focus-within {
-                border-color: var(--potrol-control-border-color) !important;
-                box-shadow: none !important;
-                outline: none !important;
-                background: var(--potrol-surface) !important;
-            }
-            [data-testid="stNumberInput"] [data-baseweb="input"]::before,
-            [data-testid="stNumberInput"] [data-baseweb="input"]::after,
-            [data-testid="stNumberInput"] [data-baseweb="input"] > div::before,
-            [data-testid="stNumberInput"] [data-baseweb="input"] > div::after,
-            [data-testid="stNumberInput"] fieldset,
-            [data-testid="stNumberInput"] legend {
-                border: 0 !important;
-                outline: 0 !important;
-                box-shadow: none !important;
-                background: transparent !important;
-            }
-            [data-testid="stNumberInput"] input,
-            [data-testid="stNumberInput"] input:hover,
-            [data-testid="stNumberInput"] input:focus,
-            [data-testid="stNumberInput"] input:focus-visible {
-                border: 0 !important;
-                outline: none !important;
-                box-shadow: none !important;
-                background: transparent !important;
-            }
-            [data-baseweb="input"] > div:has(input:disabled),
-            [data-baseweb="base-input"] > div:has(input:disabled),
-            [data-baseweb="textarea"] > div:has(textarea:disabled) {
-                background: var(--potrol-disabled-bg) !important;
-                border-color: var(--potrol-control-border-color) !important;
-                box-shadow: none !important;
-            }
-            [data-baseweb="input"] > div:focus-within,
-            [data-baseweb="base-input"] > div:focus-within,
-            [data-baseweb="select"] > div:focus-within,
-            [data-baseweb="textarea"] > div:focus-within {
-                border-color: var(--potrol-control-border-color) !important;
-                box-shadow: none !important;
-            }
-            [data-testid="stTextInput"],
-            [data-testid="stNumberInput"],
-            [data-testid="stSelectbox"],
-            [data-testid="stDateInput"] {
-                overflow: visible !important;
-            }
-            [data-testid="stTextInput"] > div {
-                padding-bottom: 0.12rem !important;
-            }
-            [data-testid="stTextInput"] [data-baseweb="input"] > div {
-                min-height: calc(var(--potrol-field-height) + 0.08rem) !important;
-            }
-            [data-testid="stNumberInput"] > div,
-            [data-testid="stSelectbox"] > div,
-            [data-testid="stDateInput"] > div {
-                padding-bottom: 0.02rem !important;
-            }
-            [data-baseweb="input"] input,
-            [data-baseweb="base-input"] input,
-            [data-baseweb="textarea"] textarea,
-            [data-baseweb="select"] * {
-                color: var(--potrol-text) !important;
-            }
-            [data-testid="stSelectbox"] [data-baseweb="select"],
-            [data-testid="stSelectbox"] [data-baseweb="select"] *,
-            [role="listbox"],
-            [role="listbox"] * {
-                color: var(--potrol-text) !important;
-                -webkit-text-fill-color: var(--potrol-text) !important;
-                opacity: 1 !important;
-            }
-            [data-testid="stSelectbox"] [data-baseweb="select"] [role="combobox"] > div,
-            [data-testid="stSelectbox"] [data-baseweb="select"] span,
-            [data-testid="stSelectbox"] [data-baseweb="select"] p {
-                color: var(--potrol-text) !important;
-                -webkit-text-fill-color: var(--potrol-text) !important;
-                opacity: 1 !important;
-            }
-            [data-baseweb="input"] input,
-            [data-baseweb="base-input"] input,
-            [data-baseweb="select"] input,
-            [data-baseweb="select"] [role="combobox"],
-            [data-baseweb="textarea"] textarea {
-                text-align: left !important;
-                line-height: 1.3 !important;
-            }
-            [data-baseweb="input"] input,
-            [data-baseweb="base-input"] input,
-            [data-baseweb="textarea"] textarea {
-                background: transparent !important;
-            }
-            [data-baseweb="input"] input:focus,
-            [data-baseweb="base-input"] input:focus,
-            [data-baseweb="select"] input:focus,
-            [data-baseweb="select"] [role="combobox"]:focus,
-            [data-baseweb="textarea"] textarea:focus,
-            [data-baseweb="input"] button:focus,
-            [data-baseweb="select"] button:focus,
-            [data-baseweb="base-input"] button:focus {
-                outline: none !important;
-                box-shadow: none !important;
-            }
-            [data-baseweb="input"] button,
-            [data-baseweb="base-input"] button,
-            [data-baseweb="select"] button {
-                border: 0 !important;
-                border-radius: var(--potrol-control-radius) !important;
-                box-shadow: none !important;
-                background: transparent !important;
-            }
-            [data-testid="stDialog"] [data-baseweb="input"] > div,
-            [data-testid="stDialog"] [data-baseweb="base-input"] > div,
-            [data-testid="stDialog"] [data-baseweb="select"] > div,
-            [data-testid="stDialog"] [data-baseweb="textarea"] > div {
-                background: var(--potrol-surface) !important;
-                border: var(--potrol-control-border-width) solid var(--potrol-control-border-color) !important;
-                box-shadow: none !important;
-            }
-            [data-testid="stDialog"] [data-baseweb="input"] > div:focus-within,
-            [data-testid="stDialog"] [data-baseweb="base-input"] > div:focus-within,
-            [data-testid="stDialog"] [data-baseweb="select"] > div:focus-within,
-            [data-testid="stDialog"] [data-baseweb="textarea"] > div:focus-within {
-                border-color: var(--potrol-control-border-color) !important;
-                box-shadow: none !important;
-            }
-            [data-baseweb="input"] input:disabled,
-            [data-baseweb="base-input"] input:disabled,
-            [data-baseweb="textarea"] textarea:disabled {
-                color: var(--potrol-disabled-text) !important;
-                -webkit-text-fill-color: var(--potrol-disabled-text) !important;
-                background: transparent !important;
-                opacity: 1 !important;
-            }
-            [data-baseweb="input"] input::placeholder,
-            [data-baseweb="textarea"] textarea::placeholder {
-                color: var(--potrol-placeholder) !important;
-            }
-            input[type="checkbox"],
-            input[type="radio"] {
-                accent-color: var(--potrol-accent) !important;
-            }
-            [data-testid="stCheckbox"] p,
-            [data-testid="stSelectbox"] label p,
-            [data-testid="stTextInput"] label p,
-            [data-testid="stNumberInput"] label p {
-                color: var(--potrol-text) !important;
-            }
-            [role="listbox"] {
-                border: var(--potrol-control-border-width) solid var(--potrol-control-border-color) !important;
-                border-radius: var(--potrol-control-radius) !important;
-                background: var(--potrol-surface) !important;
-            }
-            [role="option"] {
-                color: var(--potrol-text) !important;
-            }
-            [role="option"][aria-selected="true"],
-            [role="option"]:hover {
-                background: rgba(var(--potrol-accent-rgb), 0.14) !important;
-                color: var(--potrol-text) !important;
-            }
-            [data-baseweb="popover"],
-            [data-baseweb="popover"] > div {
-                background: var(--potrol-surface) !important;
-                color: var(--potrol-text) !important;
-                border-color: var(--potrol-border) !important;
-            }
-            [data-testid="stDataFrame"] [role="grid"],
-            [data-testid="stDataFrame"] [role="row"],
-            [data-testid="stDataFrame"] [role="gridcell"] {
-                background: var(--potrol-surface) !important;
-                color: var(--potrol-text) !important;
-                border-color: var(--potrol-border) !important;
-            }
-            [data-testid="stDataFrame"] [role="columnheader"] {
-                background: var(--potrol-surface-soft) !important;
-                color: var(--potrol-text) !important;
-                border-color: var(--potrol-border) !important;
-            }
-            [data-testid="stRadio"] [role="radiogroup"] {
-                display: flex;
-                flex-wrap: wrap;
-                gap: 0.45rem;
-            }
-            [data-testid="stRadio"] [role="radiogroup"] > label {
-                border: 1px solid var(--potrol-border);
-                border-radius: 999px;
-                background: var(--potrol-surface-soft);
-                padding: 0.25rem 0.75rem;
-                margin: 0 !important;
-            }
-            [data-testid="stRadio"] [role="radiogroup"] > label:has(input:checked) {
-                border-color: var(--potrol-accent);
-                background: var(--potrol-surface);
-                box-shadow: inset 0 0 0 1px var(--potrol-accent);
-            }
-            [data-testid="stRadio"][class*="st-key-reports_scope_mode"] [data-baseweb="radio"] input + div,
-            [data-testid="stRadio"][class*="st-key-reports-scope-mode"] [data-baseweb="radio"] input + div {
-                border-color: var(--potrol-border) !important;
-                background: var(--potrol-surface) !important;
-            }
-            [data-testid="stRadio"][class*="st-key-reports_scope_mode"] [data-baseweb="radio"] input:checked + div,
-            [data-testid="stRadio"][class*="st-key-reports-scope-mode"] [data-baseweb="radio"] input:checked + div {
-                border-color: var(--potrol-accent) !important;
-                background: var(--potrol-surface) !important;
-            }
-            [data-testid="stRadio"][class*="st-key-reports_scope_mode"] [data-baseweb="radio"] input:checked + div > div,
-            [data-testid="stRadio"][class*="st-key-reports-scope-mode"] [data-baseweb="radio"] input:checked + div > div {
-                background: var(--potrol-accent) !important;
-            }
-            [data-testid="stRadio"][class*="st-key-reports_scope_mode"] [data-baseweb="radio"] input:focus + div,
-            [data-testid="stRadio"][class*="st-key-reports-scope-mode"] [data-baseweb="radio"] input:focus + div {
-                box-shadow: 0 0 0 1px rgba(var(--potrol-accent-rgb), 0.45) !important;
-            }
-            [data-testid="stRadio"][class*="st-key-reports_scope_mode"] [data-baseweb="radio"] svg,
-            [data-testid="stRadio"][class*="st-key-reports_scope_mode"] [data-baseweb="radio"] svg *,
-            [data-testid="stRadio"][class*="st-key-reports-scope-mode"] [data-baseweb="radio"] svg,
-            [data-testid="stRadio"][class*="st-key-reports-scope-mode"] [data-baseweb="radio"] svg * {
-                stroke: var(--potrol-border) !important;
-                fill: var(--potrol-border) !important;
-            }
-            [data-testid="stRadio"][class*="st-key-reports_scope_mode"] [data-baseweb="radio"]:has(input:checked) svg,
-            [data-testid="stRadio"][class*="st-key-reports_scope_mode"] [data-baseweb="radio"]:has(input:checked) svg *,
-            [data-testid="stRadio"][class*="st-key-reports-scope-mode"] [data-baseweb="radio"]:has(input:checked) svg,
-            [data-testid="stRadio"][class*="st-key-reports-scope-mode"] [data-baseweb="radio"]:has(input:checked) svg * {
-                stroke: var(--potrol-accent) !important;
-                fill: var(--potrol-accent) !important;
-            }
-            [data-testid="stPopover"] > div > button,
-            [data-testid="stPopoverButton"] > button {
-                background: var(--potrol-accent) !important;
-                color: #ffffff !important;
-                border: 1px solid var(--potrol-accent) !important;
-                border-radius: 999px !important;
-                min-height: 2.6rem !important;
-                padding: 0.45rem 1rem !important;
-                font-weight: 600 !important;
-                line-height: 1.2 !important;
-                white-space: nowrap !important;
-                box-shadow: 0 1px 2px rgba(0, 0, 0, 0.14);
-            }
-            [data-testid="stPopover"] > div > button > div,
-            [data-testid="stPopoverButton"] > button > div {
-                background: transparent !important;
-            }
-            [data-testid="stPopover"] > div > button > div > span,
-            [data-testid="stPopoverButton"] > button > div > span {
-                color: #ffffff !important;
-            }
-            [data-testid="stPopover"] > div > button [data-testid="stButtonIcon"],
-            [data-testid="stPopoverButton"] > button [data-testid="stButtonIcon"],
-            [data-testid="stPopoverButton"] > button [data-testid="stButtonIcon"] *,
-            [data-testid="stPopover"] > div > button svg,
-            [data-testid="stPopoverButton"] > button svg,
-            [data-testid="stPopover"] > div > button [aria-hidden="true"],
-            [data-testid="stPopoverButton"] > button [aria-hidden="true"] {
-                display: none !important;
-                visibility: hidden !important;
-            }
-            [data-testid="stPopover"] > div > button:hover,
-            [data-testid="stPopoverButton"] > button:hover {
-                background: var(--potrol-accent-strong) !important;
-                border-color: var(--potrol-accent-strong) !important;
-                box-shadow: 0 4px 10px rgba(var(--potrol-accent-strong-rgb), 0.25);
-            }
-            .stButton > button,
-            [data-testid="stDownloadButton"] > button,
-            [data-testid="stFormSubmitButton"] > button {
-                background: var(--potrol-accent) !important;
-                color: #ffffff !important;
-                border: 1px solid var(--potrol-accent) !important;
-                border-radius: 999px !important;
-                min-height: 2.6rem !important;
-                padding: 0.45rem 1rem !important;
-                font-weight: 600 !important;
-                line-height: 1.2 !important;
-                white-space: nowrap;
-                box-shadow: 0 1px 2px rgba(0, 0, 0, 0.14);
-                transition: transform 120ms ease, background-color 120ms ease, box-shadow 120ms ease;
-            }
-            .stButton > button *,
-            [data-testid="stDownloadButton"] > button *,
-            [data-testid="stFormSubmitButton"] > button * {
-                color: #ffffff !important;
-                fill: #ffffff !important;
-            }
-            .stButton > button:hover,
-            [data-testid="stDownloadButton"] > button:hover,
-            [data-testid="stFormSubmitButton"] > button:hover {
-                background: var(--potrol-accent-strong) !important;
-                border-color: var(--potrol-accent-strong) !important;
-                color: #ffffff !important;
-                box-shadow: 0 4px 10px rgba(var(--potrol-accent-strong-rgb), 0.25);
-                transform: translateY(-1px);
-            }
-            .stButton > button:focus-visible,
-            [data-testid="stDownloadButton"] > button:focus-visible,
-            [data-testid="stFormSubmitButton"] > button:focus-visible {
-                outline: none !important;
-                box-shadow: 0 0 0 3px rgba(var(--potrol-accent-rgb), 0.3) !important;
-            }
-            .stButton > button:disabled,
-            [data-testid="stDownloadButton"] > button:disabled,
-            [data-testid="stFormSubmitButton"] > button:disabled {
-                background: var(--potrol-surface-soft) !important;
-                color: var(--potrol-muted) !important;
-                border-color: var(--potrol-border) !important;
-                box-shadow: none !important;
-                transform: none !important;
-                opacity: 1 !important;
-            }
-            .stButton > button:disabled *,
-            [data-testid="stDownloadButton"] > button:disabled *,
-            [data-testid="stFormSubmitButton"] > button:disabled * {
-                color: var(--potrol-muted) !important;
-                fill: var(--potrol-muted) !important;
-            }
-            [data-testid="stPopoverContent"] {
-                border: 1px solid var(--potrol-border) !important;
-                border-radius: var(--potrol-radius) !important;
-                background: var(--potrol-surface) !important;
-            }
-            [data-testid="stDialog"] [role="dialog"] {
-                border-radius: var(--potrol-radius-lg) !important;
-                border: 1px solid var(--potrol-border) !important;
-                background: linear-gradient(180deg, var(--potrol-surface) 0%, var(--potrol-surface-soft) 100%)
-                    !important;
-                box-shadow: 0 18px 44px rgba(17, 24, 39, 0.18) !important;
-            }
-            [data-testid="stDialog"] [data-testid="stVerticalBlock"],
-            [data-testid="stDialog"] [data-testid="stHorizontalBlock"],
-            [data-testid="stDialog"] [data-testid="stVerticalBlockBorderWrapper"] {
-                background: transparent !important;
-            }
-            [data-testid="stDataFrame"] * {
-                color: var(--potrol-text) !important;
-            }
-            [data-testid="StyledFullScreenButton"],
-            button[title="View fullscreen"] {
-                display: none !important;
-                visibility: hidden !important;
-            }
-            [data-testid="stAppDeployButton"],
-            [data-testid="stDeployButton"],
-            button[title="Deploy"],
-            a[title="Deploy"] {
-                display: none !important;
-                visibility: hidden !important;
-            }
-            .potrol-logo-wrap {
-                width: fit-content;
-                max-width: 100%;
-            }
-            .potrol-theme-card {
-                margin-top: 0.08rem;
-                border: 1px solid var(--potrol-border);
-                border-radius: 10px;
-                background: var(--potrol-surface);
-                padding: 0.3rem;
-                min-height: 5.2rem;
-                box-sizing: border-box;
-                overflow: hidden;
-                display: block;
-            }
-            .potrol-theme-card-link {
-                display: block;
-                text-decoration: none !important;
-                cursor: pointer;
-            }
-            .potrol-theme-card-link:focus-visible .potrol-theme-card {
-                outline: 2px solid rgba(var(--potrol-accent-rgb), 0.48);
-                outline-offset: 2px;
-            }
-            .potrol-theme-card-active {
-                border-color: var(--potrol-accent);
-                box-shadow: 0 0 0 1px rgba(var(--potrol-accent-rgb), 0.25);
-            }
-            .potrol-theme-bar {
-                height: 0.58rem;
-                border-radius: 999px;
-                border: 1px solid var(--preview-border, var(--potrol-border));
-            }
-            .potrol-theme-head {
-                margin-top: 0.26rem;
-                display: flex;
-                align-items: center;
-                justify-content: space-between;
-                gap: 0.24rem;
-            }
-            .potrol-theme-name {
-                color: var(--preview-text, var(--potrol-text)) !important;
-                font-size: 0.71rem;
-                font-weight: 600;
-                line-height: 1.2;
-                white-space: nowrap;
-                overflow: hidden;
-                text-overflow: ellipsis;
-            }
-            .potrol-theme-section-title {
-                margin: 0.55rem 0 0.14rem 0;
-                color: var(--potrol-text);
-                font-size: 0.84rem;
-                font-weight: 700;
-                line-height: 1.2;
-            }
-            .potrol-theme-meta {
-                margin-top: 0.2rem;
-                display: flex;
-                align-items: center;
-                gap: 0.24rem;
-            }
-            .potrol-theme-pill {
-                border: 1px solid var(--preview-border, var(--potrol-border)) !important;
-                color: var(--preview-text, var(--potrol-text)) !important;
-                background: var(--preview-pill-bg, rgba(17, 24, 39, 0.08)) !important;
-                border-radius: 999px;
-                padding: 0.06rem 0.45rem;
-                font-size: 0.62rem;
-                line-height: 1.2;
-                font-weight: 700;
-                text-transform: uppercase;
-                letter-spacing: 0.03em;
-            }
-            .potrol-theme-apply {
-                display: inline-flex;
-                align-items: center;
-                justify-content: center;
-                text-decoration: none !important;
-                border-radius: 999px;
-                min-height: 1.22rem;
-                padding: 0.03rem 0.42rem;
-                font-size: 0.63rem;
-                font-weight: 700;
-                line-height: 1.1;
-                border: 1px solid transparent;
-                white-space: nowrap;
-            }
-            .potrol-theme-apply:hover {
-                filter: brightness(0.95);
-            }
-            .potrol-theme-swatches {
-                display: flex;
-                gap: 0.22rem;
-                flex-wrap: wrap;
-                margin-top: 0.24rem;
-            }
-            .potrol-theme-swatch {
-                width: 0.68rem;
-                height: 0.68rem;
-                border-radius: 999px;
-                border: 1px solid var(--preview-border, var(--potrol-border));
-                box-shadow: 0 1px 2px rgba(var(--potrol-accent-rgb), 0.16);
-            }
-            .potrol-stat-badge {
-                display: inline-block;
-                padding: 0.28rem 0.7rem;
-                border: 1px solid var(--potrol-border);
-                border-radius: 999px;
-                background: var(--potrol-surface-soft);
-                color: var(--potrol-text);
-                font-size: 0.8rem;
-                font-weight: 600;
-                line-height: 1.3;
-            }
-            [data-testid="stSlider"] > div {
-                padding-top: 0.2rem;
-            }
-            [data-testid="stSlider"] [data-baseweb="slider"] > div > div {
-                border-radius: 999px !important;
-            }
-            [data-testid="stSlider"] [data-baseweb="slider"] > div > div:first-child {
-                background: rgba(var(--potrol-accent-rgb), 0.24) !important;
-            }
-            [data-testid="stSlider"] [data-baseweb="slider"] > div > div:first-child > div {
-                background: var(--potrol-accent) !important;
-            }
-            [data-testid="stSlider"] [data-baseweb="slider"] div[aria-hidden="true"] {
-                background: rgba(var(--potrol-accent-rgb), 0.24) !important;
-            }
-            [data-testid="stSlider"] [data-baseweb="slider"] div[aria-hidden="true"] > div {
-                background: var(--potrol-accent) !important;
-            }
-            [data-testid="stSlider"] [data-baseweb="slider"] [role="slider"] {
-                width: 1.02rem !important;
-                height: 1.02rem !important;
-                border-radius: 999px !important;
-                border: 2px solid var(--potrol-accent-strong) !important;
-                background: var(--potrol-surface) !important;
-                box-shadow: 0 0 0 3px rgba(var(--potrol-accent-rgb), 0.22) !important;
-            }
-            [data-testid="stSlider"] [data-baseweb="slider"] p {
-                color: var(--potrol-muted) !important;
-                font-weight: 600 !important;
-            }
-            .potrol-report-metric {
-                border: 1px solid var(--potrol-border);
-                border-radius: 18px;
-                background: linear-gradient(180deg, var(--potrol-surface) 0%, var(--potrol-surface-soft) 100%);
-                padding: 0.72rem 0.82rem;
-                box-shadow: 0 1px 2px rgba(17, 24, 39, 0.08), 0 10px 26px rgba(17, 24, 39, 0.05);
-                min-height: 5.25rem;
-            }
-            .potrol-report-metric-label {
-                color: var(--potrol-muted);
-                font-size: 0.74rem;
-                font-weight: 600;
-                text-transform: uppercase;
-                letter-spacing: 0.04em;
-                line-height: 1.2;
-            }
-            .potrol-report-metric-value {
-                margin-top: 0.32rem;
-                color: var(--potrol-text);
-                font-size: 1.34rem;
-                font-weight: 700;
-                line-height: 1.1;
-                letter-spacing: -0.01em;
-            }
-            .potrol-report-metric-note {
-                margin-top: 0.28rem;
-                color: var(--potrol-muted);
-                font-size: 0.74rem;
-                line-height: 1.3;
-            }
-            .potrol-report-card-title {
-                color: var(--potrol-text);
-                font-size: 0.96rem;
-                font-weight: 700;
-                line-height: 1.2;
-                margin-bottom: 0.12rem;
-            }
-            .potrol-report-card-sub {
-                color: var(--potrol-muted);
-                font-size: 0.78rem;
-                line-height: 1.3;
-                margin-bottom: 0.42rem;
-            }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
 
-    st.markdown(
-        f"""
-        <style>
-            :root,
-            html,
-            body,
-            .stApp,
-            [data-testid="stApp"],
-            [data-testid="stAppViewContainer"],
-            [data-testid="stDialog"] [role="dialog"] {{
-                color-scheme: {theme_color_scheme};
-                --potrol-bg-start: {theme_palette["bg_start"]};
-                --potrol-bg-end: {theme_palette["bg_end"]};
-                --potrol-surface: {theme_palette["surface"]};
-                --potrol-surface-soft: {theme_palette["surface_soft"]};
-                --potrol-border: {theme_palette["border"]};
-                --potrol-outline: {theme_outline};
-                --potrol-text: {theme_palette["text"]};
-                --potrol-muted: {theme_palette["muted"]};
-                --potrol-accent: {theme_palette["accent"]};
-                --potrol-accent-strong: {theme_palette["accent_strong"]};
-                --potrol-accent-rgb: {accent_rgb};
-                --potrol-accent-strong-rgb: {accent_strong_rgb};
-                --potrol-disabled-bg: {theme_palette["surface_soft"]};
-                --potrol-placeholder: {theme_placeholder};
-                --potrol-disabled-text: {theme_disabled_text};
-                --primary-color: {theme_palette["accent"]};
-                --secondary-background-color: {theme_palette["surface_soft"]};
-                --background-color: {theme_palette["bg_end"]};
-                --text-color: {theme_palette["text"]};
-            }}
-            html,
-            body,
-            .stApp,
-            [data-testid="stApp"],
-            [data-testid="stAppViewContainer"] {{
-                background-color: var(--potrol-bg-end) !important;
-            }}
-            .stApp,
-            [data-testid="stAppViewContainer"] {{
-                background: linear-gradient(180deg, var(--potrol-bg-start) 0%, var(--potrol-bg-end) 100%)
-                    !important;
-            }}
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    st.markdown(load_static_css_block(), unsafe_allow_html=True)
 
-    if str(st.session_state.get(THEME_STATE_KEY, "")).strip() == "E-Ink":
-        st.markdown(
-            """
-            <style>
-                [data-testid="stPopover"] > div > button,
-                [data-testid="stPopover"] > div > button *,
-                [data-testid="stPopoverButton"] > button,
-                [data-testid="stPopoverButton"] > button *,
-                [class*="st-key-open_settings_menu_button"] button,
-                [class*="st-key-open_settings_menu_button"] button *,
-                [class*="st-key-open_about_menu_button"] button,
-                [class*="st-key-open_about_menu_button"] button * {
-                    color: #ffffff !important;
-                    fill: #ffffff !important;
-                    -webkit-text-fill-color: #ffffff !important;
-                }
-            </style>
-            """,
-            unsafe_allow_html=True,
-        )
+    st.markdown(build_theme_css(st.session_state[THEME_STATE_KEY]), unsafe_allow_html=True)
 
     if "location_options" not in st.session_state:
         st.session_state["location_options"] = load_location_options()
@@ -3607,64 +4039,72 @@ def main() -> None:
     if OPEN_SETTINGS_ONCE_STATE_KEY not in st.session_state:
         st.session_state[OPEN_SETTINGS_ONCE_STATE_KEY] = False
 
+    def persist_app_settings() -> None:
+        # Writes the session's settings, skipping the disk write when this session
+        # already saved the exact same values (e.g. re-clicking the active theme).
+        ss = st.session_state
+        settings_snapshot = (
+            str(ss[WORKBOOK_PATH_STATE_KEY]).strip(),
+            str(ss[BACKUP_DIR_STATE_KEY]).strip(),
+            str(ss[THEME_STATE_KEY]),
+            str(ss.get(UPDATE_MANIFEST_URL_STATE_KEY, DEFAULT_UPDATE_MANIFEST_URL)).strip(),
+            normalize_backup_keep_latest(ss.get(BACKUP_KEEP_LATEST_STATE_KEY, DEFAULT_BACKUP_KEEP_LATEST)),
+        )
+        if settings_snapshot == ss.get(LAST_SAVED_SETTINGS_STATE_KEY):
+            return
+        workbook_text, backup_text, theme_text, manifest_text, keep_latest = settings_snapshot
+        save_app_settings(
+            workbook_path=workbook_text,
+            backup_dir=backup_text,
+            theme=theme_text,
+            update_manifest_url=manifest_text,
+            backup_keep_latest=keep_latest,
+        )
+        ss[LAST_SAVED_SETTINGS_STATE_KEY] = settings_snapshot
+
     def apply_theme_selection(theme_name: str, reopen_settings: bool = False) -> None:
+        ss = st.session_state
         requested_theme_name = canonical_theme_name(str(theme_name).strip())
         if requested_theme_name not in THEME_PRESETS:
             return
-        st.session_state[THEME_STATE_KEY] = requested_theme_name
-        st.session_state[SETTINGS_TAB_PENDING_STATE_KEY] = "theme"
+        ss[THEME_STATE_KEY] = requested_theme_name
+        ss[SETTINGS_TAB_PENDING_STATE_KEY] = "theme"
         if reopen_settings:
-            st.session_state[OPEN_SETTINGS_ONCE_STATE_KEY] = True
-        save_app_settings(
-            workbook_path=st.session_state[WORKBOOK_PATH_STATE_KEY],
-            backup_dir=st.session_state[BACKUP_DIR_STATE_KEY],
-            theme=requested_theme_name,
-            update_manifest_url=str(
-                st.session_state.get(UPDATE_MANIFEST_URL_STATE_KEY, DEFAULT_UPDATE_MANIFEST_URL)
-            ).strip(),
-        )
+            ss[OPEN_SETTINGS_ONCE_STATE_KEY] = True
+        persist_app_settings()
 
     @st.dialog("Settings", width="large")
     def show_settings_dialog() -> None:
-        tab_items: list[tuple[str, str]] = [
-            ("workbook", ":material/folder_open: Workbook"),
-            ("locations", ":material/location_on: Locations"),
-            ("theme", ":material/palette: Theme"),
-            ("diagnostics", ":material/health_and_safety: Diagnostics"),
-            ("about", ":material/info: About"),
-        ]
-        tab_keys = [key for key, _ in tab_items]
-        tab_labels_by_key = {key: label for key, label in tab_items}
-
-        pending_tab_key = str(st.session_state.pop(SETTINGS_TAB_PENDING_STATE_KEY, "")).strip().lower()
-        if pending_tab_key in tab_keys:
-            st.session_state[SETTINGS_TAB_STATE_KEY] = pending_tab_key
+        ss = st.session_state
+        pending_tab_key = str(ss.pop(SETTINGS_TAB_PENDING_STATE_KEY, "")).strip().lower()
+        if pending_tab_key in _SETTINGS_TAB_LABELS:
+            ss[SETTINGS_TAB_STATE_KEY] = pending_tab_key
 
-        current_tab_key = str(st.session_state.get(SETTINGS_TAB_STATE_KEY, "workbook")).strip().lower()
-        if current_tab_key not in tab_keys:
+        current_tab_key = str(ss.get(SETTINGS_TAB_STATE_KEY, "workbook")).strip().lower()
+        if current_tab_key not in _SETTINGS_TAB_LABELS:
             current_tab_key = "workbook"
-            st.session_state[SETTINGS_TAB_STATE_KEY] = current_tab_key
+            ss[SETTINGS_TAB_STATE_KEY] = current_tab_key
 
         selected_tab = st.radio(
             "Settings section",
-            options=tab_keys,
+            options=_SETTINGS_TAB_KEYS,
             key=SETTINGS_TAB_STATE_KEY,
-            format_func=lambda option_key: tab_labels_by_key.get(option_key, str(option_key)),
+            format_func=lambda option_key: _SETTINGS_TAB_LABELS.get(option_key, str(option_key)),
             horizontal=True,
             label_visibility="collapsed",
         )
 
         if selected_tab == "workbook":
             st.subheader("Workbook Settings")
-            current_workbook_value = str(st.session_state.get(WORKBOOK_PATH_STATE_KEY, "")).strip()
+            current_workbook_value = str(ss.get(WORKBOOK_PATH_STATE_KEY, "")).strip()
             if not current_workbook_value:
                 current_workbook_value = str(DEFAULT_WORKBOOK_PATH)
-                st.session_state[WORKBOOK_PATH_STATE_KEY] = current_workbook_value
+                ss[WORKBOOK_PATH_STATE_KEY] = current_workbook_value
 
-            current_backup_value = str(st.session_state.get(BACKUP_DIR_STATE_KEY, "")).strip()
+            current_backup_value = str(ss.get(BACKUP_DIR_STATE_KEY, "")).strip()
             if not current_backup_value:
-                current_backup_value = str(Path(current_workbook_value).expanduser().parent / "PO_Backups")
-                st.session_state[BACKUP_DIR_STATE_KEY] = current_backup_value
+                current_backup_value = _default_backup_dir(current_workbook_value)
+                ss[BACKUP_DIR_STATE_KEY] = current_backup_value
             workbook_input_state_key = "settings_workbook_path_input"
             backup_input_state_key = "settings_backup_dir_input"
             workbook_input_pending_key = "settings_workbook_path_input_pending"
@@ -3672,40 +4112,40 @@ def main() -> None:
             backup_keep_input_state_key = "settings_backup_keep_latest_input"
             backup_keep_input_pending_key = "settings_backup_keep_latest_input_pending"
 
-            pending_workbook_input = st.session_state.pop(workbook_input_pending_key, None)
-            if pending_workbook_input is not None:
-                st.session_state[workbook_input_state_key] = str(pending_workbook_input)
-
-            pending_backup_input = st.session_state.pop(backup_input_pending_key, None)
-            if pending_backup_input is not None:
-                st.session_state[backup_input_state_key] = str(pending_backup_input)
-
-            pending_backup_keep = st.session_state.pop(backup_keep_input_pending_key, None)
-            if pending_backup_keep is not None:
-                st.session_state[backup_keep_input_state_key] = normalize_backup_keep_latest(pending_backup_keep)
-
-            if workbook_input_state_key not in st.session_state:
-                st.session_state[workbook_input_state_key] = current_workbook_value
-            if backup_input_state_key not in st.session_state:
-                st.session_state[backup_input_state_key] = current_backup_value
-            if backup_keep_input_state_key not in st.session_state:
-                st.session_state[backup_keep_input_state_key] = normalize_backup_keep_latest(
-                    st.session_state.get(BACKUP_KEEP_LATEST_STATE_KEY, DEFAULT_BACKUP_KEEP_LATEST)
+            # Widget values can only be replaced before the widget renders, so
+            # handlers stash them under *_pending keys for the next rerun.
+            pending_inputs: tuple[tuple[str, str, Callable[[Any], Any]], ...] = (
+                (workbook_input_pending_key, workbook_input_state_key, str),
+                (backup_input_pending_key, backup_input_state_key, str),
+                (backup_keep_input_pending_key, backup_keep_input_state_key, normalize_backup_keep_latest),
+            )
+            for pending_key, input_state_key, normalize_input in pending_inputs:
+                pending_value = ss.pop(pending_key, None)
+                if pending_value is not None:
+                    ss[input_state_key] = normalize_input(pending_value)
+
+            if workbook_input_state_key not in ss:
+                ss[workbook_input_state_key] = current_workbook_value
+            if backup_input_state_key not in ss:
+                ss[backup_input_state_key] = current_backup_value
+            if backup_keep_input_state_key not in ss:
+                ss[backup_keep_input_state_key] = normalize_backup_keep_latest(
+                    ss.get(BACKUP_KEEP_LATEST_STATE_KEY, DEFAULT_BACKUP_KEEP_LATEST)
                 )
 
             def persist_workbook_settings(workbook_text: str, backup_text: str, backup_keep_latest: int) -> None:
                 normalized_keep_latest = normalize_backup_keep_latest(backup_keep_latest)
-                st.session_state[WORKBOOK_PATH_STATE_KEY] = workbook_text
-                st.session_state[BACKUP_DIR_STATE_KEY] = backup_text
-                st.session_state[BACKUP_KEEP_LATEST_STATE_KEY] = normalized_keep_latest
-                st.session_state[workbook_input_pending_key] = workbook_text
-                st.session_state[backup_input_pending_key] = backup_text
-                st.session_state[backup_keep_input_pending_key] = normalized_keep_latest
-                save_app_settings(
-                    workbook_path=st.session_state[WORKBOOK_PATH_STATE_KEY],
-                    backup_dir=st.session_state[BACKUP_DIR_STATE_KEY],
-                    backup_keep_latest=st.session_state[BACKUP_KEEP_LATEST_STATE_KEY],
+                ss.update(
+                    {
+                        WORKBOOK_PATH_STATE_KEY: workbook_text,
+                        BACKUP_DIR_STATE_KEY: backup_text,
+                        BACKUP_KEEP_LATEST_STATE_KEY: normalized_keep_latest,
+                        workbook_input_pending_key: workbook_text,
+                        backup_input_pending_key: backup_text,
+                        backup_keep_input_pending_key: normalized_keep_latest,
+                    }
                 )
+                persist_app_settings()
 
             st.caption("Manage workbook and backup paths used by POtrol.")
 
@@ -3721,7 +4161,6 @@ def main() -> None:
                         placeholder=str(DEFAULT_WORKBOOK_PATH),
                     )
                 with workbook_browse_col:
-                    st.markdown("<div style='height: 1.88rem;'></div>", unsafe_allow_html=True)
                     browse_workbook_clicked = st.button(
                         "Browse",
                         key="settings_browse_workbook_button",
@@ -3733,17 +4172,16 @@ def main() -> None:
                     st.text_input(
                         "Backup folder",
                         key=backup_input_state_key,
-                        placeholder=str(Path(current_workbook_value).expanduser().parent / "PO_Backups"),
+                        placeholder=_default_backup_dir(current_workbook_value),
                     )
                 with backup_browse_col:
-                    st.markdown("<div style='height: 1.88rem;'></div>", unsafe_allow_html=True)
                     browse_backup_clicked = st.button(
                         "Browse",
                         key="settings_browse_backup_folder_button",
                         use_container_width=True,
                     )
 
-                keep_col, keep_hint_col = st.columns([2.3, 4.25], gap="small")
+                keep_col, keep_hint_col = st.columns([2.3, 4.25], gap="small", vertical_alignment="bottom")
                 with keep_col:
                     st.number_input(
                         "Backups to keep",
@@ -3754,7 +4192,6 @@ def main() -> None:
                         help="How many recent workbook backups to retain.",
                     )
                 with keep_hint_col:
-                    st.markdown("<div style='height: 1.95rem;'></div>", unsafe_allow_html=True)
                     st.caption("Older backups are deleted automatically after each save.")
 
                 action_col_1, action_col_2 = st.columns(2, gap="small")
@@ -3772,26 +4209,26 @@ def main() -> None:
                         use_container_width=True,
                     )
 
+            # The typed workbook path feeds the handlers and the backup panel below.
+            workbook_input_text = str(ss.get(workbook_input_state_key, "")).strip() or current_workbook_value
+            workbook_input_path = _expand_path(workbook_input_text)
+            default_backup_text = _default_backup_dir(workbook_input_text)
+
             if use_default_backup_clicked:
-                workbook_seed_text = str(st.session_state.get(workbook_input_state_key, "")).strip()
-                workbook_seed_path = Path(workbook_seed_text or current_workbook_value).expanduser()
-                st.session_state[backup_input_pending_key] = str(workbook_seed_path.parent / "PO_Backups")
+                ss[backup_input_pending_key] = default_backup_text
                 st.rerun()
 
             if browse_workbook_clicked:
-                workbook_seed_text = str(st.session_state.get(workbook_input_state_key, "")).strip()
-                workbook_seed_path = Path(workbook_seed_text or current_workbook_value).expanduser()
-                current_backup_text = str(st.session_state.get(backup_input_state_key, "")).strip()
-                current_default_backup = str(workbook_seed_path.parent / "PO_Backups")
-                selected_workbook = browse_workbook_file(workbook_seed_path)
+                current_backup_text = str(ss.get(backup_input_state_key, "")).strip()
+                selected_workbook = browse_workbook_file(workbook_input_path)
                 if selected_workbook is not None:
                     selected_workbook_text = str(selected_workbook)
                     validation_error = validate_workbook_input(selected_workbook_text, selected_workbook)
                     if validation_error:
                         st.warning(validation_error)
                     else:
-                        if not current_backup_text or path_key(Path(current_backup_text)) == path_key(
-                            Path(current_default_backup)
+                        if not current_backup_text or _text_path_key(current_backup_text) == _text_path_key(
+                            default_backup_text
                         ):
                             selected_backup_text = str(selected_workbook.parent / "PO_Backups")
                         else:
@@ -3799,45 +4236,45 @@ def main() -> None:
                         persist_workbook_settings(
                             selected_workbook_text,
                             selected_backup_text,
-                            int(st.session_state.get(backup_keep_input_state_key, DEFAULT_BACKUP_KEEP_LATEST)),
+                            int(ss.get(backup_keep_input_state_key, DEFAULT_BACKUP_KEEP_LATEST)),
                         )
-                        load_sheet_data.clear()
+                        _maybe_invalidate_sheets(selected_workbook_text)
                         st.success("Workbook path updated.")
                         st.rerun()
 
             if browse_backup_clicked:
-                backup_seed_text = str(st.session_state.get(backup_input_state_key, "")).strip()
-                backup_seed_path = Path(backup_seed_text or current_backup_value).expanduser()
+                backup_seed_text = str(ss.get(backup_input_state_key, "")).strip()
+                backup_seed_path = _expand_path(backup_seed_text or current_backup_value)
                 selected_backup_folder = browse_folder(backup_seed_path)
                 if selected_backup_folder is not None:
                     selected_backup_text = str(selected_backup_folder)
-                    workbook_for_backup = str(st.session_state.get(WORKBOOK_PATH_STATE_KEY, current_workbook_value))
+                    workbook_for_backup = str(ss.get(WORKBOOK_PATH_STATE_KEY, current_workbook_value))
                     persist_workbook_settings(
                         workbook_for_backup,
                         selected_backup_text,
-                        int(st.session_state.get(backup_keep_input_state_key, DEFAULT_BACKUP_KEEP_LATEST)),
+                        int(ss.get(backup_keep_input_state_key, DEFAULT_BACKUP_KEEP_LATEST)),
                     )
                     st.success("Backup folder updated.")
                     st.rerun()
 
             if apply_paths_clicked:
-                new_workbook_text = str(st.session_state.get(workbook_input_state_key, "")).strip()
-                new_backup_text = str(st.session_state.get(backup_input_state_key, "")).strip()
+                new_workbook_text = str(ss.get(workbook_input_state_key, "")).strip()
+                new_backup_text = str(ss.get(backup_input_state_key, "")).strip()
                 new_backup_keep = normalize_backup_keep_latest(
-                    st.session_state.get(backup_keep_input_state_key, DEFAULT_BACKUP_KEEP_LATEST)
+                    ss.get(backup_keep_input_state_key, DEFAULT_BACKUP_KEEP_LATEST)
                 )
 
                 if not new_workbook_text:
                     st.warning("Workbook path cannot be blank.")
                 else:
-                    new_workbook_path = Path(new_workbook_text).expanduser()
+                    new_workbook_path = _expand_path(new_workbook_text)
                     validation_error = validate_workbook_input(new_workbook_text, new_workbook_path)
                     if validation_error:
                         st.warning(validation_error)
                     else:
                         normalized_workbook_text = str(new_workbook_path)
                         if new_backup_text:
-                            normalized_backup_text = str(Path(new_backup_text).expanduser())
+                            normalized_backup_text = str(_expand_path(new_backup_text))
                         else:
                             normalized_backup_text = str(new_workbook_path.parent / "PO_Backups")
                         persist_workbook_settings(
@@ -3845,38 +4282,33 @@ def main() -> None:
                             normalized_backup_text,
                             new_backup_keep,
                         )
-                        load_sheet_data.clear()
+                        _maybe_invalidate_sheets(normalized_workbook_text)
                         st.success("Workbook settings updated.")
                         st.rerun()
 
-            workbook_path_for_backup_text = str(
-                st.session_state.get(workbook_input_state_key, current_workbook_value)
-            ).strip() or current_workbook_value
             backup_dir_for_backup_text = str(
-                st.session_state.get(backup_input_state_key, current_backup_value)
-            ).strip()
-            workbook_in_settings = Path(workbook_path_for_backup_text).expanduser()
-            if not backup_dir_for_backup_text:
-                backup_dir_for_backup_text = str(workbook_in_settings.parent / "PO_Backups")
-            backup_dir_in_settings = Path(backup_dir_for_backup_text).expanduser()
+                ss.get(backup_input_state_key, current_backup_value)
+            ).strip() or default_backup_text
+            backup_dir_in_settings = _expand_path(backup_dir_for_backup_text)
 
             with st.container(border=True):
                 st.markdown("**Backup Management**")
-                st.caption(f"Workbook: `{workbook_in_settings}`")
+                st.caption(f"Workbook: `{workbook_input_path}`")
                 st.caption(f"Backup folder: `{backup_dir_in_settings}`")
                 configured_keep_latest = normalize_backup_keep_latest(
-                    st.session_state.get(backup_keep_input_state_key, DEFAULT_BACKUP_KEEP_LATEST)
+                    ss.get(backup_keep_input_state_key, DEFAULT_BACKUP_KEEP_LATEST)
                 )
-                backup_files = list_backups(workbook_in_settings, backup_dir_in_settings)
+                backup_files = list_backups_cached(workbook_input_path, backup_dir_in_settings)
                 if backup_files:
                     st.caption(f"Found {len(backup_files)} backup(s). Latest: `{backup_files[0].name}`")
                     restore_backup_name_key = "settings_restore_backup_name"
                     backup_file_names = [backup_file.name for backup_file in backup_files]
+                    backup_by_name = dict(zip(backup_file_names, backup_files))
                     if (
-                        restore_backup_name_key not in st.session_state
-                        or st.session_state.get(restore_backup_name_key) not in backup_file_names
+                        restore_backup_name_key not in ss
+                        or ss.get(restore_backup_name_key) not in backup_file_names
                     ):
-                        st.session_state[restore_backup_name_key] = backup_file_names[0]
+                        ss[restore_backup_name_key] = backup_file_names[0]
 
                     selected_backup_name = st.selectbox(
                         "Select backup to restore",
@@ -3902,27 +4334,20 @@ def main() -> None:
                         if restore_latest_clicked:
                             target_backup = backup_files[0]
                         else:
-                            target_backup = next(
-                                (
-                                    backup_file
-                                    for backup_file in backup_files
-                                    if backup_file.name == selected_backup_name
-                                ),
-                                None,
-                            )
+                            target_backup = backup_by_name.get(selected_backup_name)
                         try:
                             if target_backup is None:
                                 st.info("No backup found to restore.")
                             else:
                                 restored_from = restore_backup(
-                                    workbook_in_settings,
+                                    workbook_input_path,
                                     backup_dir_in_settings,
                                     target_backup,
                                 )
                                 if restored_from is None:
                                     st.info("No backup found to restore.")
                                 else:
-                                    load_sheet_data.clear()
+                                    clear_sheet_data_cache()
                                     st.success(f"Restored workbook from `{restored_from.name}`.")
                                     st.rerun()
                         except Exception as exc:
@@ -3946,29 +4371,26 @@ def main() -> None:
                 use_container_width=True,
             ):
                 normalized_location = normalize_location_code(new_location)
-                existing_locations = st.session_state["location_options"]
+                existing_locations = ss["location_options"]
                 if not normalized_location:
                     st.warning("Enter a location code first.")
                 elif normalized_location in existing_locations:
                     st.info(f"`{normalized_location}` already exists.")
                 else:
                     updated_locations = sorted(existing_locations + [normalized_location])
-                    st.session_state["location_options"] = updated_locations
+                    ss["location_options"] = updated_locations
                     save_location_options(updated_locations)
                     st.success(f"Added `{normalized_location}`.")
                     st.rerun()
 
-            current_locations = st.session_state["location_options"]
+            current_locations = ss["location_options"]
             st.caption("Current locations")
             st.write(", ".join(current_locations))
         elif selected_tab == "theme":
             st.subheader("Theme")
-            theme_names = sorted(THEME_PRESETS.keys(), key=lambda value: value.casefold())
-            theme_preview_palettes = {
-                theme_name: resolve_theme_palette(theme_name) for theme_name in theme_names
-            }
-            current_theme_name = str(st.session_state.get(THEME_STATE_KEY, DEFAULT_THEME_NAME)).strip()
-            if current_theme_name not in theme_names:
+            theme_meta = _build_theme_catalog()
+            current_theme_name = str(ss.get(THEME_STATE_KEY, DEFAULT_THEME_NAME)).strip()
+            if current_theme_name not in theme_meta:
                 current_theme_name = DEFAULT_THEME_NAME
             st.caption("Click any theme to apply it instantly.")
             controls_col_1, controls_col_2 = st.columns([2.4, 1.7], gap="small")
@@ -3987,34 +4409,28 @@ def main() -> None:
                     label_visibility="collapsed",
                 )
 
-            def get_theme_scheme(theme_name: str) -> str:
-                raw_scheme = str(theme_preview_palettes[theme_name].get("color_scheme", "light")).strip().lower()
-                return "dark" if raw_scheme == "dark" else "light"
-
             def prioritize_active_theme(theme_list: list[str]) -> list[str]:
-                ordered = sorted(theme_list, key=lambda value: value.casefold())
+                # The catalog is already casefold-sorted, so each group arrives in order.
+                ordered = list(theme_list)
                 if current_theme_name in ordered:
                     active_index = ordered.index(current_theme_name)
                     ordered.insert(0, ordered.pop(active_index))
                 return ordered
 
             search_token = str(theme_search_text).strip().casefold()
-            filtered_theme_names: list[str] = []
-            for theme_name in theme_names:
-                if search_token and search_token not in theme_name.casefold():
+            scheme_filter = theme_filter.casefold()
+            themes_by_scheme: dict[str, list[str]] = {"light": [], "dark": []}
+            for theme_name, (folded_name, scheme_name) in theme_meta.items():
+                if search_token and search_token not in folded_name:
                     continue
-                scheme_name = get_theme_scheme(theme_name)
-                if theme_filter != "All" and scheme_name != theme_filter.casefold():
+                if theme_filter != "All" and scheme_name != scheme_filter:
                     continue
-                filtered_theme_names.append(theme_name)
+                themes_by_scheme[scheme_name].append(theme_name)
+            filtered_theme_count = len(themes_by_scheme["light"]) + len(themes_by_scheme["dark"])
 
-            light_theme_names = prioritize_active_theme(
-                [theme_name for theme_name in filtered_theme_names if get_theme_scheme(theme_name) == "light"]
-            )
-            dark_theme_names = prioritize_active_theme(
-                [theme_name for theme_name in filtered_theme_names if get_theme_scheme(theme_name) == "dark"]
-            )
-            st.caption(f"Showing {len(filtered_theme_names)} of {len(theme_names)} themes.")
+            light_theme_names = prioritize_active_theme(themes_by_scheme["light"])
+            dark_theme_names = prioritize_active_theme(themes_by_scheme["dark"])
+            st.caption(f"Showing {filtered_theme_count} of {len(theme_meta)} themes.")
 
             def render_theme_group(section_label: str, grouped_theme_names: list[str], scheme_label: str) -> None:
                 if not grouped_theme_names:
@@ -4037,104 +4453,16 @@ def main() -> None:
                             continue
 
                         theme_name = row_theme_names[column_index]
-                        preview_theme = theme_preview_palettes[theme_name]
                         is_active_theme = theme_name == current_theme_name
-                        preview_text_color = theme_preview_text_color(preview_theme)
-                        preview_accent_rgb = hex_to_rgb_triplet(
-                            preview_theme.get("accent", "#0b57d0"),
-                            "11, 87, 208",
-                        )
 
                         with column:
                             theme_button_key = (
-                                f"settings_theme_card_apply_{hashlib.sha1(theme_name.encode('utf-8')).hexdigest()[:10]}"
-                            )
-                            text_is_light = preview_text_color.casefold() in {"#f8fbff", "#ffffff", "white"}
-                            label_background = (
-                                "rgba(10, 14, 22, 0.46)"
-                                if text_is_light
-                                else "rgba(255, 255, 255, 0.76)"
+                                f"settings_theme_card_apply_{_fingerprint(theme_name.encode('utf-8'), digest_size=5)}"
                             )
-                            label_border = (
-                                "rgba(255, 255, 255, 0.34)"
-                                if text_is_light
-                                else "rgba(17, 24, 39, 0.24)"
+                            st.markdown(
+                                build_theme_card_css(theme_name, theme_button_key),
+                                unsafe_allow_html=True,
                             )
-                            card_css = f"""
-<style>
-[class*='st-key-{theme_button_key}'] button {{
-    min-height: 8.2rem !important;
-    border-radius: 16px !important;
-    border: 1px solid {preview_theme["border"]} !important;
-    color: {preview_text_color} !important;
-    background-color: {preview_theme["bg_end"]} !important;
-    background-image:
-        linear-gradient(120deg, {preview_theme["accent"]} 0%, {preview_theme["accent_strong"]} 100%),
-        linear-gradient(180deg, {preview_theme["surface_soft"]} 0%, {preview_theme["surface_soft"]} 100%),
-        linear-gradient(180deg, {preview_theme["surface"]} 0%, {preview_theme["surface"]} 100%),
-        linear-gradient(180deg, {preview_theme["surface"]} 0%, {preview_theme["surface"]} 100%),
-        linear-gradient(180deg, rgba({preview_accent_rgb}, 0.44) 0%, rgba({preview_accent_rgb}, 0.44) 100%),
-        linear-gradient(180deg, rgba({preview_accent_rgb}, 0.28) 0%, rgba({preview_accent_rgb}, 0.28) 100%),
-        linear-gradient(135deg, {preview_theme["bg_start"]} 0%, {preview_theme["bg_end"]} 100%) !important;
-    background-repeat: no-repeat !important;
-    background-size:
-        100% 22%,
-        23% 66%,
-        62% 15%,
-        62% 15%,
-        34% 7%,
-        23% 7%,
-        100% 100% !important;
-    background-position:
-        0 0,
-        6% 27%,
-        32% 30%,
-        32% 50%,
-        32% 71%,
-        32% 82%,
-        0 0 !important;
-    padding: 5.05rem 0.62rem 0.62rem 0.62rem !important;
-    text-align: left !important;
-    white-space: pre-wrap !important;
-    line-height: 1.2 !important;
-    font-weight: 700 !important;
-    box-shadow: 0 1px 2px rgba(17, 24, 39, 0.14) !important;
-    transition: transform 140ms ease, box-shadow 160ms ease, border-color 160ms ease !important;
-}}
-[class*='st-key-{theme_button_key}'] button p {{
-    color: {preview_text_color} !important;
-    font-size: 0.74rem !important;
-    line-height: 1.22 !important;
-    letter-spacing: 0.01em !important;
-    margin: 0 !important;
-    display: inline-block !important;
-    background: {label_background} !important;
-    border: 1px solid {label_border} !important;
-    border-radius: 10px !important;
-    padding: 0.23rem 0.42rem !important;
-    backdrop-filter: blur(1px) !important;
-}}
-[class*='st-key-{theme_button_key}'] button:hover {{
-    border-color: {preview_theme["accent"]} !important;
-    box-shadow: 0 10px 24px rgba({preview_accent_rgb}, 0.30), 0 0 0 1px rgba({preview_accent_rgb}, 0.20) !important;
-    transform: translateY(-2px) !important;
-}}
-[class*='st-key-{theme_button_key}'] button:focus-visible {{
-    box-shadow: 0 0 0 3px rgba({preview_accent_rgb}, 0.30), 0 10px 24px rgba({preview_accent_rgb}, 0.28) !important;
-}}
-[class*='st-key-{theme_button_key}'] button:disabled {{
-    opacity: 1 !important;
-    cursor: default !important;
-    transform: none !important;
-    border-color: {preview_theme["accent"]} !important;
-    box-shadow: 0 0 0 2px rgba({preview_accent_rgb}, 0.36), 0 9px 22px rgba({preview_accent_rgb}, 0.22) !important;
-}}
-[class*='st-key-{theme_button_key}'] button:disabled p {{
-    color: {preview_text_color} !important;
-}}
-</style>
-"""
-                            st.markdown(card_css, unsafe_allow_html=True)
                             theme_card_clicked = st.button(
                                 theme_name,
                                 key=theme_button_key,
@@ -4145,7 +4473,7 @@ def main() -> None:
                                 apply_theme_selection(theme_name, reopen_settings=True)
                                 st.rerun()
 
-            if not filtered_theme_names:
+            if not filtered_theme_count:
                 st.info("No themes match that search/filter.")
             else:
                 if theme_filter == "All":
@@ -4167,14 +4495,7 @@ def main() -> None:
                 key="settings_save_update_url_button",
                 use_container_width=True,
             ):
-                update_manifest_url_value = str(
-                    st.session_state.get(UPDATE_MANIFEST_URL_STATE_KEY, "")
-                ).strip()
-                save_app_settings(
-                    workbook_path=st.session_state[WORKBOOK_PATH_STATE_KEY],
-                    backup_dir=st.session_state[BACKUP_DIR_STATE_KEY],
-                    update_manifest_url=update_manifest_url_value,
-                )
+                persist_app_settings()
                 st.success("Update URL saved.")
 
             if st.button(
@@ -4182,7 +4503,7 @@ def main() -> None:
                 key="settings_check_updates_button",
                 use_container_width=True,
             ):
-                update_url = str(st.session_state.get(UPDATE_MANIFEST_URL_STATE_KEY, "")).strip()
+                update_url = str(ss.get(UPDATE_MANIFEST_URL_STATE_KEY, "")).strip()
                 if not update_url:
                     st.info("Enter an update manifest URL to check for updates.")
                 else:
@@ -4209,12 +4530,12 @@ def main() -> None:
                         st.error(f"Update check failed: {exc}")
 
             diagnostics_payload = build_diagnostics_payload(
-                workbook_path=Path(st.session_state[WORKBOOK_PATH_STATE_KEY]).expanduser(),
-                sheet_name=str(st.session_state.get(SHEET_SELECT_STATE_KEY, "")),
-                theme_name=str(st.session_state.get(THEME_STATE_KEY, DEFAULT_THEME_NAME)),
-                update_manifest_url=str(st.session_state.get(UPDATE_MANIFEST_URL_STATE_KEY, "")).strip(),
+                workbook_path=_expand_path(str(ss[WORKBOOK_PATH_STATE_KEY])),
+                sheet_name=str(ss.get(SHEET_SELECT_STATE_KEY, "")),
+                theme_name=str(ss.get(THEME_STATE_KEY, DEFAULT_THEME_NAME)),
+                update_manifest_url=str(ss.get(UPDATE_MANIFEST_URL_STATE_KEY, "")).strip(),
                 backup_keep_latest=normalize_backup_keep_latest(
-                    st.session_state.get(BACKUP_KEEP_LATEST_STATE_KEY, DEFAULT_BACKUP_KEEP_LATEST)
+                    ss.get(BACKUP_KEEP_LATEST_STATE_KEY, DEFAULT_BACKUP_KEEP_LATEST)
                 ),
             )
             diagnostics_text = json.dumps(diagnostics_payload, indent=2)
@@ -4287,19 +4608,17 @@ def main() -> None:
         show_settings_dialog()
 
     workbook_path_text = str(st.session_state.get(WORKBOOK_PATH_STATE_KEY, "")).strip()
-    workbook_path = Path(workbook_path_text).expanduser()
+    workbook_path = _expand_path(workbook_path_text)
 
     workbook_input_error = validate_workbook_input(workbook_path_text, workbook_path)
     if workbook_input_error:
         st.error(workbook_input_error)
         st.stop()
+    st.session_state[LOADED_WORKBOOK_STATE_KEY] = workbook_path_text
 
     if not str(st.session_state.get(BACKUP_DIR_STATE_KEY, "")).strip():
         st.session_state[BACKUP_DIR_STATE_KEY] = str(workbook_path.parent / "PO_Backups")
-        save_app_settings(
-            workbook_path=st.session_state[WORKBOOK_PATH_STATE_KEY],
-            backup_dir=st.session_state[BACKUP_DIR_STATE_KEY],
-        )
+        persist_app_settings()
     backup_dir = Path(st.session_state[BACKUP_DIR_STATE_KEY]).expanduser()
     keep_backups = normalize_backup_keep_latest(
         st.session_state.get(BACKUP_KEEP_LATEST_STATE_KEY, DEFAULT_BACKUP_KEEP_LATEST)
@@ -4308,7 +4627,7 @@ def main() -> None:
 
     location_options = st.session_state["location_options"]
     if not location_options:
-        location_options = DEFAULT_LOCATION_OPTIONS.copy()
+        location_options = list(DEFAULT_LOCATION_OPTIONS)
         st.session_state["location_options"] = location_options
         save_location_options(location_options)
 
@@ -4333,7 +4652,7 @@ def main() -> None:
                     new_sheet_name.strip() or DEFAULT_SHEET_NAME,
                     DEFAULT_HEADERS.copy(),
                 )
-                load_sheet_data.clear()
+                clear_sheet_data_cache()
                 st.success(f"Workbook created: `{workbook_path}`")
                 st.rerun()
         st.stop()
@@ -4371,8 +4690,11 @@ def main() -> None:
         st.session_state[SHEET_SELECT_STATE_KEY] = default_sheet_name
 
     sheet_name = st.selectbox("Worksheet", options=sheet_names, key=SHEET_SELECT_STATE_KEY)
+    # Captured before loading so the editor search only reuses a cached blob
+    # built from this same generation of sheet data.
+    sheet_data_generation = _SHEET_DATA_GENERATION
     try:
-        headers, rows, row_numbers = load_sheet_data(str(workbook_path), sheet_name)
+        headers, sheet_columns, row_numbers = load_sheet_data(str(workbook_path), sheet_name)
     except InvalidFileException:
         st.error(
             "The selected workbook path is not a supported Excel workbook. "
@@ -4394,13 +4716,12 @@ def main() -> None:
 
     if not headers:
         headers = DEFAULT_HEADERS.copy()
-    if len(row_numbers) != len(rows):
-        row_numbers = [row_index + 2 for row_index in range(len(rows))]
+    row_count = len(next(iter(sheet_columns.values()), ()))
+    if len(row_numbers) != row_count:
+        row_numbers = [row_index + 2 for row_index in range(row_count)]
     entry_mode, header_map, write_headers = build_entry_schema(headers)
 
-    entry_scope_token = hashlib.sha1(
-        f"{str(workbook_path)}::{sheet_name}".encode("utf-8")
-    ).hexdigest()[:12]
+    entry_scope_token = _fingerprint(f"{str(workbook_path)}::{sheet_name}".encode("utf-8"), digest_size=6)
     vendor_key = field_key(sheet_name, "Vendor/Store", scope=entry_scope_token)
     department_key = field_key(sheet_name, "Department", scope=entry_scope_token)
     location_key = field_key(sheet_name, "Location", scope=entry_scope_token)
@@ -4564,7 +4885,7 @@ def main() -> None:
             workbook_changed = latest_signature != previous_signature
             st.session_state[workbook_signature_state_key] = latest_signature
             if workbook_changed:
-                load_sheet_data.clear()
+                clear_sheet_data_cache()
                 st.session_state[workbook_last_sync_state_key] = datetime.now().strftime("%H:%M:%S")
                 st.rerun()
 
@@ -4931,7 +5252,7 @@ def main() -> None:
                                 PURCHASE_REASON_COLUMN_INDEX if entry_mode == "legacy" else None
                             ),
                         )
-                    load_sheet_data.clear()
+                    clear_sheet_data_cache()
                     st.session_state[workbook_signature_state_key] = get_workbook_signature(workbook_path)
                     st.session_state[workbook_last_sync_state_key] = datetime.now().strftime("%H:%M:%S")
                     try:
@@ -5005,7 +5326,7 @@ def main() -> None:
 
         signature_sync_marker = (
             f"{st.session_state.get(workbook_last_sync_state_key, '--:--:--')}::"
-            f"{len(rows)}::{sheet_name.casefold()}"
+            f"{row_count}::{sheet_name.casefold()}"
         )
         if (
             editor_signature_key not in st.session_state
@@ -5033,16 +5354,27 @@ def main() -> None:
                 format_func=lambda option: "All rows" if int(option) == 0 else f"Last {int(option):,}",
             )
 
-        frame = pd.DataFrame(rows, columns=headers)
+        frame = pd.DataFrame(sheet_columns, columns=headers)
         if frame.empty:
             st.info("No entries yet on this worksheet.")
         else:
             configured_scan_limit = int(st.session_state.get(editor_scan_limit_key, DEFAULT_EDITOR_SEARCH_SCAN_LIMIT))
             max_scan_rows = len(frame) if configured_scan_limit == 0 else configured_scan_limit
+            search_blob = None
+            if search_query.strip() and sheet_data_generation == _SHEET_DATA_GENERATION:
+                try:
+                    search_blob = get_sheet_search_blob(
+                        str(workbook_path),
+                        sheet_name,
+                        sheet_data_generation,
+                    )
+                except Exception:
+                    search_blob = None
             filtered_frame, search_truncated, scanned_rows = filter_records_lazy(
                 frame,
                 search_query,
                 max_scan_rows=max_scan_rows,
+                search_blob=search_blob,
             )
             if newest_first:
                 filtered_frame = filtered_frame.iloc[::-1]
@@ -5072,7 +5404,7 @@ def main() -> None:
 
             if reload_latest_clicked:
                 latest_signature = get_workbook_signature(workbook_path)
-                load_sheet_data.clear()
+                clear_sheet_data_cache()
                 st.session_state[editor_signature_key] = latest_signature
                 st.session_state[workbook_signature_state_key] = latest_signature
                 st.session_state[workbook_last_sync_state_key] = datetime.now().strftime("%H:%M:%S")
@@ -5172,29 +5504,31 @@ def main() -> None:
                 if save_edits_clicked:
                     original_row_numbers: set[int] = set()
                     original_by_row: dict[int, dict[str, Any]] = {}
-                    for _, original_row in editable_frame.iterrows():
+                    for row_number_raw, original_values in zip(
+                        editable_frame[excel_row_column].tolist(),
+                        normalize_editor_frame(editable_frame, headers).to_dict("records"),
+                    ):
                         try:
-                            row_number = int(original_row.get(excel_row_column, 0))
+                            row_number = int(row_number_raw)
                         except Exception:
                             continue
                         original_row_numbers.add(row_number)
-                        original_by_row[row_number] = {
-                            header: normalize_editor_cell_value(original_row.get(header, ""))
-                            for header in headers
-                        }
+                        original_by_row[row_number] = original_values
 
                     edited_existing_row_numbers: set[int] = set()
                     row_updates: list[tuple[int, dict[str, Any]]] = []
                     new_rows: list[dict[str, Any]] = []
                     changed_cells = 0
-                    for _, edited_row in edited_frame.iterrows():
-                        updated_values: dict[str, Any] = {}
-                        for header in headers:
-                            normalized_value = normalize_editor_cell_value(edited_row.get(header, ""))
-                            updated_values[header] = normalized_value
-
+                    edited_row_numbers = (
+                        edited_frame[excel_row_column].tolist()
+                        if excel_row_column in edited_frame.columns
+                        else [""] * len(edited_frame)
+                    )
+                    for row_number_raw, updated_values in zip(
+                        edited_row_numbers,
+                        normalize_editor_frame(edited_frame, headers).to_dict("records"),
+                    ):
                         row_number: int | None = None
-                        row_number_raw = edited_row.get(excel_row_column, "")
                         try:
                             parsed_row_number = int(row_number_raw)
                             if parsed_row_number > 1:
@@ -5236,7 +5570,7 @@ def main() -> None:
                                     key=f"manual_editor_reload_conflict::{entry_scope_token}",
                                     use_container_width=False,
                                 ):
-                                    load_sheet_data.clear()
+                                    clear_sheet_data_cache()
                                     st.session_state[editor_signature_key] = latest_signature
                                     st.session_state[workbook_signature_state_key] = latest_signature
                                     st.session_state[workbook_last_sync_state_key] = datetime.now().strftime("%H:%M:%S")
@@ -5254,7 +5588,7 @@ def main() -> None:
                                         row_deletes=row_deletes,
                                         new_rows=new_rows,
                                     )
-                                load_sheet_data.clear()
+                                clear_sheet_data_cache()
                                 latest_saved_signature = get_workbook_signature(workbook_path)
                                 st.session_state[editor_signature_key] = latest_saved_signature
                                 st.session_state[workbook_signature_state_key] = latest_saved_signature
@@ -1,8 +1,12 @@
+import html
+import re
 import tempfile
 import unittest
+import zipfile
 from pathlib import Path
+from unittest import mock
 
-from openpyxl import load_workbook
+from openpyxl import Workbook, load_workbook
 
 import potrol
 
@@ -24,6 +28,49 @@ def build_row(po_number: str, item_name: str, sub_total: float) -> dict[str, obj
     }
 
 
+def convert_to_shared_strings(path: Path) -> None:
+    # openpyxl saves inline strings; Excel saves a sharedStrings part. Rewrite
+    # the sheets the Excel way, storing IT101 as rich text split into two runs.
+    with zipfile.ZipFile(path) as archive:
+        parts = {name: archive.read(name) for name in archive.namelist()}
+    strings: list[str] = []
+    string_indexes: dict[str, int] = {}
+
+    def to_shared(match: re.Match[str]) -> str:
+        text = html.unescape(match.group(2))
+        if text not in string_indexes:
+            string_indexes[text] = len(strings)
+            strings.append(text)
+        return f'{match.group(1)} t="s"><v>{string_indexes[text]}</v></c>'
+
+    inline_cell = re.compile(r'(<c r="[A-Z]+\d+"[^>]*?) t="inlineStr"><is><t[^>]*>([^<]*)</t></is></c>')
+    for name in parts:
+        if name.startswith("xl/worksheets/"):
+            parts[name] = inline_cell.sub(to_shared, parts[name].decode("utf-8")).encode("utf-8")
+
+    items = [
+        "<si><r><t>IT</t></r><r><t>101</t></r></si>" if text == "IT101" else f"<si><t>{html.escape(text)}</t></si>"
+        for text in strings
+    ]
+    main_ns = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+    parts["xl/sharedStrings.xml"] = (
+        f'<sst xmlns="{main_ns}" count="{len(items)}" uniqueCount="{len(items)}">{"".join(items)}</sst>'
+    ).encode("utf-8")
+    parts["[Content_Types].xml"] = parts["[Content_Types].xml"].replace(
+        b"</Types>",
+        b'<Override PartName="/xl/sharedStrings.xml" ContentType="application/'
+        b'vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/></Types>',
+    )
+    parts["xl/_rels/workbook.xml.rels"] = parts["xl/_rels/workbook.xml.rels"].replace(
+        b"</Relationships>",
+        b'<Relationship Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/'
+        b'sharedStrings" Target="sharedStrings.xml" Id="rIdShared"/></Relationships>',
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in parts.items():
+            archive.writestr(name, data)
+
+
 class WorkbookIoTests(unittest.TestCase):
     def setUp(self) -> None:
         self.temp_dir = tempfile.TemporaryDirectory()
@@ -95,6 +142,38 @@ class WorkbookIoTests(unittest.TestCase):
         self.assertEqual(str(worksheet.cell(row=3, column=6).value), "Mouse")
         workbook.close()
 
+    def test_update_sheet_rows_deletes_non_contiguous_rows(self) -> None:
+        potrol.append_record(
+            path=self.workbook_path,
+            sheet_name=self.sheet_name,
+            headers=potrol.DEFAULT_HEADERS.copy(),
+            values=[build_row(f"IT{600 + offset}", f"Item {offset}", 10.0) for offset in range(8)],
+            backup_dir=self.backup_dir,
+            keep_backups=5,
+        )
+
+        potrol.update_sheet_rows(
+            path=self.workbook_path,
+            sheet_name=self.sheet_name,
+            headers=potrol.DEFAULT_HEADERS.copy(),
+            row_updates=[],
+            row_deletes=[3, 4, 5, 8],
+            new_rows=[],
+            backup_dir=self.backup_dir,
+            keep_backups=5,
+        )
+
+        workbook = load_workbook(self.workbook_path, read_only=True, data_only=True)
+        worksheet = workbook[self.sheet_name]
+        remaining = [
+            row[0]
+            for row in worksheet.iter_rows(min_row=2, max_col=1, values_only=True)
+            if row[0] is not None
+        ]
+        workbook.close()
+        # Rows 2-9 held IT600-IT607; rows 3, 4, 5 and 8 were IT601-IT603 and IT606.
+        self.assertEqual(remaining, ["IT600", "IT604", "IT605", "IT607"])
+
     def test_workbook_write_lock_times_out_when_lock_exists(self) -> None:
         lock_path = potrol.get_workbook_lock_path(self.workbook_path)
         lock_path.write_text("lock", encoding="utf-8")
@@ -109,6 +188,161 @@ class WorkbookIoTests(unittest.TestCase):
         finally:
             lock_path.unlink(missing_ok=True)
 
+    def test_fast_po_scan_matches_openpyxl_scan(self) -> None:
+        workbook = Workbook()
+        first_sheet = workbook.active
+        first_sheet.title = "Orders"
+        first_sheet.append(["IT Purchase Orders"])
+        first_sheet.append([])
+        first_sheet.append(["Date", "PO Number", "Item", "PO #"])
+        first_sheet.append(["2026-02-19", "IT100", "Dock", "IT150"])
+        first_sheet.append(["2026-02-20", None, "Cable", None])
+        first_sheet.append(["IT090", "IT101", "Monitor", "it-151"])
+        first_sheet.append(["2026-02-21", "Dock", "IT999 in notes", "IT152"])
+        second_sheet = workbook.create_sheet("Archive")
+        second_sheet.append(["PO", "Vendor"])
+        second_sheet.append(["IT200", "IT777"])
+        second_sheet.append(["IT205", "Vendor"])
+        scan_path = self.root / "scan.xlsx"
+        workbook.save(scan_path)
+        workbook.close()
+        convert_to_shared_strings(scan_path)
+        with zipfile.ZipFile(scan_path) as archive:
+            self.assertIn("xl/sharedStrings.xml", archive.namelist())
+            self.assertNotIn(b"inlineStr", archive.read("xl/worksheets/sheet1.xml"))
+        reloaded = load_workbook(scan_path, read_only=True)
+        self.assertEqual(reloaded["Orders"]["B6"].value, "IT101")
+        reloaded.close()
+
+        cache_path = self.root / "po_sequence_cache.json"
+        for sheet_name in (None, "Orders", "Archive"):
+            fast_sequences = potrol._scan_po_sequences_fast(scan_path, "IT", sheet_name=sheet_name)
+            self.assertIsNotNone(fast_sequences)
+            potrol._PO_SEQUENCE_CACHE.clear()
+            with mock.patch.object(potrol, "APP_PO_SEQUENCE_CACHE_PATH", cache_path), mock.patch.object(
+                potrol, "_scan_po_sequences_fast", return_value=None
+            ):
+                openpyxl_sequences = potrol._collect_all_po_sequences(scan_path, "IT", sheet_name=sheet_name)
+            cache_path.unlink(missing_ok=True)
+            self.assertEqual(set(fast_sequences), set(openpyxl_sequences), sheet_name)
+        potrol._PO_SEQUENCE_CACHE.clear()
+        self.assertEqual(
+            set(potrol._scan_po_sequences_fast(scan_path, "IT")),
+            {90, 100, 101, 150, 151, 152, 200, 205},
+        )
+
+
+class DraftCoalescingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.drafts_path = self.root / "drafts.json"
+        self.workbook_path = self.root / "IT POs.xlsx"
+        # A long delay keeps the timer from flushing mid-test; tests flush explicitly.
+        patches = (
+            mock.patch.object(potrol, "APP_DRAFTS_PATH", self.drafts_path),
+            mock.patch.object(potrol, "DRAFT_FLUSH_DELAY_SECONDS", 60.0),
+        )
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(potrol.flush_drafts)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def read_draft_store(self) -> dict[str, object]:
+        if not self.drafts_path.exists():
+            return {}
+        return potrol.load_json_bytes(self.drafts_path.read_bytes())
+
+    def test_load_before_flush_returns_pending_draft(self) -> None:
+        potrol.save_entry_draft(self.workbook_path, "PO Log", {"vendor": "Acme"})
+        self.assertFalse(self.drafts_path.exists())
+
+        draft = potrol.load_entry_draft(self.workbook_path, "PO Log")
+        self.assertIsNotNone(draft)
+        self.assertEqual(draft["vendor"], "Acme")
+
+        potrol.flush_drafts()
+        draft_key = potrol.build_draft_key(self.workbook_path, "PO Log")
+        self.assertEqual(self.read_draft_store()[draft_key]["vendor"], "Acme")
+        self.assertEqual(potrol.load_entry_draft(self.workbook_path, "PO Log")["vendor"], "Acme")
+
+    def test_clear_before_flush_drops_pending_and_saved_draft(self) -> None:
+        potrol.save_entry_draft(self.workbook_path, "PO Log", {"vendor": "Saved"})
+        potrol.flush_drafts()
+        potrol.save_entry_draft(self.workbook_path, "PO Log", {"vendor": "Pending"})
+
+        potrol.clear_entry_draft(self.workbook_path, "PO Log")
+        self.assertIsNone(potrol.load_entry_draft(self.workbook_path, "PO Log"))
+
+        potrol.flush_drafts()
+        self.assertIsNone(potrol.load_entry_draft(self.workbook_path, "PO Log"))
+        draft_key = potrol.build_draft_key(self.workbook_path, "PO Log")
+        self.assertNotIn(draft_key, self.read_draft_store())
+
+
+class SearchFilterTests(unittest.TestCase):
+    def test_letters_and_digits_query_matches_non_po_columns(self) -> None:
+        frame = potrol.pd.DataFrame(
+            {
+                "PO Number": ["IT100", "IT101"],
+                "Items Being Purchased": ["Dell5000 dock", "Chair"],
+                "Location": ["Room 123", "GLN"],
+            }
+        )
+        for query, expected_po in (("dell5000", "IT100"), ("room 123", "IT100"), ("it101", "IT101")):
+            matches, truncated, scanned = potrol.filter_records_lazy(frame, query)
+            self.assertEqual(list(matches["PO Number"]), [expected_po], query)
+            self.assertFalse(truncated)
+            self.assertEqual(scanned, 2)
+
+
+class SheetSearchBlobTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.workbook_path = self.root / "IT POs.xlsx"
+        self.sheet_name = "PO Log"
+        potrol.create_workbook(self.workbook_path, self.sheet_name, potrol.DEFAULT_HEADERS.copy())
+        potrol.append_record(
+            path=self.workbook_path,
+            sheet_name=self.sheet_name,
+            headers=potrol.DEFAULT_HEADERS.copy(),
+            values=build_row("IT700", "Dock", 120.0),
+            backup_dir=self.root / "PO_Backups",
+            keep_backups=3,
+        )
+        potrol.clear_sheet_data_cache()
+
+    def tearDown(self) -> None:
+        potrol.clear_sheet_data_cache()
+        self.temp_dir.cleanup()
+
+    def search(self, query: str) -> list[str]:
+        # Mirrors the editor: frame and blob both come from the cached sheet data.
+        path_str = str(self.workbook_path)
+        headers, sheet_columns, _ = potrol.load_sheet_data(path_str, self.sheet_name)
+        frame = potrol.pd.DataFrame(sheet_columns, columns=headers)
+        search_blob = potrol.get_sheet_search_blob(path_str, self.sheet_name, potrol._SHEET_DATA_GENERATION)
+        matches, _, _ = potrol.filter_records_lazy(frame, query, search_blob=search_blob)
+        return list(matches["Items Being Purchased"])
+
+    def test_reload_after_edit_in_place_rebuilds_search_blob(self) -> None:
+        self.assertEqual(self.search("dock"), ["Dock"])
+
+        workbook = load_workbook(self.workbook_path)
+        workbook[self.sheet_name]["F2"] = "Monitor"
+        workbook.save(self.workbook_path)
+        workbook.close()
+        # Searching before the reload still sees the cached (pre-edit) frame.
+        self.assertEqual(self.search("dock"), ["Dock"])
+
+        potrol.clear_sheet_data_cache()
+        self.assertEqual(self.search("monitor"), ["Monitor"])
+        self.assertEqual(self.search("dock"), [])
+
 
 if __name__ == "__main__":
     unittest.main()